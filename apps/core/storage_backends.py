@@ -11,3 +11,5 @@ class PublicMediaStorage(S3Boto3Storage):
     location = "media"
     default_acl = "public-read"
     file_overwrite = False
+    # Файлы не перезаписываются (аудио лежит под хэшем содержимого), поэтому кэшируются навсегда
+    object_parameters = {"CacheControl": "public, max-age=31536000, immutable"}
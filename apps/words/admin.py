@@ -1 +1,10 @@
-# Register your models here.
+from django.contrib import admin
+
+from apps.words.models import LinguisticAPIProvider
+
+
+@admin.register(LinguisticAPIProvider)
+class LinguisticAPIProviderAdmin(admin.ModelAdmin):
+    list_display = ("name", "codename", "priority", "timeout", "is_active")
+    list_editable = ("priority", "timeout", "is_active")
+    ordering = ("priority",)
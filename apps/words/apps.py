@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class WordsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.words"
+
+    def ready(self):
+        from apps.words import signals  # noqa: F401
@@ -0,0 +1,184 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.http import quote_etag
+
+from apps.words.counters import delete_counters, get_counters, incr_counter
+from apps.words.models import Word
+
+# Откуда взята карточка: из памяти воркера, из общего кэша или из БД (промах)
+CARD_CACHE_OUTCOMES = ("local", "shared", "miss")
+
+
+def word_card(word: Word) -> dict:
+    """Карточка слова в том виде, в каком ее получает клиент (без полей, зависящих от пользователя)."""
+    return {
+        "word": word.word,
+        "definition": word.definition,
+        "examples": word.examples,
+        "id": str(word.uuid),
+        "audio_file_url": word.audio_file.url if word.audio_file else "",
+        "audio_status": word.audio_status,
+        "audio_status_url": reverse("words:word_audio", args=[word.uuid]),
+        "card_url": reverse("words:word_card", args=[word.lookup_key]),
+        "saved_status_url": reverse("words:word_saved_status", args=[word.uuid]),
+        "updated": word.updated.isoformat(),
+    }
+
+
+def card_etag(card: dict) -> str:
+    """Сильный ETag карточки: меняется при каждом сохранении слова (Word.updated)."""
+    return quote_etag(hashlib.sha256(f"{card['id']}:{card['updated']}".encode()).hexdigest()[:32])
+
+
+def card_last_modified(card: dict) -> int:
+    return int(datetime.fromisoformat(card["updated"]).timestamp())
+
+
+def is_card_final(word: Word) -> bool:
+    """В кэш попадают только готовые карточки: пока генерируется аудио, карточка еще изменится."""
+    return word.audio_status == Word.AudioStatus.READY
+
+
+class LRUCache:
+    """Ограниченный по размеру кэш в памяти процесса; записи живут не дольше ttl секунд."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class WordCardCache:
+    """
+    Двухуровневый кэш карточек слов по lookup_key: LRU в памяти воркера перед общим кэшем Django.
+
+    Изменение слова в одном воркере сбрасывает общий кэш и его собственный LRU; в остальных
+    воркерах старая карточка живет не дольше local_ttl. Счетчики попаданий копятся в памяти
+    и сбрасываются в общие счетчики (apps.words.counters) раз в stats_flush_every обращений.
+    """
+
+    def __init__(self, max_size: int, local_ttl: float, shared_ttl: int, stats_flush_every: int = 100):
+        self.local = LRUCache(max_size, local_ttl)
+        self.shared_ttl = shared_ttl
+        self.stats_flush_every = stats_flush_every
+        self._counts = dict.fromkeys(CARD_CACHE_OUTCOMES, 0)
+        self._counts_lock = threading.Lock()
+
+    @staticmethod
+    def _shared_key(key: str) -> str:
+        # Ключ слова может содержать пробелы и не-ASCII символы, недопустимые, например, в memcached
+        return f"word-card:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    @staticmethod
+    def _stats_key(outcome: str) -> str:
+        return f"word-card-stats:{outcome}"
+
+    def get(self, key: str) -> dict | None:
+        card, flush = self._get_local(key)
+        if card is None:
+            card = cache.get(self._shared_key(key))
+            flush = self._found_shared(key, card)
+        if flush:
+            self.flush_stats()
+        return card
+
+    async def aget(self, key: str) -> dict | None:
+        card, flush = self._get_local(key)
+        if card is None:
+            card = await cache.aget(self._shared_key(key))
+            flush = self._found_shared(key, card)
+        if flush:
+            await sync_to_async(self.flush_stats)()
+        return card
+
+    def _get_local(self, key: str) -> tuple[dict | None, bool]:
+        card = self.local.get(key)
+        return card, card is not None and self._count("local")
+
+    def _found_shared(self, key: str, card: dict | None) -> bool:
+        if card is None:
+            return self._count("miss")
+        self.local.set(key, card)
+        return self._count("shared")
+
+    def set(self, key: str, card: dict) -> None:
+        self.local.set(key, card)
+        cache.set(self._shared_key(key), card, self.shared_ttl)
+
+    async def aset(self, key: str, card: dict) -> None:
+        self.local.set(key, card)
+        await cache.aset(self._shared_key(key), card, self.shared_ttl)
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        cache.delete(self._shared_key(key))
+
+    def _count(self, outcome: str) -> bool:
+        """Учесть обращение; True, если пора сбросить счетчики в общие счетчики."""
+        with self._counts_lock:
+            self._counts[outcome] += 1
+            return sum(self._counts.values()) >= self.stats_flush_every
+
+    def flush_stats(self) -> None:
+        with self._counts_lock:
+            counts, self._counts = self._counts, dict.fromkeys(CARD_CACHE_OUTCOMES, 0)
+        for outcome, count in counts.items():
+            if count:
+                incr_counter(self._stats_key(outcome), count)
+
+    def reset_stats(self) -> None:
+        delete_counters([self._stats_key(outcome) for outcome in CARD_CACHE_OUTCOMES])
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики по всем воркерам (без еще не сброшенных счетчиков других процессов)."""
+        self.flush_stats()
+        saved = get_counters([self._stats_key(outcome) for outcome in CARD_CACHE_OUTCOMES])
+        return {outcome: saved.get(self._stats_key(outcome), 0) for outcome in CARD_CACHE_OUTCOMES}
+
+
+word_cards = WordCardCache(
+    max_size=settings.WORD_CARD_CACHE_SIZE,
+    local_ttl=settings.WORD_CARD_CACHE_LOCAL_TTL,
+    shared_ttl=settings.WORD_CARD_CACHE_TTL,
+)
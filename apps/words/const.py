@@ -1,15 +1,32 @@
+import json
 from enum import Enum
 
 
 class ReturnFormat(Enum):
     WORD_DEFINITION = {"definition": "", "part_of_speech": ""}
     WORD_EXAMPLES = ["sentence_1", "sentence_2"]
+    WORD_QUIZ = {"question": "", "correct_answer": "", "distractors": ["wrong_1", "wrong_2", "wrong_3"]}
+    WORD_CARD = {
+        "definition": "",
+        "part_of_speech": "",
+        "examples": ["sentence_1", "sentence_2"],
+        "quiz": {"question": "", "correct_answer": "", "distractors": ["wrong_1", "wrong_2", "wrong_3"]},
+    }
 
 
 class ReturnFormatPrompt(str, Enum):
-    WORD_DEFINITION = f"""Return answer in JSON format. Here is format: {ReturnFormat.WORD_DEFINITION.value}."""
+    WORD_DEFINITION = f"""
+        Return answer in JSON format with double quotes.
+        Here is format: {json.dumps(ReturnFormat.WORD_DEFINITION.value)}."""
     WORD_EXAMPLES = f"""
-        Return answer in JSON format as list of sentences. Here is format: {ReturnFormat.WORD_EXAMPLES.value}."""
+        Return answer in JSON format as list of sentences with double quotes.
+        Here is format: {json.dumps(ReturnFormat.WORD_EXAMPLES.value)}."""
+    WORD_QUIZ = f"""
+        Return answer as a single JSON object with double quotes.
+        Here is format: {json.dumps(ReturnFormat.WORD_QUIZ.value)}."""
+    WORD_CARD = f"""
+        Return answer as a single JSON object with double quotes.
+        Here is format: {json.dumps(ReturnFormat.WORD_CARD.value)}."""
 
 
 class Prompts(str, Enum):
@@ -28,16 +45,24 @@ class Prompts(str, Enum):
         The sentences MUST include the given word or phrase.
         Give real world examples, from books, articles or real conversaations.
         """
+    WORD_CARD = """
+        You are an assistant helping English learners.
+        Make a study card for the word or phrase '{word}':
+        - definition: define it in clear and simple English. Max length is 512 symbols.
+          It must not be too short and must give an english learner an understanding of word meaning.
+        - part_of_speech: part of speech of the word or phrase.
+        - examples: exactly {count} real world example sentences from books, articles or real conversations.
+          The sentences MUST include the given word or phrase. Sentences should be not too short.
+        - quiz: a multiple choice question "What does the word '{word}' mean?" with the correct answer
+          and exactly 3 plausible but wrong answers (distractors) of similar length.
+        Do not include explanations, markdown or extra text.
+        """
     WORD_QUIZ = """
-        Create a multiple choice quiz question for the word '{word}'.
-        Return in the following format:
-        Question: What does the word '{word}' mean?
-        Options:
-        - option A
-        - option B
-        - option C
-        - option D
-        Correct Answer: option A
-
+        Create a multiple choice quiz question "What does the word '{word}' mean?"
+        with the correct answer and exactly 3 plausible but wrong answers (distractors) of similar length.
         Do not include any explanations or formatting like markdown.
         """
+    FIX_FORMAT = """
+        Your previous answer to the request below could not be used: {error}.
+        Answer the request again and follow the requested format exactly.
+        """
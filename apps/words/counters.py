@@ -0,0 +1,55 @@
+import time
+
+from django.db import connections
+from django.db.models import F, Q
+
+from apps.words.models import SharedCounter
+
+# Отдельное подключение в режиме autocommit: блокировка строки счетчика не держится
+# до конца транзакции запроса (ATOMIC_REQUESTS), а изменение сразу видно другим воркерам
+COUNTERS_DB = "counters"
+
+
+def incr_counter(key: str, delta: int = 1, timeout: float | None = None) -> tuple[int, float | None]:
+    """
+    Атомарно прибавить delta к счетчику; вернуть новое значение и время истечения (по time.time()).
+
+    Один запрос INSERT ... ON CONFLICT DO UPDATE ... RETURNING, поэтому параллельные воркеры
+    не теряют обновлений. Истекший счетчик начинается заново с delta и живет timeout секунд.
+    """
+    now = time.time()
+    connection = connections[COUNTERS_DB]
+    table = connection.ops.quote_name(SharedCounter._meta.db_table)
+    key_column = connection.ops.quote_name("key")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} ({key_column}, value, expires_at) VALUES (%s, %s, %s)
+            ON CONFLICT ({key_column}) DO UPDATE SET
+                value = CASE WHEN {table}.expires_at < %s THEN EXCLUDED.value ELSE {table}.value + EXCLUDED.value END,
+                expires_at = CASE WHEN {table}.expires_at < %s THEN EXCLUDED.expires_at ELSE {table}.expires_at END
+            RETURNING value, expires_at
+            """,
+            [key, delta, None if timeout is None else now + timeout, now, now],
+        )
+        value, expires_at = cursor.fetchone()
+    return value, expires_at
+
+
+def _live(keys: list[str]):
+    return SharedCounter.objects.using(COUNTERS_DB).filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gte=time.time()), key__in=keys
+    )
+
+
+def release_counter(key: str, delta: int) -> None:
+    """Вычесть delta из еще не истекшего счетчика (истекший уже начался заново и не трогается)."""
+    _live([key]).update(value=F("value") - delta)
+
+
+def get_counters(keys: list[str]) -> dict[str, int]:
+    return dict(_live(keys).values_list("key", "value"))
+
+
+def delete_counters(keys: list[str]) -> None:
+    SharedCounter.objects.using(COUNTERS_DB).filter(key__in=keys).delete()
@@ -11,6 +11,8 @@ class WordForm(forms.Form):
                 "class": "form-control",
                 "placeholder": "Введите слово или фразу на английском",
                 "autocomplete": "off",
+                # Подсказки подгружает home.js
+                "list": "wordSuggestions",
             }
         ),
     )
@@ -0,0 +1,154 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.words.models import Job, QuizQuestion, UserWord, Word
+from apps.words.services import ensure_word_audio, generate_quiz_questions, get_or_create_word
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+JOB_FAILURE_HANDLERS = {}
+
+
+def job_handler(kind: str, on_failure=None):
+    """Зарегистрировать обработчик задач вида kind (и, при необходимости, реакцию на окончательный провал)."""
+
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        if on_failure is not None:
+            JOB_FAILURE_HANDLERS[kind] = on_failure
+        return func
+
+    return decorator
+
+
+def enqueue(kind: str, payload: dict, run_at=None) -> Job:
+    """Поставить задачу в очередь."""
+    return Job.objects.create(kind=kind, payload=payload, run_at=run_at or timezone.now())
+
+
+def enqueue_many(kind: str, payloads: list[dict], run_at=None) -> list[Job]:
+    """Поставить в очередь несколько задач одним INSERT."""
+    run_at = run_at or timezone.now()
+    return Job.objects.bulk_create(Job(kind=kind, payload=payload, run_at=run_at) for payload in payloads)
+
+
+def claim_jobs(limit: int) -> list[Job]:
+    """
+    Забрать до limit готовых к выполнению задач.
+
+    Задачи, зависшие в статусе running дольше JOB_LEASE_TIMEOUT (например, после падения воркера),
+    забираются повторно. Параллельные воркеры не видят строки друг друга благодаря SKIP LOCKED.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.JOB_LEASE_TIMEOUT)
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=Job.Status.PENDING, run_at__lte=now) | Q(status=Job.Status.RUNNING, updated__lt=stale))
+            .order_by("run_at")[:limit]
+        )
+        for job in jobs:
+            job.status = Job.Status.RUNNING
+            job.attempts += 1
+            # bulk_update не обновляет auto_now поля сам
+            job.updated = now
+        if jobs:
+            Job.objects.bulk_update(jobs, ["status", "attempts", "updated"])
+    return jobs
+
+
+def run_job(job: Job) -> None:
+    """Выполнить задачу; при ошибке запланировать повтор с экспоненциальной задержкой."""
+    try:
+        JOB_HANDLERS[job.kind](job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+            logger.error("Job %s (%s) failed permanently", job.pk, job.kind)
+            job.status = Job.Status.FAILED
+            on_failure = JOB_FAILURE_HANDLERS.get(job.kind)
+            if on_failure is not None:
+                on_failure(job.payload)
+        else:
+            job.status = Job.Status.PENDING
+            job.run_at = timezone.now() + timedelta(seconds=settings.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1))
+    else:
+        job.status = Job.Status.DONE
+        job.last_error = ""
+    job.save(update_fields=["status", "run_at", "last_error", "updated"])
+
+
+def request_word_audio(word: Word) -> None:
+    """
+    Поставить генерацию произношения слова в очередь, если она еще не запрошена.
+
+    После провала (failed) генерацию можно запросить снова через WORD_AUDIO_RETRY_DELAY секунд.
+    """
+    if word.audio_status not in (Word.AudioStatus.NONE, Word.AudioStatus.FAILED):
+        return
+    now = timezone.now()
+    requestable = Q(audio_status=Word.AudioStatus.NONE) | Q(
+        audio_status=Word.AudioStatus.FAILED, updated__lt=now - timedelta(seconds=settings.WORD_AUDIO_RETRY_DELAY)
+    )
+    # Условное обновление и задача в одной транзакции: задачу ставит только тот, кто перевел статус
+    # в pending, и слово не останется в pending без задачи
+    with transaction.atomic():
+        updated = Word.objects.filter(requestable, pk=word.pk).update(
+            audio_status=Word.AudioStatus.PENDING, updated=now
+        )
+        if updated:
+            enqueue("word_audio", {"word_id": str(word.pk)})
+    if updated:
+        word.audio_status = Word.AudioStatus.PENDING
+
+
+def _mark_word_audio_failed(payload: dict) -> None:
+    Word.objects.filter(pk=payload["word_id"]).update(audio_status=Word.AudioStatus.FAILED, updated=timezone.now())
+
+
+@job_handler("word_audio", on_failure=_mark_word_audio_failed)
+def generate_word_audio(payload: dict) -> None:
+    word = Word.objects.filter(pk=payload["word_id"]).first()
+    if word is None:
+        return
+    ensure_word_audio(word)
+
+
+def request_quiz_questions(word_ids) -> int:
+    """Поставить в очередь генерацию вопросов квиза для слов, по которым она еще не запрошена."""
+    word_ids = {str(word_id) for word_id in word_ids}
+    queued = Job.objects.filter(
+        kind="quiz_questions",
+        status__in=(Job.Status.PENDING, Job.Status.RUNNING),
+        payload__word_id__in=word_ids,
+    ).values_list("payload__word_id", flat=True)
+    missing = word_ids - set(queued)
+    enqueue_many("quiz_questions", [{"word_id": word_id} for word_id in sorted(missing)])
+    return len(missing)
+
+
+@job_handler("quiz_questions")
+def generate_word_quiz_questions(payload: dict) -> None:
+    word = Word.objects.filter(pk=payload["word_id"]).first()
+    if word is None or QuizQuestion.objects.filter(word=word).exists():
+        return
+    generate_quiz_questions(word)
+
+
+@job_handler("import_word")
+def import_word(payload: dict) -> None:
+    """Сгенерировать карточку нового слова из импортированного списка и добавить его в коллекцию."""
+    user_model = get_user_model()
+    if not user_model.objects.filter(pk=payload["user_id"]).exists():
+        return
+    word = get_or_create_word(payload["word"])
+    UserWord.objects.get_or_create(user_id=payload["user_id"], word=word)
+    request_word_audio(word)
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.words.models import AudioAsset, Word
+
+AUDIO_DIR = "tts_audio"
+
+
+class Command(BaseCommand):
+    help = "Delete audio files in the media storage (local volume or S3) that no word or audio asset references."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only print what would be deleted.")
+        parser.add_argument(
+            "--prune-assets", action="store_true", help="Also drop audio assets that no word uses anymore."
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=24,
+            help="Skip files younger than this many hours (they may still be in the middle of an upload).",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        words_with_audio = Word.objects.exclude(audio_file__isnull=True).exclude(audio_file="")
+        used_by_words = set(words_with_audio.values_list("audio_file", flat=True).iterator())
+
+        if options["prune_assets"]:
+            # NOT EXISTS, а не NOT IN: у старых слов audio_file бывает NULL, и NOT IN не вернул бы ничего
+            orphan_assets = AudioAsset.objects.filter(~Exists(Word.objects.filter(audio_file=OuterRef("file"))))
+            self.stdout.write(f"Unused audio assets: {orphan_assets.count()}")
+            if not dry_run:
+                orphan_assets.delete()
+
+        referenced = used_by_words | set(AudioAsset.objects.values_list("file", flat=True).iterator())
+        threshold = timezone.now() - timedelta(hours=options["min_age"])
+
+        deleted = 0
+        _, files = default_storage.listdir(AUDIO_DIR)
+        for filename in files:
+            name = f"{AUDIO_DIR}/{filename}"
+            if name in referenced or default_storage.get_modified_time(name) > threshold:
+                continue
+            self.stdout.write(f"{'Would delete' if dry_run else 'Deleting'} {name}")
+            if not dry_run:
+                default_storage.delete(name)
+            deleted += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Orphaned audio files: {deleted}."))
@@ -0,0 +1,34 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.words.models import UserWord, Word
+from apps.words.services import get_or_create_audio_assets, normalize_word_text
+
+
+class Command(BaseCommand):
+    help = "Generate missing word audio in batches (one TTS engine invocation per batch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        words = Word.objects.exclude(audio_status=Word.AudioStatus.READY).only("uuid", "word").order_by("word")
+
+        done = 0
+        iterator = words.iterator()
+        while batch := list(islice(iterator, options["batch_size"])):
+            assets = get_or_create_audio_assets([word.word for word in batch])
+            now = timezone.now()
+            for word in batch:
+                word.audio_file.name = assets[normalize_word_text(word.word)].file.name
+                word.audio_status = Word.AudioStatus.READY
+                word.updated = now
+            Word.objects.bulk_update(batch, ["audio_file", "audio_status", "updated"])
+            # bulk_update не вызывает сигналы: слова с аудио должны прийти в синхронизацию коллекций
+            UserWord.objects.filter(word__in=batch).update(updated=now)
+            done += len(batch)
+            self.stdout.write(f"Generated audio for {done} words.")
+
+        self.stdout.write(self.style.SUCCESS(f"Done: {done} words."))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.words.models import QuizQuestion, Word
+from apps.words.services import build_quiz_questions, generate_quiz_questions, get_linguistic_model, word_lookup_key
+
+
+class Command(BaseCommand):
+    help = "Generate persisted quiz questions for words (tops up each word to --variants questions)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("words", nargs="*", help="Words to process. All words by default.")
+        parser.add_argument("--variants", type=int, default=3, help="Number of question variants per word.")
+        parser.add_argument("--regenerate", action="store_true", help="Replace existing questions with new ones.")
+        parser.add_argument("--provider", help="Single provider to use (default: active providers with failover).")
+
+    def handle(self, *args, **options):
+        linguistic_model = get_linguistic_model(options["provider"])
+        variants = options["variants"]
+
+        words = Word.objects.all()
+        if options["words"]:
+            words = words.filter(lookup_key__in=[word_lookup_key(word) for word in options["words"]])
+
+        created = 0
+        for word in words.annotate(questions_count=Count("quiz_questions")).iterator():
+            if options["regenerate"]:
+                # Старые вопросы заменяются только после успешной генерации новых
+                questions = build_quiz_questions(word, variants, linguistic_model)
+                if not questions:
+                    self.stderr.write(f"No valid questions generated for {word.word!r}, kept the existing ones.")
+                    continue
+                with transaction.atomic():
+                    word.quiz_questions.all().delete()
+                    created += len(QuizQuestion.objects.bulk_create(questions))
+                continue
+
+            missing = variants - word.questions_count
+            if missing > 0:
+                created += len(generate_quiz_questions(word, missing, linguistic_model))
+
+        self.stdout.write(self.style.SUCCESS(f"Created {created} quiz questions."))
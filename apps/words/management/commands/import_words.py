@@ -0,0 +1,46 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from apps.words.word_lists import IMPORT_FORMATS, detect_format, import_word_list, iter_word_list
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a word list (CSV, TSV or Anki plain text export) into a user's collection. "
+        "The file is read line by line; words without a card are queued for background generation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("user", help="Username or email of the collection owner.")
+        parser.add_argument("wordlist", help="File to import, or '-' to read stdin.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="File format (default: by file extension).")
+        parser.add_argument("--batch-size", type=int, help="Words looked up and inserted at once.")
+        parser.add_argument("--max-new-words", type=int, help="Limit of words queued for generation.")
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(Q(username=options["user"]) | Q(email=options["user"]))
+        except user_model.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' not found.")
+
+        path = options["wordlist"]
+        file_format = options["format"] or detect_format(path)
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+        with stream:
+            stats = import_word_list(
+                user,
+                iter_word_list(stream, file_format),
+                batch_size=options["batch_size"],
+                max_new_words=options["max_new_words"],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Added {stats['added']}, already saved {stats['existing']}, "
+                f"queued {stats['queued']} new words, skipped {stats['skipped']}."
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.words.const import Prompts
+from apps.words.models import LinguisticAPIProvider
+from apps.words.parsing import PARSE_OUTCOMES, parse_stats
+
+
+class Command(BaseCommand):
+    help = "Show how LLM answers were parsed, per provider and prompt: directly, after JSON repair, or after a retry."
+
+    def handle(self, *args, **options):
+        providers = {"gigachat", "deepseek", *LinguisticAPIProvider.objects.values_list("codename", flat=True)}
+        stats = parse_stats(sorted(providers), [prompt.name for prompt in Prompts])
+        if not stats:
+            self.stdout.write("No parsed answers recorded yet.")
+            return
+
+        self.stdout.write(f"{'provider':<12} {'prompt':<16} " + " ".join(f"{outcome:>9}" for outcome in PARSE_OUTCOMES))
+        for (provider, prompt_name), counts in sorted(stats.items()):
+            self.stdout.write(
+                f"{provider:<12} {prompt_name:<16} " + " ".join(f"{counts[outcome]:>9}" for outcome in PARSE_OUTCOMES)
+            )
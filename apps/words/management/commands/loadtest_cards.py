@@ -0,0 +1,102 @@
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+from urllib.parse import quote
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from apps.words.models import Word
+
+# Статусы X-Cache-Status, при которых nginx ходил в Django
+UPSTREAM_CACHE_STATUSES = {"MISS", "EXPIRED", "BYPASS", "REVALIDATED", "-"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the word card endpoint (GET words/card/<key>/) and report how many requests reached Django, "
+        "based on nginx's X-Cache-Status header."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("base_url", help="Site URL, e.g. https://wordcard.fun or http://localhost:8000.")
+        parser.add_argument("--words", type=int, default=50, help="Number of words to request (taken from the DB).")
+        parser.add_argument("--word", action="append", default=[], help="Word key to request (repeatable).")
+        parser.add_argument("--requests", type=int, default=2000, help="Total requests.")
+        parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight.")
+        parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent: popular words get most requests.")
+
+    def handle(self, *args, **options):
+        keys = options["word"] or list(
+            Word.objects.filter(audio_status=Word.AudioStatus.READY)
+            .order_by("?")
+            .values_list("lookup_key", flat=True)[: options["words"]]
+        )
+        if not keys:
+            raise CommandError("No words to request: pass --word or generate some words first.")
+
+        base_url = options["base_url"].rstrip("/")
+        urls = [
+            base_url + reverse("words:word_card", args=["__word__"]).replace("__word__", quote(key)) for key in keys
+        ]
+        # Распределение Ципфа: как в реальном трафике, несколько слов запрашиваются намного чаще остальных
+        weights = [1 / rank ** options["skew"] for rank in range(1, len(urls) + 1)]
+        plan = random.choices(urls, weights=weights, k=options["requests"])
+
+        started = time.monotonic()
+        results = asyncio.run(self._run(plan, options["concurrency"]))
+        elapsed = time.monotonic() - started
+
+        statuses = Counter(status for status, _, _ in results)
+        cache_statuses = Counter(cache_status for _, cache_status, _ in results)
+        latencies = sorted(latency for _, _, latency in results)
+        upstream = sum(
+            count for cache_status, count in cache_statuses.items() if cache_status in UPSTREAM_CACHE_STATUSES
+        )
+
+        self.stdout.write(
+            f"{len(results)} requests for {len(urls)} words in {elapsed:.1f}s ({len(results) / elapsed:.0f} rps)"
+        )
+        self.stdout.write(
+            f"Latency p50 {statistics.median(latencies) * 1000:.1f} ms, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms"
+        )
+        self.stdout.write(
+            "HTTP status: " + ", ".join(f"{status} x{count}" for status, count in sorted(statuses.items()))
+        )
+        self.stdout.write(
+            "X-Cache-Status: " + ", ".join(f"{status} x{count}" for status, count in cache_statuses.most_common())
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Requests that reached Django: {upstream} of {len(results)} ({upstream / len(results):.1%})"
+            )
+        )
+
+    async def _run(self, plan: list[str], concurrency: int) -> list[tuple[int, str, float]]:
+        queue = asyncio.Queue()
+        for url in plan:
+            queue.put_nowait(url)
+        results = []
+
+        async def worker(client: httpx.AsyncClient):
+            while not queue.empty():
+                url = queue.get_nowait()
+                started = time.monotonic()
+                try:
+                    response = await client.get(url)
+                except httpx.HTTPError:
+                    results.append((0, "ERROR", time.monotonic() - started))
+                    continue
+                # Без nginx перед приложением заголовка нет: каждый запрос доходит до Django
+                results.append(
+                    (response.status_code, response.headers.get("X-Cache-Status", "-"), time.monotonic() - started)
+                )
+
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits, follow_redirects=True, timeout=30) as client:
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        return results
@@ -0,0 +1,183 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.words.models import QuizQuestion, Word
+from apps.words.services import (
+    get_linguistic_model,
+    get_or_create_audio_assets,
+    normalize_word_text,
+    word_fields_from_card,
+    word_lookup_key,
+)
+
+
+class RateLimiter:
+    """Не чаще rate вызовов в секунду на все потоки."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-generate word cards (definition, examples, quiz and audio) for a word list. "
+        "Words that already exist are skipped; progress is checkpointed, so an interrupted run can be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("wordlist", help="File with one word or phrase per line, or '-' to read stdin.")
+        parser.add_argument("--provider", help="Single provider to use (default: active providers with failover).")
+        parser.add_argument("--workers", type=int, default=8, help="Parallel LLM requests.")
+        parser.add_argument("--rate", type=float, default=2.0, help="Max LLM requests per second for the provider.")
+        parser.add_argument("--batch-size", type=int, default=50, help="Words written to the database at once.")
+        parser.add_argument("--checkpoint", help="Checkpoint file (default: <wordlist>.checkpoint).")
+        parser.add_argument("--skip-audio", action="store_true", help="Leave audio to the background worker.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        self.linguistic_model = get_linguistic_model(options["provider"])
+        self.limiter = RateLimiter(options["rate"])
+        self.stats = Counter()
+
+        checkpoint_path = options["checkpoint"] or (
+            "prewarm.checkpoint" if options["wordlist"] == "-" else f"{options['wordlist']}.checkpoint"
+        )
+        words = self._read_words(options["wordlist"], self._read_checkpoint(checkpoint_path))
+        self.stdout.write(f"{len(words)} words to process, checkpoint: {checkpoint_path}")
+
+        batch_size = options["batch_size"]
+        with (
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint,
+            ThreadPoolExecutor(max_workers=options["workers"], thread_name_prefix="prewarm") as executor,
+        ):
+            for start in range(0, len(words), batch_size):
+                batch = words[start : start + batch_size]
+                done = self._process_batch(batch, executor, options["skip_audio"])
+
+                # В контрольную точку попадают только обработанные слова: упавшие повторятся при следующем запуске
+                checkpoint.write("".join(f"{word}\n" for word in done))
+                checkpoint.flush()
+                os.fsync(checkpoint.fileno())
+                self.stdout.write(f"Processed {start + len(batch)}/{len(words)}")
+
+        elapsed = time.monotonic() - started
+        generated = self.stats["generated"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {generated}, skipped {self.stats['skipped']} existing, failed {self.stats['failed']}, "
+                f"audio failed {self.stats['audio_failed']} in {elapsed:.1f}s "
+                f"({generated / elapsed if elapsed else 0:.2f} words/s)."
+            )
+        )
+
+    def _read_checkpoint(self, path: str) -> set[str]:
+        if not os.path.exists(path):
+            return set()
+        with open(path, encoding="utf-8") as checkpoint:
+            return {line.strip() for line in checkpoint if line.strip()}
+
+    def _read_words(self, path: str, processed: set[str]) -> list[str]:
+        max_length = Word._meta.get_field("name").max_length
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        words = {}
+        with stream:
+            for line in stream:
+                text = normalize_word_text(line)
+                if not word_lookup_key(text) or text in processed:
+                    continue
+                if len(text) > max_length:
+                    self.stderr.write(f"Skipping '{text}': longer than {max_length} characters")
+                    continue
+                # Варианты одного слова ("Apple", "apple.") генерируются один раз
+                words.setdefault(word_lookup_key(text), text)
+        return list(words.values())
+
+    def _generate(self, key: str) -> dict | None:
+        self.limiter.wait()
+        try:
+            return self.linguistic_model.get_word_card(key)
+        except Exception as exc:
+            self.stderr.write(f"Failed to generate '{key}': {exc}")
+            return None
+
+    def _process_batch(self, batch: list[str], executor: ThreadPoolExecutor, skip_audio: bool) -> list[str]:
+        keys = {text: word_lookup_key(text) for text in batch}
+        existing_keys = set(Word.objects.filter(lookup_key__in=keys.values()).values_list("lookup_key", flat=True))
+        existing = {text for text in batch if keys[text] in existing_keys}
+        self.stats["skipped"] += len(existing)
+        todo = [key for key in batch if key not in existing]
+
+        cards = {key: card for key, card in zip(todo, executor.map(self._generate, todo)) if card is not None}
+        self.stats["failed"] += len(todo) - len(cards)
+
+        created = self._save_words(cards)
+        self.stats["generated"] += len(created)
+        if created and not skip_audio:
+            self._save_audio(created)
+
+        # В контрольную точку идут только слова, которые есть в БД: строки, пропущенные ON CONFLICT
+        # (например, по name у другого ключа), повторятся при следующем запуске
+        present = set(Word.objects.filter(lookup_key__in=keys.values()).values_list("lookup_key", flat=True))
+        dropped = [text for text in cards if keys[text] not in present]
+        for text in dropped:
+            self.stderr.write(f"Failed to save '{text}': conflicts with an existing word")
+        self.stats["failed"] += len(dropped)
+        return [text for text in batch if keys[text] in present]
+
+    @transaction.atomic
+    def _save_words(self, cards: dict[str, dict]) -> list[Word]:
+        words = [Word(**word_fields_from_card(key, card)) for key, card in cards.items()]
+        Word.objects.bulk_create(words, ignore_conflicts=True)
+
+        # Слова, которые параллельно создал кто-то другой, пропущены ON CONFLICT — оставляем только свои
+        saved = dict(
+            Word.objects.filter(lookup_key__in=[word.lookup_key for word in words]).values_list("lookup_key", "uuid")
+        )
+        created = [word for word in words if saved.get(word.lookup_key) == word.uuid]
+
+        QuizQuestion.objects.bulk_create(
+            QuizQuestion(
+                word=word,
+                provider=cards[word.word].get("provider", self.linguistic_model.provider),
+                **cards[word.word]["quiz"],
+            )
+            for word in created
+            if cards[word.word].get("quiz")
+        )
+        return created
+
+    def _save_audio(self, words: list[Word]) -> None:
+        try:
+            assets = get_or_create_audio_assets([word.word for word in words])
+        except Exception as exc:
+            # Слова останутся без аудио, его догенерирует фоновый воркер при первом просмотре
+            self.stderr.write(f"Failed to generate audio: {exc}")
+            self.stats["audio_failed"] += len(words)
+            return
+
+        now = timezone.now()
+        for word in words:
+            word.audio_file.name = assets[normalize_word_text(word.word)].file.name
+            word.audio_status = Word.AudioStatus.READY
+            word.updated = now
+        Word.objects.bulk_update(words, ["audio_file", "audio_status", "updated"])
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.words.models import UserWordTombstone
+
+
+class Command(BaseCommand):
+    help = "Delete records of removed collection words older than SYNC_TOMBSTONE_DAYS (clients that old resync fully)."
+
+    def handle(self, *args, **options):
+        threshold = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+        deleted, _ = UserWordTombstone.objects.filter(updated__lt=threshold).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones."))
@@ -0,0 +1,38 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.words.jobs import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = "Run the background job worker (audio generation and other queued jobs)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Number of jobs executed in parallel.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Process jobs that are due now and exit.")
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        self.stdout.write(f"Job worker started with {threads} threads.")
+
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="job-worker") as executor:
+            while True:
+                jobs = claim_jobs(limit=threads)
+                if jobs:
+                    # Ждем всю пачку, чтобы не забирать больше задач, чем есть свободных потоков
+                    list(executor.map(self._run, jobs))
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+
+    @staticmethod
+    def _run(job):
+        try:
+            run_job(job)
+        finally:
+            close_old_connections()
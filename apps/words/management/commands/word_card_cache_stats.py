@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.words.cards import word_cards
+
+
+class Command(BaseCommand):
+    help = "Show word card cache hit rate: per-worker LRU hits, shared cache hits and misses (all workers)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them.")
+
+    def handle(self, *args, **options):
+        stats = word_cards.stats()
+        total = sum(stats.values())
+        if not total:
+            self.stdout.write("No word card lookups recorded yet.")
+            return
+
+        for outcome, count in stats.items():
+            self.stdout.write(f"{outcome:<8} {count:>10} {count / total:>8.1%}")
+        hits = stats["local"] + stats["shared"]
+        self.stdout.write(f"Hit rate: {hits / total:.1%} of {total} lookups.")
+
+        if options["reset"]:
+            word_cards.reset_stats()
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 18:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0003_alter_word_audio_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('question', models.TextField()),
+                ('options', models.JSONField(default=list)),
+                ('correct_answer', models.TextField()),
+                ('provider', models.CharField(blank=True, default='', max_length=75)),
+                ('word', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_questions', to='words.word')),
+            ],
+            options={
+                'verbose_name': 'Quiz Question',
+                'verbose_name_plural': 'Quiz Questions',
+            },
+        ),
+    ]
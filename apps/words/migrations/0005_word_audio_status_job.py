@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-18 18:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def mark_existing_audio_ready(apps, schema_editor):
+    Word = apps.get_model('words', 'Word')
+    Word.objects.exclude(audio_file__isnull=True).exclude(audio_file='').update(audio_status='ready')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0004_quizquestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='audio_status',
+            field=models.CharField(choices=[('none', 'None'), ('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='none', max_length=10),
+        ),
+        migrations.RunPython(mark_existing_audio_ready, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(max_length=50)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'indexes': [models.Index(fields=['status', 'run_at'], name='words_job_status_4ddf49_idx')],
+            },
+        ),
+    ]
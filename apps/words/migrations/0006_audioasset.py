@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-18 18:57
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_audio_assets(apps, schema_editor):
+    """Внести уже загруженные произношения слов в кэш аудио, чтобы не синтезировать их повторно."""
+    Word = apps.get_model('words', 'Word')
+    AudioAsset = apps.get_model('words', 'AudioAsset')
+
+    for word, audio_file in Word.objects.exclude(audio_file='').exclude(audio_file__isnull=True).values_list('word', 'audio_file'):
+        text = ' '.join(word.lower().split())
+        digest = hashlib.sha256(f'gtts\0en\0{text}'.encode()).hexdigest()
+        AudioAsset.objects.get_or_create(digest=digest, defaults={'text': text, 'lang': 'en', 'engine': 'gtts', 'file': audio_file})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0005_word_audio_status_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('text', models.TextField()),
+                ('lang', models.CharField(max_length=10)),
+                ('engine', models.CharField(max_length=50)),
+                ('file', models.FileField(upload_to='tts_audio/')),
+            ],
+            options={
+                'verbose_name': 'Audio Asset',
+                'verbose_name_plural': 'Audio Assets',
+            },
+        ),
+        migrations.RunPython(backfill_audio_assets, migrations.RunPython.noop),
+    ]
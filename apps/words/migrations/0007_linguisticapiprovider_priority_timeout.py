@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0006_audioasset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='linguisticapiprovider',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='linguisticapiprovider',
+            name='timeout',
+            field=models.FloatField(default=30.0, help_text='Seconds to wait before failing over to the next provider'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-18 19:11
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0007_linguisticapiprovider_priority_timeout'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userword',
+            name='due_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='userword',
+            name='ease',
+            field=models.FloatField(default=2.5),
+        ),
+        migrations.AddField(
+            model_name='userword',
+            name='interval',
+            field=models.PositiveIntegerField(default=0, help_text='Days until the next review'),
+        ),
+        migrations.AddField(
+            model_name='userword',
+            name='repetitions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='userword',
+            index=models.Index(fields=['user', 'due_at'], name='words_userw_user_id_312317_idx'),
+        ),
+    ]
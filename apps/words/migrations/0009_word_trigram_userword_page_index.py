@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 19:13
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0008_userword_schedule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='userword',
+            index=models.Index(fields=['user', 'familiarity_score', 'id'], name='words_userw_user_id_e33a38_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='word',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['word'], name='words_word_word_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2 on 2026-10-18 20:02
+
+import logging
+import unicodedata
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+# Копия apps.words.normalization.word_lookup_key на момент миграции: дальнейшие изменения
+# нормализации не должны менять то, как эта миграция сливает слова
+_WORD_JOINERS = "'-."
+_WORD_SYMBOLS = "+#"
+_JOINER_VARIANTS = str.maketrans({"’": "'", "‘": "'", "ʼ": "'", "`": "'", "‐": "-", "‑": "-"})
+
+
+def word_lookup_key(text):
+    text = unicodedata.normalize('NFKC', text).casefold().translate(_JOINER_VARIANTS)
+    chars = []
+    for char in text:
+        if char not in _WORD_JOINERS + _WORD_SYMBOLS and unicodedata.category(char)[0] in 'PS':
+            char = ' '
+        chars.append(char)
+    tokens = ''.join(chars).split()
+    return ' '.join(token.strip(_WORD_JOINERS) for token in tokens if token.strip(_WORD_JOINERS))
+
+
+def merge_duplicate_words(apps, schema_editor):
+    """
+    Заполнить lookup_key и слить дубликаты слов ("Apple" и "apple ").
+
+    Сливаются только слова, совпадающие без учета регистра и пробелов; остается самое старое,
+    вопросы квиза и слова пользователей переносятся на него. Если слово было сохранено
+    у пользователя в обоих вариантах, остается запись с большим числом правильных ответов подряд
+    (repetitions), при равенстве — с меньшим familiarity_score (он растет с ошибками).
+    Остальные слова с тем же ключом ("apple" и "apple.") не сливаются: они получают ключ
+    с суффиксом из uuid и попадают в лог.
+    """
+    Word = apps.get_model('words', 'Word')
+    UserWord = apps.get_model('words', 'UserWord')
+    QuizQuestion = apps.get_model('words', 'QuizQuestion')
+
+    groups = {}
+    for word in Word.objects.order_by('created', 'uuid').only('uuid', 'word'):
+        variants = groups.setdefault(word_lookup_key(word.word), {})
+        variants.setdefault(' '.join(word.word.casefold().split()), []).append(word.uuid)
+
+    for key, variants in groups.items():
+        # Основной ключ достается варианту, который с ним совпадает, иначе самому старому
+        ordered = sorted(variants.items(), key=lambda variant: variant[0] != key)
+        for number, (_text, word_ids) in enumerate(ordered):
+            kept_id, duplicate_ids = word_ids[0], word_ids[1:]
+            if duplicate_ids:
+                _merge_words(UserWord, QuizQuestion, kept_id, duplicate_ids)
+                Word.objects.filter(uuid__in=duplicate_ids).delete()
+            kept_key = key
+            if number:
+                kept_key = f'{key[:246]}~{kept_id.hex[:8]}'
+                logger.warning('Word %s kept apart from %r with lookup_key %r', kept_id, key, kept_key)
+            Word.objects.filter(uuid=kept_id).update(lookup_key=kept_key)
+
+
+def _merge_words(UserWord, QuizQuestion, kept_id, duplicate_ids):
+    QuizQuestion.objects.filter(word_id__in=duplicate_ids).update(word_id=kept_id)
+    for user_word in UserWord.objects.filter(word_id__in=duplicate_ids):
+        kept = UserWord.objects.filter(user_id=user_word.user_id, word_id=kept_id).first()
+        if kept is None:
+            user_word.word_id = kept_id
+            user_word.save(update_fields=['word'])
+        elif (user_word.repetitions, -user_word.familiarity_score) > (kept.repetitions, -kept.familiarity_score):
+            kept.delete()
+            user_word.word_id = kept_id
+            user_word.save(update_fields=['word'])
+        else:
+            user_word.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0009_word_trigram_userword_page_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='word',
+            name='lookup_key',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.RunPython(merge_duplicate_words, migrations.RunPython.noop),
+    ]
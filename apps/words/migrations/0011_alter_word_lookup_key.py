@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Отдельная миграция: в Postgres нельзя менять таблицу в транзакции,
+    # где остались отложенные проверки внешних ключей после слияния дублей
+
+    dependencies = [
+        ('words', '0010_word_lookup_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='word',
+            name='lookup_key',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
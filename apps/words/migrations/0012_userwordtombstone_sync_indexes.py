@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 19:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0011_alter_word_lookup_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserWordTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('user_word_id', models.BigIntegerField()),
+                ('word_id', models.UUIDField()),
+            ],
+            options={
+                'verbose_name': 'User Word Tombstone',
+                'verbose_name_plural': 'User Word Tombstones',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='userword',
+            index=models.Index(fields=['user', 'updated', 'id'], name='words_userw_user_id_1c382f_idx'),
+        ),
+        migrations.AddField(
+            model_name='userwordtombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_word_tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='userwordtombstone',
+            index=models.Index(fields=['user', 'updated', 'id'], name='words_userw_user_id_b2fe20_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('words', '0012_userwordtombstone_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SharedCounter',
+            fields=[
+                ('key', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('expires_at', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Shared Counter',
+                'verbose_name_plural': 'Shared Counters',
+            },
+        ),
+    ]
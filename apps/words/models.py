@@ -1,25 +1,45 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.utils import timezone
 
 from apps.core.models import CreatedUpdatedModel, GeneralModel, LowercaseCharField
+from apps.words.normalization import word_lookup_key
 
 
 class Word(GeneralModel):
     """Модель для хранения английских слов и фраз."""
 
+    class AudioStatus(models.TextChoices):
+        NONE = "none", "None"
+        PENDING = "pending", "Pending"
+        READY = "ready", "Ready"
+        FAILED = "failed", "Failed"
+
     word = LowercaseCharField(max_length=255, unique=True, db_index=True)
+    # Канонический ключ (см. apps.words.normalization.word_lookup_key): по нему ищутся слова,
+    # чтобы "Apple", "apple " и "apple." были одной записью
+    lookup_key = models.CharField(max_length=255, unique=True)
     part_of_speech = models.CharField(max_length=50, blank=True, null=True)
     definition = models.TextField(blank=True, null=True)
     examples = models.JSONField(default=list, blank=True, null=True)
     audio_file = models.FileField(upload_to="tts_audio/", blank=True, null=True)
+    audio_status = models.CharField(max_length=10, choices=AudioStatus.choices, default=AudioStatus.NONE)
 
     class Meta:
         verbose_name = "Word"
         verbose_name_plural = "Words"
+        # Поиск по подстроке (LIKE '%...%') в "Моих словах"
+        indexes = [GinIndex(fields=["word"], name="words_word_word_trgm", opclasses=["gin_trgm_ops"])]
 
     def __str__(self):
         return self.word
 
+    def save(self, *args, **kwargs):
+        if not self.lookup_key:
+            self.lookup_key = word_lookup_key(self.word)
+        super().save(*args, **kwargs)
+
 
 class UserWord(CreatedUpdatedModel):
     """Связь между пользователем и словом с информацией о прогрессе изучения."""
@@ -28,23 +48,137 @@ class UserWord(CreatedUpdatedModel):
     word = models.ForeignKey(Word, on_delete=models.CASCADE, related_name="user_words")
     familiarity_score = models.PositiveIntegerField(default=0)
     last_reviewed = models.DateTimeField(blank=True, null=True)
+    # Расписание повторений по SM-2 (см. apps.words.scheduler)
+    due_at = models.DateTimeField(default=timezone.now)
+    ease = models.FloatField(default=2.5)
+    interval = models.PositiveIntegerField(default=0, help_text="Days until the next review")
+    repetitions = models.PositiveIntegerField(default=0)
 
     class Meta:
         verbose_name = "User Word"
         verbose_name_plural = "User Words"
         unique_together = ("user", "word")
+        indexes = [
+            models.Index(fields=["user", "due_at"]),
+            # Постраничный вывод "Моих слов" по ключу (familiarity_score, id)
+            models.Index(fields=["user", "familiarity_score", "id"]),
+            # Синхронизация изменений по ключу (updated, id)
+            models.Index(fields=["user", "updated", "id"]),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.word.word} ({self.familiarity_score})"
 
 
+class UserWordTombstone(CreatedUpdatedModel):
+    """Запись об удаленном из коллекции слове: по ней клиенты синхронизации удаляют свою копию."""
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="user_word_tombstones")
+    user_word_id = models.BigIntegerField()
+    word_id = models.UUIDField()
+
+    class Meta:
+        verbose_name = "User Word Tombstone"
+        verbose_name_plural = "User Word Tombstones"
+        indexes = [models.Index(fields=["user", "updated", "id"])]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.user_word_id} (deleted)"
+
+
+class AudioAsset(CreatedUpdatedModel):
+    """
+    Синтезированная речь, адресуемая по содержимому.
+
+    digest — sha256 от (движок, язык, нормализованный текст); одинаковая речь синтезируется
+    и загружается в хранилище один раз, а слова ссылаются на общий файл.
+    """
+
+    digest = models.CharField(max_length=64, unique=True)
+    text = models.TextField()
+    lang = models.CharField(max_length=10)
+    engine = models.CharField(max_length=50)
+    file = models.FileField(upload_to="tts_audio/")
+
+    class Meta:
+        verbose_name = "Audio Asset"
+        verbose_name_plural = "Audio Assets"
+
+    def __str__(self):
+        return f"{self.text} ({self.engine}, {self.lang})"
+
+
+class QuizQuestion(CreatedUpdatedModel):
+    """Сгенерированный вопрос квиза для слова, общий для всех пользователей."""
+
+    word = models.ForeignKey(Word, on_delete=models.CASCADE, related_name="quiz_questions")
+    question = models.TextField()
+    options = models.JSONField(default=list)
+    correct_answer = models.TextField()
+    provider = models.CharField(max_length=75, blank=True, default="")
+
+    class Meta:
+        verbose_name = "Quiz Question"
+        verbose_name_plural = "Quiz Questions"
+
+    def __str__(self):
+        return f"{self.word.word}: {self.question}"
+
+    def as_quiz(self) -> dict:
+        return {"question": self.question, "options": self.options, "correct_answer": self.correct_answer}
+
+
 class LinguisticAPIProvider(GeneralModel):
     """Модель для хранения информации о провайдерах API для определений слов."""
 
     api_key = models.CharField(max_length=255, blank=True, null=True)
     base_url = models.URLField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # Провайдеры опрашиваются по возрастанию приоритета
+    priority = models.PositiveSmallIntegerField(default=0)
+    timeout = models.FloatField(default=30.0, help_text="Seconds to wait before failing over to the next provider")
 
     class Meta:
         verbose_name = "Linguistic API Provider"
         verbose_name_plural = "Linguistic API Providers"
+
+
+class Job(CreatedUpdatedModel):
+    """Фоновая задача в очереди на базе БД, выполняется командой run_jobs."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        indexes = [models.Index(fields=["status", "run_at"])]
+
+    def __str__(self):
+        return f"{self.kind} ({self.status})"
+
+
+class SharedCounter(models.Model):
+    """Счетчик, общий для всех воркеров (лимиты LLM, статистика); меняется через apps.words.counters."""
+
+    key = models.CharField(max_length=200, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    # Время истечения по time.time(); истекший счетчик начинается заново, None — бессрочный
+    expires_at = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Shared Counter"
+        verbose_name_plural = "Shared Counters"
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
@@ -0,0 +1,40 @@
+import hashlib
+import unicodedata
+
+# Знаки внутри слова, которые остаются в ключе: don't, mother-in-law, U.S. (точки на краях отбрасываются)
+_WORD_JOINERS = "'-."
+# Знаки, которые остаются в ключе всегда: C++ и C# не должны совпадать с C
+_WORD_SYMBOLS = "+#"
+# Типографские апострофы и дефисы приводятся к ASCII
+_JOINER_VARIANTS = str.maketrans({"’": "'", "‘": "'", "ʼ": "'", "`": "'", "‐": "-", "‑": "-"})
+
+
+def normalize_word_text(text: str) -> str:
+    """Текст слова для показа и генерации: нижний регистр и схлопнутые пробелы."""
+    return " ".join(text.lower().split())
+
+
+def word_lookup_key(text: str) -> str:
+    """
+    Канонический ключ слова, по которому ищется Word.
+
+    NFKC, casefold, без пунктуации (знаки разделяют слова) и со схлопнутыми пробелами.
+    Апостроф, дефис и точка сохраняются внутри слова (U.S. -> u.s, а не us), "+" и "#" — везде.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold().translate(_JOINER_VARIANTS)
+
+    chars = []
+    for char in text:
+        if char not in _WORD_JOINERS + _WORD_SYMBOLS and unicodedata.category(char)[0] in "PS":
+            char = " "
+        chars.append(char)
+    tokens = ("".join(chars)).split()
+    return " ".join(token.strip(_WORD_JOINERS) for token in tokens if token.strip(_WORD_JOINERS))
+
+
+def fit_length(value: str, max_length: int) -> str:
+    """Обрезать значение до max_length, сохранив уникальность: у обрезанного в конце хэш полного значения."""
+    if len(value) <= max_length:
+        return value
+    digest = hashlib.sha256(value.encode()).hexdigest()[:8]
+    return f"{value[: max_length - len(digest) - 1]}-{digest}"
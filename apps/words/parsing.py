@@ -0,0 +1,177 @@
+import ast
+import json
+import re
+
+from pydantic import BaseModel, ValidationError
+
+from apps.words.const import Prompts
+from apps.words.counters import get_counters, incr_counter
+
+# Результаты разбора ответов LLM, которые считаются в метриках:
+# ok — ответ разобран сразу, repaired — после ремонта JSON,
+# retry — понадобился повторный запрос с исправлением, failed — не помог и он
+PARSE_OUTCOMES = ("ok", "repaired", "retry", "failed")
+
+_FENCE_RE = re.compile(r"```[a-zA-Z]*\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+class LLMParseError(ValueError):
+    """Ответ LLM не удалось разобрать или он не соответствует схеме."""
+
+
+def extract_json(content: str) -> str:
+    """Вырезать JSON из ответа: содержимое markdown-ограждения или первый объект/массив в тексте."""
+    match = _FENCE_RE.search(content)
+    if match:
+        content = match.group(1)
+
+    start = next((i for i, char in enumerate(content) if char in "{["), None)
+    if start is None:
+        raise LLMParseError("The answer contains no JSON object or array")
+    return content[start : _find_json_end(content, start)]
+
+
+def _find_json_end(content: str, start: int) -> int:
+    """Позиция сразу за скобкой, закрывающей открытую в start (или конец текста, если ответ оборван)."""
+    depth = 0
+    quote = None
+    escaped = False
+    for i in range(start, len(content)):
+        char = content[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(content)
+
+
+def repair_json(text: str):
+    """Разобрать почти-JSON: висячие запятые, одинарные кавычки (литералы Python), «умные» кавычки."""
+    candidates = [_TRAILING_COMMA_RE.sub(r"\1", text)]
+    candidates.append(candidates[0].translate(_SMART_QUOTES))
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return ast.literal_eval(candidate)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            pass
+    raise LLMParseError("The answer is not valid JSON")
+
+
+def parse_llm_output(content: str, schema: type[BaseModel]) -> tuple[BaseModel, bool]:
+    """Разобрать ответ LLM по pydantic-схеме. Возвращает объект схемы и признак, понадобился ли ремонт JSON."""
+    text = extract_json(content)
+    try:
+        data, repaired = json.loads(text), False
+    except json.JSONDecodeError:
+        data, repaired = repair_json(text), True
+
+    try:
+        return schema.model_validate(data), repaired
+    except ValidationError as exc:
+        errors = "; ".join(f"{'.'.join(map(str, error['loc'])) or 'answer'}: {error['msg']}" for error in exc.errors())
+        raise LLMParseError(f"The answer does not match the requested format ({errors})") from exc
+
+
+class PartialJSONFields:
+    """
+    Поля JSON-объекта, которые можно показать, пока ответ LLM еще идет потоком.
+
+    feed() принимает очередной фрагмент и возвращает события: (поле, новый текст) для строковых
+    полей text_fields по мере прихода и (поле, значение) для list_fields, как только массив закрылся.
+    """
+
+    def __init__(self, text_fields=("definition",), list_fields=("examples",)):
+        self.content = ""
+        self.emitted = dict.fromkeys((*text_fields, *list_fields), 0)
+        self.text_fields = text_fields
+        self.list_fields = list_fields
+
+    def feed(self, chunk: str) -> list[tuple[str, object]]:
+        self.content += chunk
+        events = []
+        for field in self.text_fields:
+            value = self._partial_string(field)
+            if value is not None and len(value) > self.emitted[field]:
+                events.append((field, value[self.emitted[field] :]))
+                self.emitted[field] = len(value)
+        for field in self.list_fields:
+            if not self.emitted[field]:
+                value = self._complete_list(field)
+                if value is not None:
+                    events.append((field, value))
+                    self.emitted[field] = 1
+        return events
+
+    def _partial_string(self, field: str) -> str | None:
+        """Уже пришедшая часть строкового значения поля (без оборванной escape-последовательности)."""
+        match = re.search(rf'"{field}"\s*:\s*"', self.content)
+        if match is None:
+            return None
+        content, i, raw = self.content, match.end(), []
+        while i < len(content) and content[i] != '"':
+            length = (6 if content[i + 1 : i + 2] == "u" else 2) if content[i] == "\\" else 1
+            if i + length > len(content):
+                break
+            raw.append(content[i : i + length])
+            i += length
+        try:
+            return json.loads(f'"{"".join(raw)}"', strict=False)
+        except json.JSONDecodeError:
+            return None
+
+    def _complete_list(self, field: str) -> list | None:
+        match = re.search(rf'"{field}"\s*:\s*(?=\[)', self.content)
+        if match is None:
+            return None
+        try:
+            value, _ = json.JSONDecoder(strict=False).raw_decode(self.content, match.end())
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, list) else None
+
+
+def corrective_prompt(prompt: str, error: LLMParseError) -> str:
+    """Промпт повторного запроса: исходный промпт с описанием того, что было не так в ответе."""
+    return Prompts.FIX_FORMAT.value.format(error=error) + prompt
+
+
+def _metric_key(provider: str, prompt_name: str, outcome: str) -> str:
+    return f"llm-parse:{provider}:{prompt_name}:{outcome}"
+
+
+def record_parse_outcome(provider: str, prompt_name: str, outcome: str) -> None:
+    """Учесть результат разбора в счетчиках, общих для всех воркеров."""
+    incr_counter(_metric_key(provider, prompt_name, outcome))
+
+
+def parse_stats(providers: list[str], prompt_names: list[str]) -> dict[tuple[str, str], dict[str, int]]:
+    """Счетчики результатов разбора по парам (провайдер, промпт), по которым были запросы."""
+    keys = {
+        _metric_key(provider, prompt_name, outcome): (provider, prompt_name, outcome)
+        for provider in providers
+        for prompt_name in prompt_names
+        for outcome in PARSE_OUTCOMES
+    }
+    stats = {}
+    for key, value in get_counters(list(keys)).items():
+        provider, prompt_name, outcome = keys[key]
+        stats.setdefault((provider, prompt_name), dict.fromkeys(PARSE_OUTCOMES, 0))[outcome] = value
+    return stats
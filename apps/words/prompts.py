@@ -18,3 +18,15 @@ class PromptBuilder(AbstractPromptBuilder):
         return_format = ReturnFormatPrompt.WORD_EXAMPLES.value
 
         return main_prompt + return_format
+
+    def get_word_quiz(self, word: str) -> str:
+        main_prompt = Prompts.WORD_QUIZ.value.format(word=word)
+        return_format = ReturnFormatPrompt.WORD_QUIZ.value
+
+        return main_prompt + return_format
+
+    def get_word_card(self, word: str, count: int) -> str:
+        main_prompt = Prompts.WORD_CARD.value.format(word=word, count=count)
+        return_format = ReturnFormatPrompt.WORD_CARD.value
+
+        return main_prompt + return_format
@@ -0,0 +1,87 @@
+"""
+Расписание повторений слов по алгоритму SM-2.
+
+Ответ оценивается по шкале 0–5: от 3 и выше — слово вспомнили. Интервал до следующего
+повторения растет как 1 день, 6 дней, затем умножается на ease; ошибка сбрасывает серию,
+и слово возвращается через RELEARN_DELAY.
+"""
+
+import math
+from datetime import datetime, timedelta
+
+from django.db.models import Case, DateTimeField, DurationField, ExpressionWrapper, F, IntegerField, Value, When
+from django.db.models.functions import Cast, Floor, Greatest
+
+GRADE_CORRECT = 4
+GRADE_WRONG = 1
+MIN_EASE = 1.3
+RELEARN_DELAY = timedelta(minutes=10)
+
+
+def _ease_delta(grade: int) -> float:
+    return 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02)
+
+
+def _round_half_up(value: float) -> int:
+    # Не round(): банковское округление Python и ROUND в разных СУБД расходятся на половинах (12.5)
+    return math.floor(value + 0.5)
+
+
+def next_review(ease: float, interval: int, repetitions: int, grade: int, now: datetime) -> dict:
+    """Новые значения полей расписания UserWord после ответа с оценкой grade."""
+    if grade >= 3:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = _round_half_up(interval * ease)
+        repetitions += 1
+        due_at = now + timedelta(days=interval)
+    else:
+        interval = 1
+        repetitions = 0
+        due_at = now + RELEARN_DELAY
+
+    return {
+        "ease": max(MIN_EASE, ease + _ease_delta(grade)),
+        "interval": interval,
+        "repetitions": repetitions,
+        "due_at": due_at,
+    }
+
+
+def apply_review(user_word, grade: int, now: datetime) -> None:
+    """Применить next_review к загруженному UserWord (для сохранения через bulk_update)."""
+    fields = next_review(user_word.ease, user_word.interval, user_word.repetitions, grade, now)
+    for field, value in fields.items():
+        setattr(user_word, field, value)
+
+
+def review_update(grade: int, now: datetime) -> dict:
+    """
+    То же, что next_review, но выражениями БД для QuerySet.update().
+
+    Расписание пересчитывается одним UPDATE без чтения строки: все выражения
+    в SET видят значения полей до обновления.
+    """
+    ease = Greatest(Value(MIN_EASE), F("ease") + Value(_ease_delta(grade)))
+    if grade < 3:
+        return {"ease": ease, "interval": 1, "repetitions": 0, "due_at": Value(now + RELEARN_DELAY)}
+
+    interval = Case(
+        When(repetitions=0, then=Value(1)),
+        When(repetitions=1, then=Value(6)),
+        # Как _round_half_up
+        default=Cast(Floor(F("interval") * F("ease") + Value(0.5)), IntegerField()),
+        output_field=IntegerField(),
+    )
+    return {
+        "ease": ease,
+        "interval": interval,
+        "repetitions": F("repetitions") + 1,
+        "due_at": ExpressionWrapper(
+            Value(now) + ExpressionWrapper(interval * Value(timedelta(days=1)), output_field=DurationField()),
+            output_field=DateTimeField(),
+        ),
+    }
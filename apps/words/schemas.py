@@ -1,5 +1,34 @@
-from pydantic import BaseModel, Field
+import random
+
+from pydantic import BaseModel, Field, RootModel
 
 
 class LLMWordDefinition(BaseModel):
-    word: str = Field(max_length=128, description="Definition of a word")
+    definition: str = Field(min_length=1, max_length=1024, description="Definition of a word")
+    part_of_speech: str = Field(default="", max_length=50)
+
+
+class LLMWordExamples(RootModel[list[str]]):
+    root: list[str] = Field(min_length=1, description="Usage examples")
+
+
+class LLMWordQuiz(BaseModel):
+    question: str = Field(min_length=1, description="Quiz question")
+    correct_answer: str = Field(min_length=1, description="Correct answer")
+    distractors: list[str] = Field(min_length=3, max_length=3, description="Wrong answers")
+
+    def to_quiz(self) -> dict:
+        """Вопрос квиза с перемешанными вариантами ответов."""
+        options = [self.correct_answer, *self.distractors]
+        return {
+            "question": self.question,
+            "options": random.sample(options, len(options)),
+            "correct_answer": self.correct_answer,
+        }
+
+
+class LLMWordCard(BaseModel):
+    definition: str = Field(min_length=1, max_length=1024, description="Definition of a word")
+    part_of_speech: str = Field(default="", max_length=50)
+    examples: list[str] = Field(default_factory=list, description="Usage examples")
+    quiz: LLMWordQuiz
@@ -1,26 +1,448 @@
 import abc
+import asyncio
+import hashlib
 import json
-import re
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
+from functools import cache
+from io import BytesIO
+from pathlib import Path
 
+import httpx
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Length
 from gigachat import GigaChat
-from openai import OpenAI
+from gtts import gTTS
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from pydantic import BaseModel
 
 from apps.words.const import Prompts
+from apps.words.counters import incr_counter, release_counter
+from apps.words.models import AudioAsset, LinguisticAPIProvider, QuizQuestion, Word
+from apps.words.normalization import fit_length, normalize_word_text, word_lookup_key
+from apps.words.parsing import (
+    LLMParseError,
+    PartialJSONFields,
+    corrective_prompt,
+    parse_llm_output,
+    record_parse_outcome,
+)
 from apps.words.prompts import PromptBuilder
+from apps.words.schemas import LLMWordCard, LLMWordDefinition, LLMWordExamples, LLMWordQuiz
+
+logger = logging.getLogger(__name__)
+
+
+def _get_http_limits() -> httpx.Limits:
+    """Лимиты пула HTTP-соединений (keep-alive) для клиентов LLM."""
+    return httpx.Limits(
+        max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+class PooledGigaChat(GigaChat):
+    """
+    Клиент GigaChat для долгого переиспользования.
+
+    HTTP-клиенты GigaChat сами держат keep-alive пул соединений; здесь OAuth-токен обновляется
+    заранее, за GIGACHAT_TOKEN_REFRESH_MARGIN секунд до истечения срока действия, и только
+    одним потоком или одной задачей event loop одновременно.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._token_lock = threading.Lock()
+        # asyncio.Lock привязан к event loop, поэтому у каждого loop свой (клиент общий на процесс)
+        self._atoken_locks = weakref.WeakKeyDictionary()
+
+    def _check_validity_token(self) -> bool:
+        if not self._access_token:
+            return False
+        # expires_at приходит в миллисекундах; 0 — токен без срока действия
+        expires_at = self._access_token.expires_at / 1000
+        if expires_at and expires_at - time.time() < settings.GIGACHAT_TOKEN_REFRESH_MARGIN:
+            return False
+        return True
+
+    def _update_token(self) -> None:
+        # Только один поток обновляет токен, остальные используют уже полученный
+        with self._token_lock:
+            if self._check_validity_token():
+                return
+            super()._update_token()
+
+    async def _aupdate_token(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._token_lock:
+            lock = self._atoken_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            if self._check_validity_token():
+                return
+            await super()._aupdate_token()
+
+
+class LLMClientPool:
+    """
+    Пул клиентов LLM: один лениво создаваемый клиент на провайдера в рамках процесса.
+
+    Каждый воркер gunicorn получает собственный набор клиентов: при смене pid
+    (fork после импорта) пул сбрасывается.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, factory):
+        """Вернуть клиент по ключу, создав его через factory при первом обращении."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._clients = {}
+                self._pid = os.getpid()
+
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+
+            self.misses += 1
+            client = factory()
+            self._clients[key] = client
+            return client
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "clients": len(self._clients)}
+
+    def clear(self) -> None:
+        """Закрыть и забыть все клиенты."""
+        with self._lock:
+            for client in self._clients.values():
+                # Асинхронные клиенты (AsyncOpenAI) живут до конца процесса вместе с event loop
+                if not asyncio.iscoroutinefunction(client.close):
+                    client.close()
+            self._clients = {}
+
+
+client_pool = LLMClientPool()
+
+
+class SingleFlight:
+    """
+    Схлопывание одновременных вызовов с одинаковым ключом в рамках процесса.
+
+    Первый вызов выполняет функцию, остальные ждут и получают его результат (или исключение).
+    """
+
+    def __init__(self):
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._futures.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._futures[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+
+word_flight = SingleFlight()
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight для корутин в рамках event loop процесса.
+
+    Общая работа выполняется в отдельной задаче: отключение одного клиента отменяет только
+    его ожидание, а задача отменяется, лишь когда ждать ее результата больше некому.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        # Число ожидающих по задаче: последний отменившийся отменяет и саму задачу
+        self._waiters = {}
+
+    async def do(self, key, fn):
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key, task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Ожидающих может не быть — помечаем исключение полученным, чтобы asyncio не ругался в лог
+        if not task.cancelled():
+            task.exception()
+
+
+async_word_flight = AsyncSingleFlight()
+
+
+class RateLimitExceeded(Exception):
+    """Бюджет запросов к провайдеру LLM исчерпан и не освободится за допустимое время ожидания."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for provider {provider}, retry in {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class RateLimitLease:
+    """Разрешение на один запрос к провайдеру; tokens уточняется по фактическому расходу."""
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+
+
+class ProviderRateLimiter:
+    """
+    Ограничение запросов к провайдеру LLM, общее для всех воркеров через таблицу счетчиков.
+
+    Лимиты — запросов в секунду, одновременных запросов и токенов в минуту — считаются
+    атомарными счетчиками (apps.words.counters) в окнах, которые начинаются с первого запроса.
+    Счетчик одновременных запросов живет не дольше 5 минут, так что потерянные освобождения
+    (например, после падения воркера) не копятся. Если бюджет исчерпан, запрос ждет не дольше
+    LLM_RATE_LIMIT_MAX_WAIT секунд, после чего получает RateLimitExceeded.
+    """
+
+    def __init__(self, provider: str, requests_per_second=None, max_in_flight=None, tokens_per_minute=None):
+        self.provider = provider
+        self.requests_per_second = requests_per_second
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute
+
+    def _key(self, name: str) -> str:
+        return f"llm-rate-limit:{self.provider}:{name}"
+
+    def _try_acquire(self, tokens: int):
+        """Занять бюджет под запрос; вернуть None при успехе или сколько секунд подождать."""
+        now = time.time()
+
+        if self.requests_per_second:
+            count, expires_at = incr_counter(self._key("rps"), 1, timeout=1)
+            if count > self.requests_per_second:
+                return max(expires_at - now, 0.01)
+
+        if self.tokens_per_minute:
+            count, expires_at = incr_counter(self._key("tpm"), tokens, timeout=60)
+            if count > self.tokens_per_minute:
+                release_counter(self._key("tpm"), tokens)
+                self._release_request()
+                return max(expires_at - now, 0.01)
+
+        if self.max_in_flight:
+            count, _ = incr_counter(self._key("in-flight"), 1, timeout=300)
+            if count > self.max_in_flight:
+                release_counter(self._key("in-flight"), 1)
+                if self.tokens_per_minute:
+                    release_counter(self._key("tpm"), tokens)
+                self._release_request()
+                return 0.1
+
+        return None
+
+    def _release_request(self) -> None:
+        if self.requests_per_second:
+            release_counter(self._key("rps"), 1)
+
+    @contextmanager
+    def acquire(self, tokens: int):
+        deadline = time.monotonic() + settings.LLM_RATE_LIMIT_MAX_WAIT
+        while (retry_after := self._try_acquire(tokens)) is not None:
+            if time.monotonic() + retry_after > deadline:
+                raise RateLimitExceeded(self.provider, retry_after)
+            time.sleep(retry_after)
+
+        lease = RateLimitLease(tokens)
+        try:
+            yield lease
+        finally:
+            self._finish(lease, tokens)
+
+    @asynccontextmanager
+    async def aacquire(self, tokens: int):
+        """Асинхронный вариант acquire: ожидание бюджета не занимает поток."""
+        deadline = time.monotonic() + settings.LLM_RATE_LIMIT_MAX_WAIT
+        while (retry_after := await sync_to_async(self._try_acquire)(tokens)) is not None:
+            if time.monotonic() + retry_after > deadline:
+                raise RateLimitExceeded(self.provider, retry_after)
+            await asyncio.sleep(retry_after)
+
+        lease = RateLimitLease(tokens)
+        try:
+            yield lease
+        finally:
+            await sync_to_async(self._finish)(lease, tokens)
+
+    def _finish(self, lease: RateLimitLease, tokens: int) -> None:
+        if self.max_in_flight:
+            release_counter(self._key("in-flight"), 1)
+        # Резервировали по оценке — поправляем на фактический расход в текущем окне
+        if self.tokens_per_minute and lease.tokens != tokens:
+            release_counter(self._key("tpm"), tokens - lease.tokens)
+
+
+@cache
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    return ProviderRateLimiter(provider, **settings.LLM_RATE_LIMITS.get(provider, {}))
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Грубая оценка расхода токенов на запрос: ~4 символа на токен плюс запас на ответ."""
+    return len(prompt) // 4 + settings.LLM_COMPLETION_TOKENS_ESTIMATE
+
+
+# Ограниченный пул потоков для параллельных запросов к LLM и синтеза речи
+fetch_executor = ThreadPoolExecutor(max_workers=settings.LLM_FETCH_WORKERS, thread_name_prefix="word-fetch")
+# Отдельный пул для запросов FailoverLinguisticModel: они сами могут использовать fetch_executor
+provider_executor = ThreadPoolExecutor(max_workers=settings.LLM_FETCH_WORKERS, thread_name_prefix="llm-provider")
+
+
+def _word_card(word: str, card: LLMWordCard) -> dict:
+    """Карточка слова из структурированного ответа на промпт WORD_CARD."""
+    return {"word": word} | card.model_dump(exclude={"quiz"}) | {"quiz": card.quiz.to_quiz()}
 
 
 class BaseLinguisticModel(abc.ABC):
     """Абстрактный класс для работы с различными API для получения определений слов."""
 
+    provider: str = ""
+
+    @abc.abstractmethod
+    def _complete(self, prompt: str):
+        """Отправить промпт провайдеру и вернуть ответ в формате chat completion."""
+        pass
+
+    def chat(self, prompt: str) -> str:
+        """Отправить промпт с учетом лимитов провайдера и вернуть текст ответа."""
+        with get_rate_limiter(self.provider).acquire(estimate_tokens(prompt)) as lease:
+            completion = self._complete(prompt)
+            if completion.usage:
+                lease.tokens = completion.usage.total_tokens
+        return completion.choices[0].message.content.strip()
+
+    async def _acomplete(self, prompt: str):
+        """Асинхронный _complete; провайдеры с асинхронным клиентом переопределяют, остальные идут в поток."""
+        return await sync_to_async(self._complete, thread_sensitive=False)(prompt)
+
+    async def achat(self, prompt: str) -> str:
+        """Асинхронный вариант chat."""
+        async with get_rate_limiter(self.provider).aacquire(estimate_tokens(prompt)) as lease:
+            completion = await self._acomplete(prompt)
+            if completion.usage:
+                lease.tokens = completion.usage.total_tokens
+        return completion.choices[0].message.content.strip()
+
+    def chat_parsed(self, prompt: str, schema: type[BaseModel], prompt_name: str) -> BaseModel:
+        """
+        Отправить промпт и разобрать ответ по pydantic-схеме.
+
+        Повторный запрос с описанием ошибки отправляется, только если ответ не удалось
+        разобрать даже после ремонта JSON.
+        """
+        try:
+            result, repaired = parse_llm_output(self.chat(prompt), schema)
+        except LLMParseError as exc:
+            record_parse_outcome(self.provider, prompt_name, "retry")
+            try:
+                result, _ = parse_llm_output(self.chat(corrective_prompt(prompt, exc)), schema)
+            except LLMParseError:
+                record_parse_outcome(self.provider, prompt_name, "failed")
+                raise
+            return result
+        record_parse_outcome(self.provider, prompt_name, "repaired" if repaired else "ok")
+        return result
+
+    async def achat_parsed(self, prompt: str, schema: type[BaseModel], prompt_name: str) -> BaseModel:
+        """Асинхронный вариант chat_parsed."""
+        record = sync_to_async(record_parse_outcome)
+        try:
+            result, repaired = parse_llm_output(await self.achat(prompt), schema)
+        except LLMParseError as exc:
+            await record(self.provider, prompt_name, "retry")
+            try:
+                result, _ = parse_llm_output(await self.achat(corrective_prompt(prompt, exc)), schema)
+            except LLMParseError:
+                await record(self.provider, prompt_name, "failed")
+                raise
+            return result
+        await record(self.provider, prompt_name, "repaired" if repaired else "ok")
+        return result
+
+    def _astream(self, prompt: str):
+        """Асинхронный поток фрагментов chat completion или None, если провайдер не умеет отдавать ответ потоком."""
+        return None
+
+    async def astream_chat(self, prompt: str):
+        """Отправить промпт с учетом лимитов провайдера и отдавать текст ответа по мере генерации."""
+        chunks = self._astream(prompt)
+        if chunks is None:
+            yield await self.achat(prompt)
+            return
+
+        async with get_rate_limiter(self.provider).aacquire(estimate_tokens(prompt)) as lease:
+            async for chunk in chunks:
+                if chunk.usage:
+                    lease.tokens = chunk.usage.total_tokens
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
     @abc.abstractmethod
     def get_word_definition(self, word: str) -> dict:
         """Получить определение слова."""
         pass
 
     @abc.abstractmethod
-    def get_word_examples(self, word: str) -> list:
-        """Получить примеры использования слова."""
+    def get_word_examples(self, word: str, count: int = 3) -> list:
+        """Получить count примеров использования слова."""
         pass
 
     @abc.abstractmethod
@@ -28,28 +450,108 @@ class BaseLinguisticModel(abc.ABC):
         """Сгенерировать вопрос и варианты ответов для квиза."""
         pass
 
+    def get_word_data(self, word: str) -> dict:
+        """Получить определение и примеры слова, отправив оба запроса одновременно."""
+        definition_future = fetch_executor.submit(self.get_word_definition, word)
+        examples_future = fetch_executor.submit(self.get_word_examples, word)
+
+        return definition_future.result() | {"examples": examples_future.result()}
+
+    def get_word_card(self, word: str, count: int = 3) -> dict:
+        """
+        Получить карточку слова: определение, часть речи, примеры и вопрос квиза.
+
+        Провайдеры, умеющие отвечать структурированным JSON, переопределяют метод
+        и делают это одним запросом.
+        """
+        quiz_future = fetch_executor.submit(self.generate_quiz_options, word)
+        return {"word": word} | self.get_word_data(word) | {"quiz": quiz_future.result()}
+
+    async def aget_word_card(self, word: str, count: int = 3) -> dict:
+        """Асинхронный вариант get_word_card."""
+        return await sync_to_async(self.get_word_card, thread_sensitive=False)(word, count)
+
+    async def agenerate_quiz_options(self, word: str) -> dict:
+        """Асинхронный вариант generate_quiz_options."""
+        return await sync_to_async(self.generate_quiz_options, thread_sensitive=False)(word)
+
+    async def aget_word_examples(self, word: str, count: int = 3) -> list:
+        """Асинхронный вариант get_word_examples."""
+        return await sync_to_async(self.get_word_examples, thread_sensitive=False)(word, count)
+
 
 class DeepSeekLinguisticModel(BaseLinguisticModel):
     """Реализация для API DeepSeek."""
 
-    def __init__(self, api_key=None):
+    provider = "deepseek"
+
+    def __init__(self, api_key=None, base_url=None, timeout=None):
         self.api_key = api_key or settings.DEEPSEEK_API_KEY
-        self.base_url = settings.DEEPSEEK_API_BASE_URL
-        self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
+        self.base_url = base_url or settings.DEEPSEEK_API_BASE_URL
+        # С таймаутом провайдера запрос обрывает сам клиент и освобождает поток; повторы делает
+        # FailoverLinguisticModel на другом провайдере, а не клиент
+        options = {"timeout": timeout, "max_retries": 0} if timeout else {}
+        self.client = client_pool.get(
+            ("deepseek", self.base_url, self.api_key, timeout),
+            lambda: OpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key,
+                http_client=DefaultHttpxClient(limits=_get_http_limits()),
+                **options,
+            ),
+        )
+        self.aclient = client_pool.get(
+            ("deepseek-async", self.base_url, self.api_key, timeout),
+            lambda: AsyncOpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key,
+                http_client=DefaultAsyncHttpxClient(limits=_get_http_limits()),
+                **options,
+            ),
+        )
 
-    def get_word_definition(self, word: str) -> dict:
-        prompt = Prompts.WORD_DEFINITION.value.format(word=word)
-        completion = self.client.chat.completions.create(
+    def _complete(self, prompt: str):
+        return self.client.chat.completions.create(
             extra_body={}, model="deepseek/deepseek-r1:free", messages=[{"role": "user", "content": prompt}]
         )
-        return {"word": word, "part_of_speech": "", "definition": completion.choices[0].message.content}
 
-    def get_word_examples(self, word: str) -> list:
-        prompt = Prompts.WORD_EXAMPLES.value.format(word=word)
-        completion = self.client.chat.completions.create(
+    async def _acomplete(self, prompt: str):
+        return await self.aclient.chat.completions.create(
             extra_body={}, model="deepseek/deepseek-r1:free", messages=[{"role": "user", "content": prompt}]
         )
-        return completion.choices[0].message.content.split("\n")
+
+    async def _astream(self, prompt: str):
+        stream = await self.aclient.chat.completions.create(
+            extra_body={},
+            model="deepseek/deepseek-r1:free",
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        async for chunk in stream:
+            yield chunk
+
+    def get_word_definition(self, word: str) -> dict:
+        prompt = Prompts.WORD_DEFINITION.value.format(word=word)
+        return {"word": word, "part_of_speech": "", "definition": self.chat(prompt)}
+
+    def get_word_examples(self, word: str, count: int = 3) -> list:
+        prompt = Prompts.WORD_EXAMPLES.value.format(word=word, count=count)
+        return self.chat(prompt).split("\n")
+
+    async def aget_word_examples(self, word: str, count: int = 3) -> list:
+        prompt = Prompts.WORD_EXAMPLES.value.format(word=word, count=count)
+        return (await self.achat(prompt)).split("\n")
+
+    def get_word_card(self, word: str, count: int = 3) -> dict:
+        prompt = PromptBuilder().get_word_card(word, count)
+        return _word_card(word, self.chat_parsed(prompt, LLMWordCard, Prompts.WORD_CARD.name))
+
+    async def aget_word_card(self, word: str, count: int = 3) -> dict:
+        prompt = PromptBuilder().get_word_card(word, count)
+        return _word_card(word, await self.achat_parsed(prompt, LLMWordCard, Prompts.WORD_CARD.name))
+
+    async def agenerate_quiz_options(self, word: str) -> dict:
+        return self.generate_quiz_options(word)
 
     def generate_quiz_options(self, word: str) -> dict:
         # Заполним моковыми данными
@@ -66,64 +568,768 @@ class DeepSeekLinguisticModel(BaseLinguisticModel):
 
 
 class GigaChatModel(BaseLinguisticModel):
-    def __init__(self):
-        self.giga = GigaChat(credentials=settings.GIGACHAT_AUTH_KEY, verify_ssl_certs=False)
+    provider = "gigachat"
+
+    def __init__(self, credentials=None, timeout=None):
+        credentials = credentials or settings.GIGACHAT_AUTH_KEY
+        self.giga = client_pool.get(
+            ("gigachat", credentials, timeout),
+            lambda: PooledGigaChat(credentials=credentials, verify_ssl_certs=False, timeout=timeout),
+        )
         self.prompt_builder = PromptBuilder()
 
+    def _complete(self, prompt: str):
+        return self.giga.chat(prompt)
+
+    async def _acomplete(self, prompt: str):
+        return await self.giga.achat(prompt)
+
+    def _astream(self, prompt: str):
+        return self.giga.astream(prompt)
+
     def get_word_definition(self, word: str) -> dict:
         prompt = self.prompt_builder.get_word_definition(word)
-        response = self.giga.chat(prompt)
+        definition = self.chat_parsed(prompt, LLMWordDefinition, Prompts.WORD_DEFINITION.name)
+        return {"word": word} | definition.model_dump()
+
+    def get_word_examples(self, word: str, count: int = 3) -> list[str]:
+        prompt = self.prompt_builder.get_word_examples(word, count)
+        return self.chat_parsed(prompt, LLMWordExamples, Prompts.WORD_EXAMPLES.name).root
+
+    async def aget_word_examples(self, word: str, count: int = 3) -> list[str]:
+        prompt = self.prompt_builder.get_word_examples(word, count)
+        return (await self.achat_parsed(prompt, LLMWordExamples, Prompts.WORD_EXAMPLES.name)).root
+
+    def get_word_card(self, word: str, count: int = 3) -> dict:
+        prompt = self.prompt_builder.get_word_card(word, count)
+        return _word_card(word, self.chat_parsed(prompt, LLMWordCard, Prompts.WORD_CARD.name))
+
+    async def aget_word_card(self, word: str, count: int = 3) -> dict:
+        prompt = self.prompt_builder.get_word_card(word, count)
+        return _word_card(word, await self.achat_parsed(prompt, LLMWordCard, Prompts.WORD_CARD.name))
+
+    def generate_quiz_options(self, word: str) -> dict:
+        prompt = self.prompt_builder.get_word_quiz(word)
+        return self.chat_parsed(prompt, LLMWordQuiz, Prompts.WORD_QUIZ.name).to_quiz()
+
+    async def agenerate_quiz_options(self, word: str) -> dict:
+        prompt = self.prompt_builder.get_word_quiz(word)
+        return (await self.achat_parsed(prompt, LLMWordQuiz, Prompts.WORD_QUIZ.name)).to_quiz()
+
+
+class CircuitBreaker:
+    """
+    Предохранитель провайдера в рамках процесса.
+
+    Размыкается, когда среди последних вызовов доля ошибок (медленный вызов тоже считается
+    ошибкой) достигает порога. Через LLM_BREAKER_COOLDOWN секунд пропускает один пробный вызов:
+    успех замыкает цепь, ошибка снова размыкает.
+    """
+
+    def __init__(self, slow_call_seconds: float):
+        self.slow_call_seconds = slow_call_seconds
+        self._outcomes = deque(maxlen=settings.LLM_BREAKER_WINDOW)
+        self._opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
 
-        response_content = response.choices[0].message.content.strip()
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
 
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._trial_in_progress and time.monotonic() - self._opened_at >= settings.LLM_BREAKER_COOLDOWN:
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def record(self, ok: bool, latency: float) -> None:
+        ok = ok and latency <= self.slow_call_seconds
+        with self._lock:
+            if self._opened_at is not None:
+                if self._trial_in_progress:
+                    self._trial_in_progress = False
+                    self._opened_at = None if ok else time.monotonic()
+                    if ok:
+                        self._outcomes.clear()
+                return
+
+            self._outcomes.append((ok, latency))
+            failures = sum(1 for outcome_ok, _ in self._outcomes if not outcome_ok)
+            if (
+                len(self._outcomes) >= settings.LLM_BREAKER_MIN_CALLS
+                and failures / len(self._outcomes) >= settings.LLM_BREAKER_ERROR_RATE
+            ):
+                self._opened_at = time.monotonic()
+
+    def latency_p95(self):
+        """p95 времени успешных вызовов или None, если данных мало."""
+        with self._lock:
+            latencies = sorted(latency for ok, latency in self._outcomes if ok)
+        if len(latencies) < settings.LLM_BREAKER_MIN_CALLS:
+            return None
+        return latencies[int(0.95 * (len(latencies) - 1))]
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(key, slow_call_seconds: float) -> CircuitBreaker:
+    """Предохранитель настроенного провайдера (ключ — pk LinguisticAPIProvider, у каждого свой ключ API)."""
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(slow_call_seconds)
+        breaker.slow_call_seconds = slow_call_seconds
+        return breaker
+
+
+class FailoverLinguisticModel(BaseLinguisticModel):
+    """
+    Упорядоченный список провайдеров с переключением при ошибках.
+
+    Запрос идет первому провайдеру с замкнутым предохранителем. При ошибке или превышении
+    таймаута провайдера запрос уходит следующему. С LLM_HEDGE_REQUESTS, если ответ не пришел
+    за p95 обычного времени ответа, следующему провайдеру отправляется дублирующий запрос
+    и берется первый успешный ответ.
+    """
+
+    provider = "failover"
+
+    def __init__(self, members: list[tuple[BaseLinguisticModel, float, object]]):
+        """members — (модель, таймаут, ключ предохранителя) в порядке опроса."""
+        self.members = [
+            (model, timeout, get_circuit_breaker(breaker_key, timeout)) for model, timeout, breaker_key in members
+        ]
+
+    def _run(self, model: BaseLinguisticModel, breaker: CircuitBreaker, method: str, args):
+        started = time.monotonic()
         try:
-            dict_response = json.loads(response_content)
-        except json.JSONDecodeError:
-            response_content = response_content.replace("\\'", "'")
-            # Заменяем одинарные кавычки вокруг ключей
-            response_content = re.sub(r"([{,]\s*)'(.*?)'(?=\s*:)", r'\1"\2"', response_content)
-            # Заменяем одинарные кавычки вокруг значений
-            response_content = re.sub(r"(:\s*)'(.*?)'(?=[,}])", r'\1"\2"', response_content)
+            result = getattr(model, method)(*args)
+        except Exception:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(True, time.monotonic() - started)
+        if isinstance(result, dict):
+            result = result | {"provider": model.provider}
+        return result
 
-            dict_response = json.loads(response_content)
+    def _hedge_delay(self, breaker: CircuitBreaker):
+        if not settings.LLM_HEDGE_REQUESTS:
+            return None
+        return max(breaker.latency_p95() or settings.LLM_HEDGE_MIN_DELAY, settings.LLM_HEDGE_MIN_DELAY)
 
-        return {"word": word} | dict_response
+    def _call(self, method: str, *args):
+        # Если все предохранители разомкнуты, пробуем всех по порядку: это лучше, чем отказать сразу
+        candidates = [member for member in self.members if member[2].allow()] or self.members
+        pending = {}
+        errors = []
+        next_index = 0
 
-    def get_word_examples(self, word: str, count: int = 3) -> list[str]:
-        prompt = self.prompt_builder.get_word_examples(word, count)
-        response = self.giga.chat(prompt)
-        response_content = response.choices[0].message.content.strip()
+        def launch():
+            nonlocal next_index
+            model, timeout, breaker = candidates[next_index]
+            next_index += 1
+            future = provider_executor.submit(self._run, model, breaker, method, args)
+            pending[future] = (time.monotonic() + timeout, breaker)
+
+        launch()
+        while pending:
+            now = time.monotonic()
+            deadline = min(deadline for deadline, _ in pending.values())
+            wait_for = deadline - now
+            hedge_delay = self._hedge_delay(candidates[next_index - 1][2]) if next_index < len(candidates) else None
+            if hedge_delay is not None:
+                wait_for = min(wait_for, hedge_delay)
+
+            done, _ = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as exc:
+                    errors.append(exc)
 
+            # Провайдеры, не уложившиеся в таймаут, больше не ждем: запрос в потоке оборвет таймаут
+            # самого клиента, а еще не начатый отменяется
+            now = time.monotonic()
+            for future, (deadline, _) in list(pending.items()):
+                if now >= deadline:
+                    pending.pop(future)
+                    future.cancel()
+                    errors.append(TimeoutError(f"Provider did not answer in time for {method}"))
+
+            if next_index < len(candidates) and (not pending or (not done and hedge_delay is not None)):
+                launch()
+
+        raise errors[-1] if errors else RuntimeError("No linguistic providers configured")
+
+    async def _arun(self, model: BaseLinguisticModel, breaker: CircuitBreaker, method: str, args):
+        started = time.monotonic()
         try:
-            list_response = json.loads(response_content)
-        except json.JSONDecodeError:
-            content_fixed = re.sub(r"(\[|,\s*)'(.*?)'(?=,|\])", r'\1"\2"', response_content)
-            list_response = json.loads(content_fixed)
+            result = await getattr(model, method)(*args)
+        except Exception:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        breaker.record(True, time.monotonic() - started)
+        if isinstance(result, dict):
+            result = result | {"provider": model.provider}
+        return result
+
+    async def _acall(self, method: str, *args):
+        """Асинхронный вариант _call: запросы к провайдерам — задачи asyncio, проигравшие отменяются."""
+        candidates = [member for member in self.members if member[2].allow()] or self.members
+        pending = {}
+        errors = []
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            model, timeout, breaker = candidates[next_index]
+            next_index += 1
+            task = asyncio.ensure_future(self._arun(model, breaker, method, args))
+            pending[task] = (time.monotonic() + timeout, timeout, breaker)
+
+        launch()
+        try:
+            while pending:
+                now = time.monotonic()
+                wait_for = min(deadline for deadline, _, _ in pending.values()) - now
+                hedge_delay = self._hedge_delay(candidates[next_index - 1][2]) if next_index < len(candidates) else None
+                if hedge_delay is not None:
+                    wait_for = min(wait_for, hedge_delay)
+
+                done, _ = await asyncio.wait(pending, timeout=max(wait_for, 0), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.pop(task)
+                    try:
+                        return task.result()
+                    except Exception as exc:
+                        errors.append(exc)
+
+                # Запрос, не уложившийся в таймаут, отменяем и засчитываем предохранителю как ошибку
+                now = time.monotonic()
+                for task, (deadline, timeout, breaker) in list(pending.items()):
+                    if now >= deadline:
+                        pending.pop(task)
+                        task.cancel()
+                        breaker.record(False, timeout)
+                        errors.append(TimeoutError(f"Provider did not answer in time for {method}"))
 
-        return list_response
+                if next_index < len(candidates) and (not pending or (not done and hedge_delay is not None)):
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise errors[-1] if errors else RuntimeError("No linguistic providers configured")
+
+    def chat(self, prompt: str) -> str:
+        return self._call("chat", prompt)
+
+    def chat_parsed(self, prompt: str, schema: type[BaseModel], prompt_name: str) -> BaseModel:
+        return self._call("chat_parsed", prompt, schema, prompt_name)
+
+    async def achat_parsed(self, prompt: str, schema: type[BaseModel], prompt_name: str) -> BaseModel:
+        return await self._acall("achat_parsed", prompt, schema, prompt_name)
+
+    async def achat(self, prompt: str) -> str:
+        return await self._acall("achat", prompt)
+
+    async def _acomplete(self, prompt: str):
+        return await self._acall("_acomplete", prompt)
+
+    def _complete(self, prompt: str):
+        return self._call("_complete", prompt)
+
+    def get_word_definition(self, word: str) -> dict:
+        return self._call("get_word_definition", word)
+
+    def get_word_examples(self, word: str, count: int = 3) -> list:
+        return self._call("get_word_examples", word, count)
 
     def generate_quiz_options(self, word: str) -> dict:
-        prompt = Prompts.WORD_QUIZ.value.format(word=word)
-        response = self.giga.chat(prompt)
-        content = response.choices[0].message.content.strip()
+        return self._call("generate_quiz_options", word)
 
-        # ---- Simple parsing ----
-        question_match = re.search(r"Question:\s*(.*)", content)
-        options_match = re.findall(r"- (.*)", content)
-        correct_match = re.search(r"Correct Answer:\s*(.*)", content)
+    def get_word_card(self, word: str, count: int = 3) -> dict:
+        return self._call("get_word_card", word, count)
 
-        return {
-            "question": question_match.group(1).strip() if question_match else "",
-            "options": [opt.strip() for opt in options_match],
-            "correct_answer": correct_match.group(1).strip() if correct_match else "",
-        }
+    async def agenerate_quiz_options(self, word: str) -> dict:
+        return await self._acall("agenerate_quiz_options", word)
+
+    async def aget_word_examples(self, word: str, count: int = 3) -> list:
+        return await self._acall("aget_word_examples", word, count)
+
+    async def astream_chat(self, prompt: str):
+        """
+        Поток от первого провайдера, успевшего начать ответ за свой таймаут.
+
+        После первого фрагмента переключиться на другого провайдера уже нельзя.
+        """
+        candidates = [member for member in self.members if member[2].allow()] or self.members
+        errors = []
+        for model, timeout, breaker in candidates:
+            stream = model.astream_chat(prompt)
+            started = time.monotonic()
+            try:
+                first_chunk = await asyncio.wait_for(anext(stream), timeout)
+            except StopAsyncIteration:
+                breaker.record(True, time.monotonic() - started)
+                return
+            except Exception as exc:
+                breaker.record(False, time.monotonic() - started)
+                errors.append(exc)
+                await stream.aclose()
+                continue
+
+            # Для предохранителя важно время до первого фрагмента, а не длина всего ответа
+            breaker.record(True, time.monotonic() - started)
+            yield first_chunk
+            async for chunk in stream:
+                yield chunk
+            return
+
+        raise errors[-1] if errors else RuntimeError("No linguistic providers configured")
+
+    async def aget_word_card(self, word: str, count: int = 3) -> dict:
+        return await self._acall("aget_word_card", word, count)
+
+
+def _build_provider_model(provider: LinguisticAPIProvider) -> BaseLinguisticModel:
+    if provider.codename == "deepseek":
+        return DeepSeekLinguisticModel(api_key=provider.api_key, base_url=provider.base_url, timeout=provider.timeout)
+    elif provider.codename == "gigachat":
+        return GigaChatModel(credentials=provider.api_key, timeout=provider.timeout)
+    raise ValueError(f"Unknown provider: {provider.codename}")
 
 
 # Фабричный метод для получения нужной модели
-def get_linguistic_model(provider_name="gigachat") -> BaseLinguisticModel:
+def get_linguistic_model(provider_name=None) -> BaseLinguisticModel:
+    """
+    Модель для конкретного провайдера или, без provider_name, цепочка активных провайдеров
+    из LinguisticAPIProvider (по умолчанию GigaChat, если ни один не настроен).
+    """
+    if provider_name is None:
+        providers = list(LinguisticAPIProvider.objects.filter(is_active=True).order_by("priority", "created"))
+        if not providers:
+            return GigaChatModel()
+        return FailoverLinguisticModel(
+            [(_build_provider_model(provider), provider.timeout, provider.pk) for provider in providers]
+        )
+
     if provider_name.lower() == "deepseek":
         return DeepSeekLinguisticModel()
     elif provider_name.lower() == "gigachat":
         return GigaChatModel()
     # Можно добавить другие провайдеры в будущем
     raise ValueError(f"Unknown provider: {provider_name}")
+
+
+class BaseTTSBackend(abc.ABC):
+    """Абстрактный движок синтеза речи."""
+
+    # Идентификатор движка и голоса, входит в ключ кэша аудио
+    engine: str = ""
+    extension: str = "mp3"
+
+    @abc.abstractmethod
+    def synthesize(self, text: str, lang: str = "en") -> bytes:
+        """Синтезировать произношение текста."""
+        pass
+
+    def synthesize_many(self, texts: list[str], lang: str = "en") -> list[bytes]:
+        """Синтезировать произношение нескольких текстов (движки с пакетным режимом переопределяют)."""
+        return [self.synthesize(text, lang) for text in texts]
+
+
+class GTTSBackend(BaseTTSBackend):
+    """Синтез через gTTS (HTTP-запрос к Google на каждый текст)."""
+
+    engine = "gtts"
+
+    def synthesize(self, text: str, lang: str = "en") -> bytes:
+        audio_stream = BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(audio_stream)
+        return audio_stream.getvalue()
+
+
+class PiperTTSBackend(BaseTTSBackend):
+    """
+    Локальный синтез через piper, без обращений к сети.
+
+    Язык и голос задаются моделью PIPER_MODEL. Пакет текстов синтезируется одним запуском
+    процесса piper в режиме --json-input.
+    """
+
+    extension = "wav"
+
+    def __init__(self, binary=None, model=None):
+        self.binary = binary or settings.PIPER_BINARY
+        self.model = model or settings.PIPER_MODEL
+        self.engine = f"piper:{Path(self.model).stem}"
+
+    def synthesize(self, text: str, lang: str = "en") -> bytes:
+        return self.synthesize_many([text], lang)[0]
+
+    def synthesize_many(self, texts: list[str], lang: str = "en") -> list[bytes]:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_files = [os.path.join(tmp_dir, f"{i}.wav") for i in range(len(texts))]
+            lines = [
+                json.dumps({"text": text, "output_file": output_file}) for text, output_file in zip(texts, output_files)
+            ]
+            subprocess.run(
+                [self.binary, "--model", self.model, "--json-input"],
+                input="\n".join(lines) + "\n",
+                text=True,
+                capture_output=True,
+                check=True,
+                timeout=settings.PIPER_TIMEOUT,
+            )
+            return [Path(output_file).read_bytes() for output_file in output_files]
+
+
+@cache
+def get_tts_backend(backend_name=None) -> BaseTTSBackend:
+    backend_name = (backend_name or settings.TTS_BACKEND).lower()
+    if backend_name == "gtts":
+        return GTTSBackend()
+    elif backend_name == "piper":
+        return PiperTTSBackend()
+    raise ValueError(f"Unknown TTS backend: {backend_name}")
+
+
+def audio_digest(text: str, lang: str, engine: str) -> str:
+    """Ключ аудио в кэше: одинаковая речь дает одинаковый ключ."""
+    return hashlib.sha256(f"{engine}\0{lang}\0{text}".encode()).hexdigest()
+
+
+def get_or_create_audio_assets(texts: list[str], lang: str = "en") -> dict[str, AudioAsset]:
+    """
+    Найти готовое аудио для текстов или синтезировать и загрузить его один раз.
+
+    Недостающее аудио синтезируется одним пакетным вызовом движка. Возвращает словарь
+    нормализованный текст -> AudioAsset.
+    """
+    backend = get_tts_backend()
+    candidates = {}
+    for text in {normalize_word_text(text) for text in texts}:
+        digest = audio_digest(text, lang, backend.engine)
+        candidates[digest] = AudioAsset(digest=digest, text=text, lang=lang, engine=backend.engine)
+
+    assets = {asset.digest: asset for asset in AudioAsset.objects.filter(digest__in=candidates)}
+
+    to_synthesize = []
+    for digest, asset in candidates.items():
+        if digest in assets:
+            continue
+        name = AudioAsset.file.field.generate_filename(asset, f"{digest}.{backend.extension}")
+        if default_storage.exists(name):
+            # Файл остался от удаленной записи — используем его без повторного синтеза
+            asset.file.name = name
+            assets[digest] = _store_audio_asset(asset)
+        else:
+            to_synthesize.append(asset)
+
+    if to_synthesize:
+        audios = backend.synthesize_many([asset.text for asset in to_synthesize], lang)
+        for asset, audio in zip(to_synthesize, audios):
+            asset.file.save(f"{asset.digest}.{backend.extension}", ContentFile(audio), save=False)
+            assets[asset.digest] = _store_audio_asset(asset)
+
+    return {asset.text: asset for asset in assets.values()}
+
+
+def get_or_create_audio_asset(text: str, lang: str = "en") -> AudioAsset:
+    return get_or_create_audio_assets([text], lang)[normalize_word_text(text)]
+
+
+def _store_audio_asset(asset: AudioAsset) -> AudioAsset:
+    try:
+        with transaction.atomic():
+            asset.save()
+        return asset
+    except IntegrityError:
+        # Тот же текст параллельно синтезировал другой воркер: оставляем его файл
+        existing = AudioAsset.objects.get(digest=asset.digest)
+        if asset.file.name != existing.file.name:
+            asset.file.delete(save=False)
+        return existing
+
+
+def build_quiz_questions(word: Word, count: int = 1, linguistic_model=None) -> list[QuizQuestion]:
+    """Сгенерировать count вариантов вопроса квиза для слова, не сохраняя их."""
+    linguistic_model = linguistic_model or get_linguistic_model()
+    futures = [fetch_executor.submit(linguistic_model.generate_quiz_options, word.word) for _ in range(count)]
+    return _build_quiz_questions(word, [future.result() for future in futures], linguistic_model.provider)
+
+
+def generate_quiz_questions(word: Word, count: int = 1, linguistic_model=None) -> list[QuizQuestion]:
+    """Сгенерировать и сохранить count вариантов вопроса квиза для слова."""
+    return QuizQuestion.objects.bulk_create(build_quiz_questions(word, count, linguistic_model))
+
+
+async def agenerate_quiz_questions(word: Word, count: int = 1, linguistic_model=None) -> list[QuizQuestion]:
+    """Асинхронный вариант generate_quiz_questions."""
+    if linguistic_model is None:
+        linguistic_model = await sync_to_async(get_linguistic_model)()
+    results = await asyncio.gather(*(linguistic_model.agenerate_quiz_options(word.word) for _ in range(count)))
+    questions = _build_quiz_questions(word, results, linguistic_model.provider)
+    return await QuizQuestion.objects.abulk_create(questions)
+
+
+def _build_quiz_questions(word: Word, results: list[dict], provider: str) -> list[QuizQuestion]:
+    questions = []
+    for quiz_data in results:
+        # Неполные ответы модели не сохраняем
+        if not quiz_data.get("question") or not quiz_data.get("options"):
+            continue
+        questions.append(
+            QuizQuestion(
+                word=word,
+                question=quiz_data["question"],
+                options=quiz_data["options"],
+                correct_answer=quiz_data.get("correct_answer", ""),
+                provider=quiz_data.get("provider", provider),
+            )
+        )
+    return questions
+
+
+def ensure_word_audio(word: Word) -> None:
+    """Привязать к слову произношение из общего кэша аудио, если его еще нет (локальное хранилище или S3)."""
+    if word.audio_file:
+        return
+    word.audio_file.name = get_or_create_audio_asset(word.word).file.name
+    word.audio_status = Word.AudioStatus.READY
+    word.save(update_fields=["audio_file", "audio_status", "updated"])
+
+
+def suggest_words(text: str, limit: int) -> list[str]:
+    """
+    Подсказки для автодополнения: сначала слова, начинающиеся с введенного текста,
+    затем похожие по триграммам (pg_trgm) — они находят слова и с опечатками.
+    """
+    key = normalize_word_text(text)
+    if not key:
+        return []
+
+    suggestions = list(
+        Word.objects.filter(word__startswith=key)
+        .order_by(Length("word"), "word")
+        .values_list("word", flat=True)[:limit]
+    )
+    if len(suggestions) < limit and connection.vendor == "postgresql":
+        similar = (
+            Word.objects.annotate(similarity=TrigramSimilarity("word", key))
+            .filter(word__trigram_similar=key)
+            .exclude(word__startswith=key)
+            .order_by("-similarity", "word")
+            .values_list("word", flat=True)
+        )
+        suggestions += similar[: limit - len(suggestions)]
+    return suggestions
+
+
+def _similar_words(key: str):
+    """Существующие слова, похожие на key не меньше порога WORD_SIMILARITY_THRESHOLD, от самого похожего."""
+    return (
+        Word.objects.annotate(similarity=TrigramSimilarity("word", key))
+        .filter(word__trigram_similar=key, similarity__gte=settings.WORD_SIMILARITY_THRESHOLD)
+        .order_by("-similarity", "word")
+    )
+
+
+def find_similar_word(key: str) -> Word | None:
+    """«Возможно, вы имели в виду»: готовая карточка достаточно похожего слова вместо генерации новой."""
+    if connection.vendor != "postgresql":
+        return None
+    return _similar_words(key).first()
+
+
+async def afind_similar_word(key: str) -> Word | None:
+    if connection.vendor != "postgresql":
+        return None
+    return await _similar_words(key).afirst()
+
+
+def get_or_create_word(word_text: str, linguistic_model=None, fuzzy: bool = False) -> Word:
+    """
+    Найти слово или сгенерировать для него карточку.
+
+    С fuzzy=True перед обращением к LLM ищется похожее существующее слово (опечатка, другая форма),
+    и если оно найдено, возвращается его карточка.
+
+    Одновременные запросы одного и того же нового слова выполняют генерацию один раз:
+    внутри процесса их схлопывает SingleFlight, между воркерами — advisory lock в Postgres.
+    """
+    text = normalize_word_text(word_text)
+    key = word_lookup_key(text)
+    word = Word.objects.filter(lookup_key=key).first()
+    if word is None and fuzzy:
+        word = find_similar_word(text)
+    if word is not None:
+        return word
+    return word_flight.do(key, lambda: _create_word(text, linguistic_model or get_linguistic_model()))
+
+
+async def aget_or_create_word(word_text: str, linguistic_model=None, fuzzy: bool = False) -> Word:
+    """Асинхронный вариант get_or_create_word: ожидание LLM не занимает поток воркера."""
+    text = normalize_word_text(word_text)
+    key = word_lookup_key(text)
+    word = await Word.objects.filter(lookup_key=key).afirst()
+    if word is None and fuzzy:
+        word = await afind_similar_word(text)
+    if word is not None:
+        return word
+    if linguistic_model is None:
+        linguistic_model = await sync_to_async(get_linguistic_model)()
+    return await async_word_flight.do(key, lambda: _acreate_word(text, linguistic_model))
+
+
+def _lock_word_key(key: str, function: str = "pg_advisory_xact_lock") -> None:
+    """Advisory lock на ключ слова (по умолчанию до конца текущей транзакции)."""
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {function}(hashtext(%s))", [f"words.word:{key}"])
+
+
+def word_fields_from_card(text: str, word_data: dict) -> dict:
+    """Поля новой записи Word из карточки, сгенерированной LLM."""
+    key = word_lookup_key(text)
+    # name и codename короче самого слова: длинные фразы обрезаются с хэшем, чтобы не было совпадений
+    max_length = Word._meta.get_field("name").max_length
+    return {
+        "word": text,
+        "lookup_key": key,
+        "name": fit_length(text, max_length),
+        "codename": fit_length(key.replace(" ", "_"), max_length),
+        "part_of_speech": word_data.get("part_of_speech", "") or "",
+        "definition": (word_data.get("definition") or "").capitalize(),
+        "examples": word_data.get("examples") or [],
+    }
+
+
+@transaction.atomic
+def _create_word(text: str, linguistic_model: BaseLinguisticModel) -> Word:
+    key = word_lookup_key(text)
+    _lock_word_key(key)
+    # Пока ждали блокировку, слово мог создать другой воркер
+    word = Word.objects.filter(lookup_key=key).first()
+    if word is not None:
+        return word
+
+    return _save_new_word(text, linguistic_model.get_word_card(text), linguistic_model.provider)
+
+
+async def _acreate_word(text: str, linguistic_model: BaseLinguisticModel) -> Word:
+    # Транзакцию нельзя держать открытой через await, поэтому блокировка сессионная.
+    # Все sync_to_async одного запроса выполняются в одном потоке, то есть на одном соединении.
+    key = word_lookup_key(text)
+    await sync_to_async(_lock_word_key)(key, "pg_advisory_lock")
+    try:
+        word = await Word.objects.filter(lookup_key=key).afirst()
+        if word is not None:
+            return word
+        word_data = await linguistic_model.aget_word_card(text)
+        return await sync_to_async(_save_new_word)(text, word_data, linguistic_model.provider)
+    finally:
+        await sync_to_async(_lock_word_key)(key, "pg_advisory_unlock")
+
+
+async def astream_word(word_text: str, linguistic_model=None, fuzzy: bool = False):
+    """
+    Найти слово или сгенерировать карточку, отдавая ее части по мере готовности.
+
+    Асинхронный генератор событий (имя, данные): "definition" с очередным фрагментом определения,
+    "examples" со списком примеров и последним — "word" с сохраненным Word.
+    fuzzy — как в get_or_create_word.
+    """
+    text = normalize_word_text(word_text)
+    key = word_lookup_key(text)
+    word = await Word.objects.filter(lookup_key=key).afirst()
+    if word is None and fuzzy:
+        word = await afind_similar_word(text)
+    if word is None:
+        if linguistic_model is None:
+            linguistic_model = await sync_to_async(get_linguistic_model)()
+        # Генерация идет в отдельной задаче: блокировка ключа снимается сразу после сохранения слова,
+        # а не когда медленный клиент дочитает поток
+        events = asyncio.Queue()
+        task = asyncio.create_task(_alocked_new_word(text, key, linguistic_model, events))
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            word, created = await task
+        finally:
+            task.cancel()
+        if created:
+            yield "word", word
+            return
+
+    yield "definition", word.definition
+    yield "examples", word.examples
+    yield "word", word
+
+
+async def _alocked_new_word(text: str, key: str, linguistic_model: BaseLinguisticModel, events: asyncio.Queue):
+    """Сгенерировать и сохранить слово под advisory lock ключа; части карточки идут в events, в конце None."""
+    try:
+        # Параллельный запрос того же слова дождется блокировки и получит уже сохраненное слово
+        await sync_to_async(_lock_word_key)(key, "pg_advisory_lock")
+        try:
+            word = await Word.objects.filter(lookup_key=key).afirst()
+            if word is not None:
+                return word, False
+            return await _astream_new_word(text, linguistic_model, events.put_nowait), True
+        finally:
+            await sync_to_async(_lock_word_key)(key, "pg_advisory_unlock")
+    finally:
+        events.put_nowait(None)
+
+
+async def _astream_new_word(text: str, linguistic_model: BaseLinguisticModel, emit) -> Word:
+    """
+    Карточка одним структурированным запросом WORD_CARD, полученным потоком.
+
+    Определение отдается в emit по мере прихода, примеры — как только закрылся их массив;
+    часть речи и квиз берутся из разобранного ответа целиком.
+    """
+    prompt = PromptBuilder().get_word_card(text, 3)
+    fields = PartialJSONFields()
+    async for chunk in linguistic_model.astream_chat(prompt):
+        for event in fields.feed(chunk):
+            emit(event)
+
+    record = sync_to_async(record_parse_outcome)
+    try:
+        card, repaired = parse_llm_output(fields.content, LLMWordCard)
+        await record(linguistic_model.provider, Prompts.WORD_CARD.name, "repaired" if repaired else "ok")
+    except LLMParseError as exc:
+        await record(linguistic_model.provider, Prompts.WORD_CARD.name, "retry")
+        try:
+            card, _ = parse_llm_output(await linguistic_model.achat(corrective_prompt(prompt, exc)), LLMWordCard)
+        except LLMParseError:
+            await record(linguistic_model.provider, Prompts.WORD_CARD.name, "failed")
+            raise
+
+    word_data = _word_card(text, card)
+    # Ответ не удалось показать по частям (например, его пришлось запросить повторно)
+    if not fields.emitted["definition"]:
+        emit(("definition", word_data["definition"]))
+    if not fields.emitted["examples"]:
+        emit(("examples", word_data["examples"]))
+    return await sync_to_async(_save_new_word)(text, word_data, linguistic_model.provider)
+
+
+@transaction.atomic
+def _save_new_word(text: str, word_data: dict, provider: str) -> Word:
+    fields = word_fields_from_card(text, word_data)
+    word, created = Word.objects.get_or_create(lookup_key=fields.pop("lookup_key"), defaults=fields)
+    if created and word_data.get("quiz"):
+        QuizQuestion.objects.create(word=word, provider=word_data.get("provider") or provider, **word_data["quiz"])
+    return word
@@ -0,0 +1,31 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.words.cards import word_cards
+from apps.words.models import UserWord, Word
+
+
+@receiver([post_save, post_delete], sender=Word)
+def invalidate_word_card(sender, instance: Word, **kwargs):
+    """Сбросить кэшированную карточку измененного слова (и еще раз после коммита, чтобы не закэшировать старую)."""
+    key = instance.lookup_key
+    word_cards.delete(key)
+    transaction.on_commit(lambda: word_cards.delete(key))
+
+
+# Поля слова, которые передаются в синхронизации коллекции (views.sync_words)
+SYNCED_WORD_FIELDS = frozenset({"word", "definition", "examples", "audio_file"})
+
+
+@receiver(post_save, sender=Word)
+def touch_user_words(sender, instance: Word, created: bool, update_fields=None, **kwargs):
+    """
+    Изменение карточки должно попасть в синхронизацию коллекций, где слово сохранено (по UserWord.updated).
+
+    Сохранение только несинхронизируемых полей (audio_status, updated и т. п.) коллекции не трогает.
+    """
+    if created or (update_fields is not None and SYNCED_WORD_FIELDS.isdisjoint(update_fields)):
+        return
+    UserWord.objects.filter(word=instance).update(updated=timezone.now())
@@ -1 +1,374 @@
-# Create your tests here.
+import io
+from datetime import UTC, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.words.models import Job, UserWord, Word
+from apps.words.normalization import word_lookup_key
+from apps.words.parsing import LLMParseError, PartialJSONFields, parse_llm_output, repair_json
+from apps.words.scheduler import GRADE_CORRECT, GRADE_WRONG, MIN_EASE, RELEARN_DELAY, apply_review, review_update
+from apps.words.schemas import LLMWordDefinition
+from apps.words.views import _parse_sync_cursor, _sync_cursor
+from apps.words.word_lists import detect_format, import_word_list, iter_word_list
+
+
+def create_word(text: str) -> Word:
+    return Word.objects.create(word=text, name=text, codename=text)
+
+
+class WordLookupKeyTests(SimpleTestCase):
+    def test_case_and_whitespace(self):
+        self.assertEqual(word_lookup_key("  Apple  Pie "), "apple pie")
+        self.assertEqual(word_lookup_key("STRASSE"), word_lookup_key("straße"))
+
+    def test_edge_punctuation_is_dropped(self):
+        self.assertEqual(word_lookup_key("apple."), "apple")
+        self.assertEqual(word_lookup_key("Hello, world!"), "hello world")
+        self.assertEqual(word_lookup_key("..."), "")
+
+    def test_joiners_inside_word(self):
+        self.assertEqual(word_lookup_key("don’t"), "don't")
+        self.assertEqual(word_lookup_key("mother‑in‑law"), "mother-in-law")
+        self.assertEqual(word_lookup_key("-well-"), "well")
+
+    def test_abbreviations_stay_distinct(self):
+        self.assertEqual(word_lookup_key("U.S."), "u.s")
+        self.assertNotEqual(word_lookup_key("U.S."), word_lookup_key("us"))
+        self.assertNotEqual(word_lookup_key("a.m."), word_lookup_key("am"))
+        self.assertNotEqual(word_lookup_key("A.I."), word_lookup_key("ai"))
+
+    def test_symbols_stay_distinct(self):
+        self.assertEqual(word_lookup_key("C++"), "c++")
+        self.assertEqual(word_lookup_key("C#"), "c#")
+        self.assertEqual(len({word_lookup_key("C++"), word_lookup_key("C#"), word_lookup_key("C")}), 3)
+
+
+class ParseLLMOutputTests(SimpleTestCase):
+    # (ответ модели, ожидаемое определение, понадобился ли ремонт JSON)
+    PARSED = [
+        ('{"definition": "a fruit"}', "a fruit", False),
+        ('```json\n{"definition": "a fruit"}\n```', "a fruit", False),
+        ('Sure! Here it is: {"definition": "a fruit"} Hope it helps.', "a fruit", False),
+        ('{"definition": "a {braced} fruit"}', "a {braced} fruit", False),
+        ('{"definition": "it\'s a fruit"}', "it's a fruit", False),
+        ('{"definition": "line\\nbreak"}', "line\nbreak", False),
+        ('{"definition": "a fruit",}', "a fruit", True),
+        ("{'definition': 'a fruit'}", "a fruit", True),
+        ("{'definition': 'it\\'s a fruit'}", "it's a fruit", True),
+        ("{“definition”: “a fruit”}", "a fruit", True),
+    ]
+    # Ответы, которые не чинятся и уходят на повторный запрос с исправлением
+    FAILED = [
+        "no json here",
+        '{"definition": ""}',
+        '{"definition": "a fruit"',
+        # Апостроф внутри строки в одинарных кавычках неотличим от ее конца
+        "{'definition': 'it's a fruit'}",
+    ]
+
+    def test_parsed(self):
+        for content, definition, repaired in self.PARSED:
+            with self.subTest(content=content):
+                result, was_repaired = parse_llm_output(content, LLMWordDefinition)
+                self.assertEqual(result.definition, definition)
+                self.assertEqual(was_repaired, repaired)
+
+    def test_failed(self):
+        for content in self.FAILED:
+            with self.subTest(content=content):
+                with self.assertRaises(LLMParseError):
+                    parse_llm_output(content, LLMWordDefinition)
+
+    def test_repair_json(self):
+        self.assertEqual(repair_json('{"examples": ["a", "b",],}'), {"examples": ["a", "b"]})
+        self.assertEqual(repair_json("{'examples': ['a']}"), {"examples": ["a"]})
+
+
+class PartialJSONFieldsTests(SimpleTestCase):
+    CONTENT = (
+        '```json\n{"definition": "a \\"quoted\\" caf\\u00e9\\nline", '
+        '"examples": ["one, two", "three]"], "quiz": {}}\n```'
+    )
+
+    def feed_in_chunks(self, size: int) -> list:
+        fields = PartialJSONFields()
+        events = []
+        for start in range(0, len(self.CONTENT), size):
+            events += fields.feed(self.CONTENT[start : start + size])
+        return events
+
+    def test_chunked_feed(self):
+        for size in (1, 2, 3, 5, 7, len(self.CONTENT)):
+            with self.subTest(size=size):
+                events = self.feed_in_chunks(size)
+                definition = "".join(value for field, value in events if field == "definition")
+                self.assertEqual(definition, 'a "quoted" café\nline')
+                self.assertEqual([value for field, value in events if field == "examples"], [["one, two", "three]"]])
+
+    def test_escape_split_across_chunks(self):
+        fields = PartialJSONFields()
+        self.assertEqual(fields.feed('{"definition": "abc\\'), [("definition", "abc")])
+        self.assertEqual(fields.feed("u00"), [])
+        self.assertEqual(fields.feed('e9d"'), [("definition", "éd")])
+
+    def test_examples_wait_for_closed_array(self):
+        fields = PartialJSONFields()
+        self.assertEqual(fields.feed('{"examples": ["one", "tw'), [])
+        self.assertEqual(fields.feed('o"]'), [("examples", ["one", "two"])])
+        self.assertEqual(fields.feed(', "definition": ""}'), [])
+
+
+class SchedulerTests(TestCase):
+    """apply_review (пакетные ответы) и review_update (один ответ одним UPDATE) должны считать одинаково."""
+
+    NOW = datetime(2026, 1, 1, 12, tzinfo=UTC)
+
+    def setUp(self):
+        user = get_user_model().objects.create_user("learner", "learner@example.com", "password")
+        self.user_word = UserWord.objects.create(user=user, word=create_word("apple"))
+
+    def review_both(self, grades: list[int], ease: float = 2.5, interval: int = 0, repetitions: int = 0) -> list[tuple]:
+        """Прогнать ответы через оба пути и вернуть расписание после каждого ответа из обоих."""
+        UserWord.objects.filter(pk=self.user_word.pk).update(ease=ease, interval=interval, repetitions=repetitions)
+        in_memory = UserWord.objects.get(pk=self.user_word.pk)
+        steps = []
+        for day, grade in enumerate(grades):
+            now = self.NOW + timedelta(days=day)
+            apply_review(in_memory, grade, now)
+            UserWord.objects.filter(pk=self.user_word.pk).update(**review_update(grade, now))
+            in_db = UserWord.objects.get(pk=self.user_word.pk)
+            steps.append((in_memory.interval, in_memory.repetitions, in_memory.ease, in_memory.due_at, in_db))
+        return steps
+
+    def assert_paths_agree(self, grades: list[int], **schedule) -> list[tuple]:
+        steps = self.review_both(grades, **schedule)
+        for number, (interval, repetitions, ease, due_at, in_db) in enumerate(steps):
+            with self.subTest(answer=number):
+                self.assertEqual(in_db.interval, interval)
+                self.assertEqual(in_db.repetitions, repetitions)
+                self.assertAlmostEqual(in_db.ease, ease)
+                self.assertEqual(in_db.due_at, due_at)
+        return steps
+
+    def test_correct_answers_grow_interval(self):
+        steps = self.assert_paths_agree([GRADE_CORRECT] * 6)
+        self.assertEqual([step[0] for step in steps[:3]], [1, 6, 15])
+        self.assertEqual(steps[0][3], self.NOW + timedelta(days=1))
+
+    def test_wrong_answer_resets_series(self):
+        steps = self.assert_paths_agree([GRADE_CORRECT, GRADE_CORRECT, GRADE_CORRECT, GRADE_WRONG, GRADE_CORRECT])
+        interval, repetitions, _, due_at, _ = steps[3]
+        self.assertEqual((interval, repetitions), (1, 0))
+        self.assertEqual(due_at, self.NOW + timedelta(days=3) + RELEARN_DELAY)
+        self.assertEqual(steps[4][:2], (1, 1))
+
+    def test_ease_floor(self):
+        steps = self.assert_paths_agree([GRADE_WRONG] * 5 + [GRADE_CORRECT] * 4)
+        self.assertEqual(steps[4][2], MIN_EASE)
+
+    def test_half_day_intervals_round_alike(self):
+        # 5 * 2.5 = 12.5: Python и SQL должны одинаково округлять половины вверх
+        for interval in (5, 7, 15):
+            with self.subTest(interval=interval):
+                steps = self.assert_paths_agree([GRADE_CORRECT], interval=interval, repetitions=2)
+                self.assertEqual(steps[0][0], int(interval * 2.5 + 0.5))
+
+
+@override_settings(SYNC_PAGE_SIZE=2, SYNC_CURSOR_LAG=10, SYNC_TOMBSTONE_DAYS=30)
+class SyncWordsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("learner", "learner@example.com", "password")
+        self.client.force_login(self.user)
+        hour_ago = timezone.now() - timedelta(hours=1)
+        self.user_words = []
+        for number, text in enumerate(["apple", "banana", "cherry", "date", "elder"]):
+            user_word = UserWord.objects.create(user=self.user, word=create_word(text))
+            # Два слова с одинаковым updated: порядок внутри него задает id
+            UserWord.objects.filter(pk=user_word.pk).update(updated=hour_ago + timedelta(seconds=number // 2))
+            self.user_words.append(user_word)
+
+    def sync(self, cursor=None):
+        response = self.client.get(reverse("words:sync_words"), {"cursor": cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def sync_all(self, cursor=None) -> tuple[list[int], dict]:
+        """Пройти все страницы; возвращает id слов в порядке получения и последний ответ."""
+        received = []
+        while True:
+            data = self.sync(cursor)
+            received += [word["user_word_id"] for word in data["words"]]
+            cursor = data["cursor"]
+            if not data["has_more"]:
+                return received, data
+
+    def test_cursor_round_trip(self):
+        updated = datetime(2026, 3, 1, 8, 30, 15, 123456, tzinfo=UTC)
+        self.assertEqual(_parse_sync_cursor(_sync_cursor(updated, 42)), (updated, 42))
+
+    def test_pages_deliver_every_word_once(self):
+        first = self.sync()
+        self.assertTrue(first["reset"])
+        self.assertTrue(first["has_more"])
+        received, last = self.sync_all()
+        self.assertEqual(received, [user_word.pk for user_word in self.user_words])
+        self.assertFalse(last["has_more"])
+
+        received, _ = self.sync_all(last["cursor"])
+        self.assertEqual(received, [])
+
+    def test_recent_changes_are_repeated_not_lost(self):
+        _, last = self.sync_all()
+        recent = self.user_words[0]
+        UserWord.objects.filter(pk=recent.pk).update(updated=timezone.now())
+        # Строка внутри SYNC_CURSOR_LAG приходит, но курсор за нее не заходит
+        data = self.sync(last["cursor"])
+        self.assertEqual([word["user_word_id"] for word in data["words"]], [recent.pk])
+        cursor_time, _ = _parse_sync_cursor(data["cursor"])
+        self.assertLessEqual(cursor_time, timezone.now() - timedelta(seconds=10))
+        self.assertEqual([word["user_word_id"] for word in self.sync(data["cursor"])["words"]], [recent.pk])
+
+    def test_removed_word_is_delivered_as_deleted(self):
+        _, last = self.sync_all()
+        removed = self.user_words[1]
+        response = self.client.post(reverse("words:remove_word"), {"word_id": removed.word.uuid})
+        self.assertEqual(response.status_code, 200)
+        data = self.sync(last["cursor"])
+        self.assertEqual(data["deleted"], [removed.pk])
+        self.assertFalse(data["reset"])
+
+    def test_expired_cursor_resets(self):
+        expired = _sync_cursor(timezone.now() - timedelta(days=31), 1)
+        self.assertTrue(self.sync(expired)["reset"])
+
+    def test_invalid_cursor(self):
+        for cursor in ["abc", "1", "1-2-3", "-5-1", "9" * 30 + "-1", "1-" + "9" * 30, "1--1"]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse("words:sync_words"), {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+
+
+class MyWordsPageTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user("learner", "learner@example.com", "password")
+        self.client.force_login(user)
+        UserWord.objects.create(user=user, word=create_word("apple"))
+
+    def test_cursor(self):
+        response = self.client.get(reverse("words:my_words_page"), {"cursor": "0-0"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_invalid_cursor(self):
+        for cursor in ["abc", "1", "-1-5", "99999999999999999999-1", "1-99999999999999999999"]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse("words:my_words_page"), {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+
+
+class WordListParserTests(SimpleTestCase):
+    def parse(self, content: str, file_format: str) -> list[str]:
+        return list(iter_word_list(io.StringIO(content, newline=""), file_format))
+
+    def test_detect_format(self):
+        for filename, file_format in [
+            ("words.csv", "csv"),
+            ("words.TSV", "tsv"),
+            ("words.tab", "tsv"),
+            ("deck.txt", "anki"),
+            ("words", "csv"),
+        ]:
+            with self.subTest(filename=filename):
+                self.assertEqual(detect_format(filename), file_format)
+
+    def test_csv(self):
+        self.assertEqual(
+            self.parse('Word,definition\napple,a fruit\n"ice, cream",x\n\nbanana\n', "csv"),
+            [
+                "apple",
+                "ice, cream",
+                "banana",
+            ],
+        )
+        # Заголовок пропускается только в первой строке
+        self.assertEqual(self.parse("apple\nword\n", "csv"), ["apple", "word"])
+
+    def test_tsv(self):
+        self.assertEqual(self.parse("term\tmeaning\nice, cream\tx\nbanana\n", "tsv"), ["ice, cream", "banana"])
+
+    def test_anki_default_tab_separator(self):
+        self.assertEqual(self.parse("apple\ta fruit\nbanana\tanother\n", "anki"), ["apple", "banana"])
+
+    def test_anki_headers(self):
+        content = (
+            "#separator:pipe\n"
+            "#html:true\n"
+            "#guid column:1\n"
+            "#notetype column:2\n"
+            "abc|Basic|<b>apple</b> [sound:apple.mp3]|a fruit\n"
+            "def|Basic|ice &amp; cream|dessert\n"
+        )
+        self.assertEqual([text.strip() for text in self.parse(content, "anki")], ["apple", "ice & cream"])
+
+    def test_anki_only_headers(self):
+        self.assertEqual(self.parse("#separator:tab\n#html:false\n", "anki"), [])
+
+
+@override_settings(WORD_LIST_BATCH_SIZE=2)
+class ImportWordListTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("learner", "learner@example.com", "password")
+        self.apple, self.banana = create_word("apple"), create_word("banana")
+        UserWord.objects.create(user=self.user, word=self.banana)
+
+    def queued_words(self) -> list[str]:
+        return sorted(Job.objects.filter(kind="import_word").values_list("payload__word", flat=True))
+
+    def test_counts(self):
+        stats = import_word_list(self.user, ["Apple", "banana", "apple.", "cherry", "x" * 300, "", "date"])
+        self.assertEqual(stats, {"added": 1, "existing": 1, "queued": 2, "skipped": 1})
+        self.assertTrue(UserWord.objects.filter(user=self.user, word=self.apple).exists())
+        self.assertEqual(self.queued_words(), ["cherry", "date"])
+
+    def test_queue_cap_counts_pending_jobs(self):
+        import_word_list(self.user, ["cherry", "date"], max_new_words=3)
+        stats = import_word_list(self.user, ["elder", "fig", "grape"], max_new_words=3)
+        self.assertEqual((stats["queued"], stats["skipped"]), (1, 2))
+        self.assertEqual(self.queued_words(), ["cherry", "date", "elder"])
+
+        # Выполненные задачи место в очереди не занимают
+        Job.objects.update(status=Job.Status.DONE)
+        stats = import_word_list(self.user, ["fig", "grape"], max_new_words=3)
+        self.assertEqual(stats["queued"], 2)
+
+    def test_cap_is_per_user(self):
+        other = get_user_model().objects.create_user("other", "other@example.com", "password")
+        import_word_list(other, ["cherry", "date"], max_new_words=2)
+        self.assertEqual(import_word_list(self.user, ["elder"], max_new_words=2)["queued"], 1)
+
+    def test_import_view_reports_partial_counts(self):
+        self.client.force_login(self.user)
+        content = b"apple\nbanana\n" + b"".join(b"w%d\n" % number for number in range(3000)) + b"\xff\xfe\n"
+        # Ошибка декодирования приходит на втором буфере чтения, после нескольких сохраненных пачек
+        with self.settings(WORD_LIST_BATCH_SIZE=500):
+            response = self.client.post(
+                reverse("words:import_words"), {"file": SimpleUploadedFile("words.csv", content)}, follow=True
+            )
+        message = str(next(iter(response.context["messages"])))
+        self.assertIn("Не удалось прочитать файл", message)
+        self.assertIn("До ошибки импортировано: добавлено слов: 1, уже были в коллекции: 1", message)
+
+    def test_import_view_reports_counts(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse("words:import_words"), {"file": SimpleUploadedFile("words.csv", b"apple\ncherry\n")}, follow=True
+        )
+        self.assertEqual(
+            str(next(iter(response.context["messages"]))),
+            "Импорт завершен: добавлено слов: 1, уже были в коллекции: 0, "
+            "новых в очереди на генерацию: 1, пропущено: 0.",
+        )
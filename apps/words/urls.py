@@ -7,9 +7,20 @@ app_name = "words"
 urlpatterns = [
     path("", views.home, name="home"),
     path("lookup/", views.word_lookup, name="word_lookup"),
+    path("lookup/stream/", views.word_lookup_stream, name="word_lookup_stream"),
+    path("autocomplete/", views.word_autocomplete, name="word_autocomplete"),
+    path("card/<str:key>/", views.word_card_detail, name="word_card"),
+    path("<uuid:word_id>/audio/", views.word_audio, name="word_audio"),
+    path("<uuid:word_id>/saved/", views.word_saved_status, name="word_saved_status"),
     path("save/", views.save_word, name="save_word"),
     path("my-words/", views.my_words, name="my_words"),
+    path("my-words/page/", views.my_words_page, name="my_words_page"),
+    path("my-words/import/", views.import_words, name="import_words"),
+    path("my-words/export/", views.export_words, name="export_words"),
+    path("sync/", views.sync_words, name="sync_words"),
     path("quiz/", views.quiz, name="quiz"),
     path("quiz/submit/", views.submit_quiz_answer, name="submit_quiz_answer"),
+    path("quiz/session/", views.quiz_session, name="quiz_session"),
+    path("quiz/answers/", views.submit_quiz_answers, name="submit_quiz_answers"),
     path("remove/", views.remove_word, name="remove_word"),
 ]
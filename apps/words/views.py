@@ -1,16 +1,57 @@
-from io import BytesIO
-
+import csv
+import hashlib
+import io
+import json
+import logging
+import math
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.files.base import ContentFile
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404, render
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import JSONObject
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.templatetags.static import static
+from django.urls import reverse
 from django.utils import timezone
-from django.views.decorators.http import require_POST
-from gtts import gTTS
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
 
+from .cards import card_etag, card_last_modified, is_card_final, word_card, word_cards
 from .forms import WordForm
-from .models import UserWord, Word
-from .services import get_linguistic_model
+from .jobs import request_quiz_questions, request_word_audio
+from .models import QuizQuestion, UserWord, UserWordTombstone, Word
+from .scheduler import GRADE_CORRECT, GRADE_WRONG, apply_review, review_update
+from .services import (
+    RateLimitExceeded,
+    aget_or_create_word,
+    astream_word,
+    normalize_word_text,
+    suggest_words,
+    word_lookup_key,
+)
+from .word_lists import (
+    EXPORT_FORMATS,
+    IMPORT_FORMATS,
+    detect_format,
+    import_word_list,
+    iter_collection_rows,
+    iter_word_list,
+    stream_word_list,
+)
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
 
 
 def home(request):
@@ -19,105 +60,613 @@ def home(request):
     return render(request, "words/home.html", {"form": form})
 
 
-def word_lookup(request):
-    """API-представление для поиска определения слова и (при необходимости) генерации аудио."""
+# Оболочка приложения, которую service worker кэширует при установке
+SERVICE_WORKER_PRECACHE = [
+    "core/css/base.css",
+    "core/images/logo96.png",
+    "core/images/logo512.png",
+    "pwa/manifest.json",
+    "words/css/home.css",
+    "words/css/my_words.css",
+    "words/css/quiz.css",
+    "words/js/home.js",
+    "words/js/my_words.js",
+    "words/js/offline.js",
+    "words/js/quiz.js",
+]
+# Bootstrap подключается с CDN в core/base.html
+SERVICE_WORKER_PRECACHE_EXTERNAL = [
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css",
+    "https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js",
+]
+
+
+@require_GET
+def service_worker(request):
+    """
+    Service worker PWA: отдается из корня сайта, чтобы управлять всеми страницами.
+
+    Список файлов оболочки содержит хэшированные имена статики, поэтому после деплоя меняется
+    версия кэша и браузер ставит новый service worker.
+    """
+    precache_urls = [static(path) for path in SERVICE_WORKER_PRECACHE] + SERVICE_WORKER_PRECACHE_EXTERNAL
+    context = {
+        "version": hashlib.sha256("\n".join(precache_urls).encode()).hexdigest()[:12],
+        "precache_urls": json.dumps(precache_urls),
+        "static_url": json.dumps(request.build_absolute_uri(settings.STATIC_URL)),
+        "audio_url": json.dumps(request.build_absolute_uri(f"{settings.MEDIA_URL}tts_audio/")),
+        "offline_url": json.dumps(reverse("words:home")),
+    }
+    response = HttpResponse(render_to_string("words/sw.js", context), content_type="application/javascript")
+    # Браузер и так перепроверяет service worker, но промежуточные кэши не должны держать старую версию
+    patch_cache_control(response, no_cache=True)
+    return response
+
 
-    def _get_audio_from_text(word: Word) -> ContentFile:
-        tts = gTTS(text=word.word, lang="en")
-        audio_stream = BytesIO()
-        tts.write_to_fp(audio_stream)
-        audio_stream.seek(0)
-        return ContentFile(audio_stream.read(), name=f"{word.codename}.mp3")
+# Асинхронные представления, которые ждут LLM, выполняются вне ATOMIC_REQUESTS:
+# транзакцию нельзя держать открытой через await.
+@transaction.non_atomic_requests
+async def word_lookup(request):
+    """API-представление для поиска определения слова и (при необходимости) генерации аудио."""
 
     if request.method != "POST":
         return JsonResponse({"error": "Method not allowed"}, status=405)
 
     word_text = (request.POST.get("word") or "").strip()
-    if not word_text:
+    if not word_lookup_key(word_text):
+        return JsonResponse({"error": "Word is required"}, status=400)
+
+    # exact=1 — пользователь отказался от похожего слова и просит карточку именно для введенного
+    fuzzy = not request.POST.get("exact")
+    # Популярные слова отдаются из кэша карточек без запросов к Word
+    card = await word_cards.aget(word_lookup_key(word_text))
+    if card is None:
+        try:
+            word = await aget_or_create_word(word_text, fuzzy=fuzzy)
+        except RateLimitExceeded as exc:
+            return JsonResponse(
+                {"error": "Сервис перегружен, попробуйте через несколько секунд."},
+                status=429,
+                headers={"Retry-After": str(math.ceil(exc.retry_after))},
+            )
+        card = await _word_lookup_card(word)
+
+    return JsonResponse(await _word_lookup_payload(request, card, word_text))
+
+
+async def _word_lookup_card(word: Word) -> dict:
+    # Произношение генерирует фоновый воркер, клиент дождется его по audio_status_url
+    await sync_to_async(request_word_audio)(word)
+    card = word_card(word)
+    if is_card_final(word):
+        await word_cards.aset(word.lookup_key, card)
+    return card
+
+
+async def _word_lookup_payload(request, card: dict, word_text: str) -> dict:
+    user = await request.auser()
+    is_saved = False
+    if user.is_authenticated:
+        is_saved = await UserWord.objects.filter(user=user, word_id=card["id"]).aexists()
+
+    # Вместо введенного слова найдено похожее: клиент покажет "возможно, вы имели в виду"
+    requested = normalize_word_text(word_text)
+    if word_lookup_key(requested) == word_lookup_key(card["word"]):
+        requested = ""
+    return {**card, "requested": requested, "is_saved": is_saved}
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@transaction.non_atomic_requests
+@require_POST
+async def word_lookup_stream(request):
+    """
+    Поиск слова с потоковым ответом (server-sent events).
+
+    Части карточки отправляются по мере готовности: фрагменты определения (definition),
+    примеры (examples) и в конце полная карточка в формате word_lookup (word).
+    """
+    word_text = (request.POST.get("word") or "").strip()
+    if not word_lookup_key(word_text):
         return JsonResponse({"error": "Word is required"}, status=400)
 
-    linguistic_model = get_linguistic_model()
+    fuzzy = not request.POST.get("exact")
+
+    async def events():
+        try:
+            card = await word_cards.aget(word_lookup_key(word_text))
+            if card is not None:
+                yield _sse_event("definition", {"text": card["definition"]})
+                yield _sse_event("examples", {"examples": card["examples"]})
+                yield _sse_event("word", await _word_lookup_payload(request, card, word_text))
+                return
+
+            async for event, data in astream_word(word_text, fuzzy=fuzzy):
+                if event == "definition":
+                    yield _sse_event(event, {"text": data})
+                elif event == "examples":
+                    yield _sse_event(event, {"examples": data})
+                else:
+                    card = await _word_lookup_card(data)
+                    yield _sse_event(event, await _word_lookup_payload(request, card, word_text))
+        except RateLimitExceeded as exc:
+            yield _sse_event(
+                "error",
+                {
+                    "error": "Сервис перегружен, попробуйте через несколько секунд.",
+                    "retry_after": math.ceil(exc.retry_after),
+                },
+            )
+        except Exception:
+            # Заголовки уже отправлены, поэтому об ошибке сообщаем событием
+            logger.exception("Streaming lookup of %r failed", word_text)
+            yield _sse_event("error", {"error": "Произошла ошибка при поиске слова."})
+
+    # X-Accel-Buffering: nginx не должен копить ответ целиком
+    return StreamingHttpResponse(
+        events(), content_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-    word = Word.objects.filter(word=word_text).first()
-    if word is None:
-        definition = linguistic_model.get_word_definition(word_text)
-        examples = linguistic_model.get_word_examples(word_text)
 
-        word = Word.objects.create(
-            word=word_text,
-            name=word_text,
-            codename=word_text.lower().replace(" ", "_"),
-            part_of_speech=definition.get("part_of_speech", "") or "",
-            definition=(definition.get("definition") or "").capitalize(),
-            examples=examples,
+@transaction.non_atomic_requests
+@require_GET
+def word_card_detail(request, key):
+    """
+    Карточка существующего слова по нормализованному ключу (GET, кэшируется браузером и прокси).
+
+    Отдает ETag и Last-Modified по Word.updated и отвечает 304 на условные запросы.
+    """
+    lookup_key = word_lookup_key(key)
+    if not lookup_key:
+        raise Http404
+    if lookup_key != key:
+        # Один URL на слово: иначе "Apple" и "apple" кэшировались бы отдельно
+        return redirect("words:word_card", key=lookup_key, permanent=True)
+
+    card = word_cards.get(lookup_key)
+    if card is None:
+        word = get_object_or_404(Word, lookup_key=lookup_key)
+        card = word_card(word)
+        if is_card_final(word):
+            word_cards.set(lookup_key, card)
+
+    etag, last_modified = card_etag(card), card_last_modified(card)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified) or JsonResponse(card)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # Карточка одинакова для всех пользователей (is_saved отдает word_saved_status), поэтому ее
+    # кэширует и nginx. Пока генерируется аудио, карточка изменится: такую клиент перепроверяет каждый раз
+    if card["audio_status"] == Word.AudioStatus.READY:
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.WORD_CARD_MAX_AGE,
+            stale_while_revalidate=settings.WORD_CARD_STALE_WHILE_REVALIDATE,
         )
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
 
-    # Ensure audio exists (works for both local/volume and S3 storage)
-    if not word.audio_file:
-        content = _get_audio_from_text(word)
-        word.audio_file.save(content.name, content, save=True)
 
+@transaction.non_atomic_requests
+@require_GET
+async def word_saved_status(request, word_id):
+    """Сохранено ли слово у текущего пользователя — личная часть карточки, которую нельзя кэшировать вместе с ней."""
+    user = await request.auser()
     is_saved = False
-    if request.user.is_authenticated:
-        is_saved = UserWord.objects.filter(user=request.user, word=word).exists()
-
+    if user.is_authenticated:
+        is_saved = await UserWord.objects.filter(user=user, word_id=word_id).aexists()
+
+    response = JsonResponse({"is_saved": is_saved})
+    patch_cache_control(response, private=True, no_store=True)
+    patch_vary_headers(response, ["Cookie"])
+    return response
+
+
+@require_GET
+@cache_control(public=True, max_age=60)
+def word_autocomplete(request):
+    """Подсказки слов для формы поиска: по началу слова и похожие (с опечатками)."""
+    query = request.GET.get("q", "")
+    suggestions = suggest_words(query, settings.WORD_AUTOCOMPLETE_LIMIT) if len(query.strip()) >= 2 else []
+    return JsonResponse({"suggestions": suggestions})
+
+
+@require_http_methods(["GET", "POST"])
+def word_audio(request, word_id):
+    """
+    Статус генерации произношения слова и ссылка на аудио, когда оно готово.
+
+    POST ставит генерацию в очередь, если аудио еще нет или прошлая попытка не удалась
+    (карточка по GET word_card_detail ее не запрашивает).
+    """
+    word = get_object_or_404(Word.objects.only("uuid", "audio_file", "audio_status", "updated"), uuid=word_id)
+    if request.method == "POST":
+        request_word_audio(word)
     return JsonResponse(
         {
-            "word": word.word,
-            "definition": word.definition,
-            "examples": word.examples,
-            "id": str(word.uuid),
-            "is_saved": is_saved,
+            "audio_status": word.audio_status,
             "audio_file_url": word.audio_file.url if word.audio_file else "",
         }
     )
 
 
+@transaction.non_atomic_requests
 @login_required
 @require_POST
-def save_word(request):
+async def save_word(request):
     """Сохранение слова в коллекцию пользователя."""
     word_id = request.POST.get("word_id")
-    word = get_object_or_404(Word, uuid=word_id)
+    word = await aget_object_or_404(Word, uuid=word_id)
 
-    user_word, created = UserWord.objects.get_or_create(user=request.user, word=word, defaults={"familiarity_score": 0})
+    user_word, created = await UserWord.objects.aget_or_create(
+        user=await request.auser(), word=word, defaults={"familiarity_score": 0}
+    )
 
     return JsonResponse({"success": True, "created": created})
 
 
+def _sync_cursor(updated: datetime, last_id: int) -> str:
+    """Курсор синхронизации "<микросекунды от эпохи>-<id>" по ключу (updated, id)."""
+    return f"{(updated - _EPOCH) // timedelta(microseconds=1)}-{last_id}"
+
+
+def _parse_sync_cursor(cursor: str) -> tuple[datetime, int]:
+    """Разобрать курсор sync_words; для слишком больших значений время выходит за пределы datetime (OverflowError)."""
+    micros, last_id = map(int, cursor.split("-"))
+    # id должен помещаться в bigint, иначе запрос упадет уже в базе
+    if not 0 <= last_id < 2**63:
+        raise ValueError(f"Invalid cursor id: {last_id}")
+    return _EPOCH + timedelta(microseconds=micros), last_id
+
+
+@transaction.non_atomic_requests
+@login_required
+@require_GET
+def sync_words(request):
+    """
+    Синхронизация коллекции для офлайн-режима: изменения по ключу (UserWord.updated, id).
+
+    ?cursor=<курсор из предыдущего ответа> возвращает слова, добавленные или измененные после
+    него (изменение карточки слова тоже обновляет UserWord.updated), и id удаленных из коллекции
+    (deleted). Пока has_more, следующую страницу запрашивают с новым курсором. reset означает, что
+    клиент должен забыть свою копию коллекции: курсора нет или он старше хранимых удалений.
+    """
+    now = timezone.now()
+    # Курсор не заходит в последние SYNC_CURSOR_LAG секунд: транзакция, начатая раньше, может
+    # закоммитить строку с меньшим updated уже после ответа
+    cutoff = (now - timedelta(seconds=settings.SYNC_CURSOR_LAG), 0)
+    cursor = request.GET.get("cursor")
+    if cursor:
+        try:
+            cursor = _parse_sync_cursor(cursor)
+        except (ValueError, OverflowError, OSError):
+            return JsonResponse({"error": "Invalid cursor"}, status=400)
+        if cursor[0] < now - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+            cursor = None
+    reset = not cursor
+
+    first_question = (
+        QuizQuestion.objects.filter(word=OuterRef("word"))
+        .order_by("id")
+        .values(quiz=JSONObject(question="question", options="options", correct_answer="correct_answer"))[:1]
+    )
+    user_words = (
+        UserWord.objects.filter(user=request.user)
+        .select_related("word")
+        .only(
+            "id",
+            "updated",
+            "due_at",
+            "familiarity_score",
+            "word__uuid",
+            "word__word",
+            "word__definition",
+            "word__examples",
+            "word__audio_file",
+        )
+        .annotate(quiz=Subquery(first_question))
+        .order_by("updated", "id")
+    )
+    tombstones = UserWordTombstone.objects.filter(user=request.user)
+    if cursor:
+        updated, last_id = cursor
+        # Условие >= задает диапазон по индексу (user, updated, id), OR уточняет его
+        user_words = user_words.filter(updated__gte=updated).filter(Q(updated__gt=updated) | Q(id__gt=last_id))
+        tombstones = tombstones.filter(updated__gte=updated)
+
+    page = list(user_words[: settings.SYNC_PAGE_SIZE + 1])
+    has_more = len(page) > settings.SYNC_PAGE_SIZE
+    page = page[: settings.SYNC_PAGE_SIZE]
+    if has_more and (page[-1].updated, page[-1].id) < cutoff:
+        next_cursor = (page[-1].updated, page[-1].id)
+        tombstones = tombstones.filter(updated__lte=next_cursor[0])
+    else:
+        # Все изменения отданы: строки новее cutoff придут еще раз, повтор клиенту не вредит
+        has_more = False
+        next_cursor = max(cursor or cutoff, cutoff)
+
+    deleted = [] if reset else list(tombstones.values_list("user_word_id", flat=True))
+    return JsonResponse(
+        {
+            "words": [
+                {
+                    "user_word_id": user_word.id,
+                    "word_id": str(user_word.word.uuid),
+                    "word": user_word.word.word,
+                    "definition": user_word.word.definition,
+                    "examples": user_word.word.examples,
+                    "audio_file_url": user_word.word.audio_file.url if user_word.word.audio_file else "",
+                    "due_at": user_word.due_at.isoformat(),
+                    "familiarity_score": user_word.familiarity_score,
+                    "quiz": user_word.quiz,
+                }
+                for user_word in page
+            ],
+            "deleted": deleted,
+            "cursor": _sync_cursor(*next_cursor),
+            "has_more": has_more,
+            "reset": reset,
+        }
+    )
+
+
 @login_required
 def my_words(request):
-    """Страница с коллекцией слов пользователя."""
-    user_words = UserWord.objects.filter(user=request.user).select_related("word").order_by("familiarity_score")
-    return render(request, "words/my_words.html", {"user_words": user_words})
+    """Страница с коллекцией слов пользователя: первая страница, остальные подгружает my_words.js."""
+    user_words, next_cursor = _user_words_page(request.user)
+    context = {
+        "user_words": user_words,
+        "next_cursor": next_cursor,
+        "words_count": UserWord.objects.filter(user=request.user).count(),
+    }
+    return render(request, "words/my_words.html", context)
 
 
 @login_required
-def quiz(request):
-    """Страница с квизом для проверки знаний."""
-    user_words = UserWord.objects.filter(user=request.user).order_by("familiarity_score")
+def my_words_page(request):
+    """Следующая страница "Моих слов" (или результаты поиска) для бесконечной прокрутки."""
+    try:
+        user_words, next_cursor = _user_words_page(
+            request.user, request.GET.get("cursor"), (request.GET.get("q") or "").strip()
+        )
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor"}, status=400)
+
+    html = render_to_string("words/_word_card.html", {"user_words": user_words}, request=request)
+    return JsonResponse({"html": html, "count": len(user_words), "next_cursor": next_cursor})
+
+
+@transaction.non_atomic_requests
+@login_required
+@require_POST
+def import_words(request):
+    """
+    Импорт списка слов (CSV, TSV или текстовый экспорт Anki) в коллекцию пользователя.
+
+    Файл разбирается построчно и записывается пачками в отдельных транзакциях; новые слова
+    генерируются в фоне и появляются в коллекции по мере готовности.
+    """
+    upload = request.FILES.get("file")
+    file_format = request.POST.get("format") or (detect_format(upload.name) if upload else "")
+    if upload is None or file_format not in IMPORT_FORMATS:
+        messages.warning(request, "Выберите файл CSV, TSV или экспорт Anki (.txt).")
+        return redirect("words:my_words")
+    if upload.size > settings.WORD_IMPORT_MAX_FILE_SIZE:
+        messages.warning(request, f"Файл больше {settings.WORD_IMPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ.")
+        return redirect("words:my_words")
+
+    lines = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    # Счетчики передаются в импорт, чтобы при ошибке в середине файла показать, что уже сохранено
+    stats = Counter()
+    try:
+        import_word_list(request.user, iter_word_list(lines, file_format), stats=stats)
+    except (UnicodeDecodeError, csv.Error):
+        logger.warning("Failed to parse an imported word list", exc_info=True)
+        message = "Не удалось прочитать файл: нужен текст в кодировке UTF-8."
+        if any(stats.values()):
+            message += f" До ошибки импортировано: {_import_summary(stats)}."
+        messages.warning(request, message)
+        return redirect("words:my_words")
+
+    messages.success(request, f"Импорт завершен: {_import_summary(stats)}.")
+    return redirect("words:my_words")
+
+
+def _import_summary(stats: Counter) -> str:
+    return (
+        f"добавлено слов: {stats['added']}, уже были в коллекции: {stats['existing']}, "
+        f"новых в очереди на генерацию: {stats['queued']}, пропущено: {stats['skipped']}"
+    )
 
-    if not user_words.exists():
+
+@transaction.non_atomic_requests
+@login_required
+@require_GET
+def export_words(request):
+    """Экспорт коллекции со ссылками на аудио: CSV или текстовый формат для импорта в Anki, отдается потоком."""
+    file_format = request.GET.get("format", "csv")
+    if file_format not in EXPORT_FORMATS:
+        return JsonResponse({"error": "Unsupported format"}, status=400)
+
+    rows = iter_collection_rows(request.user, absolute_url=request.build_absolute_uri)
+    response = StreamingHttpResponse(
+        stream_word_list(rows, file_format),
+        content_type="text/csv; charset=utf-8" if file_format == "csv" else "text/plain; charset=utf-8",
+    )
+    filename = "my-words.csv" if file_format == "csv" else "my-words.txt"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _user_words_page(user, cursor=None, query=""):
+    """
+    Страница слов пользователя с пагинацией по ключу (familiarity_score, id).
+
+    cursor — "<familiarity_score>-<id>" последнего слова предыдущей страницы; возвращает
+    слова страницы и курсор следующей (None, если страница последняя).
+    """
+    user_words = (
+        UserWord.objects.filter(user=user)
+        .select_related("word")
+        .only(
+            "id",
+            "familiarity_score",
+            "word__uuid",
+            "word__word",
+            "word__part_of_speech",
+            "word__definition",
+            "word__examples",
+        )
+        .order_by("familiarity_score", "id")
+    )
+    if query:
+        # Слова хранятся в нижнем регистре, поэтому LIKE по триграммному индексу без UPPER()
+        user_words = user_words.filter(word__word__contains=query.lower())
+    if cursor:
+        score, last_id = map(int, cursor.split("-"))
+        # Значения должны помещаться в integer/bigint, иначе запрос упадет уже в базе
+        if not (0 <= score < 2**31 and 0 <= last_id < 2**63):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        # Условие >= задает диапазон по индексу (user, familiarity_score, id), OR уточняет его
+        user_words = user_words.filter(familiarity_score__gte=score).filter(
+            Q(familiarity_score__gt=score) | Q(id__gt=last_id)
+        )
+
+    page = list(user_words[: settings.MY_WORDS_PAGE_SIZE + 1])
+    if len(page) <= settings.MY_WORDS_PAGE_SIZE:
+        return page, None
+    page = page[: settings.MY_WORDS_PAGE_SIZE]
+    return page, f"{page[-1].familiarity_score}-{page[-1].id}"
+
+
+@login_required
+def quiz(request):
+    """Страница с квизом для проверки знаний; карточки пачками загружает quiz.js через quiz_session."""
+    if not UserWord.objects.filter(user=request.user).exists():
         return render(request, "words/quiz.html", {"no_words": True})
+    return render(request, "words/quiz.html", {"session_size": settings.QUIZ_SESSION_SIZE})
+
 
-    user_word = user_words.first()
-    word = user_word.word
+@transaction.non_atomic_requests
+@login_required
+async def quiz_session(request):
+    """
+    Пачка карточек для тренировки: слова, которым пора на повторение, вместе со случайным вопросом квиза.
 
-    # Генерация квиза
-    linguistic_model = get_linguistic_model()  # например, GigaChatModel
-    quiz_data = linguistic_model.generate_quiz_options(word.word)
+    Если повторять нечего, возвращается done=true и время ближайшего повторения next_due_at.
+    """
+    try:
+        size = min(max(int(request.GET.get("size", settings.QUIZ_SESSION_SIZE)), 1), settings.QUIZ_SESSION_MAX_SIZE)
+    except ValueError:
+        size = settings.QUIZ_SESSION_SIZE
+
+    # Карточки и вопросы выбираются одним запросом: вопрос — коррелированный подзапрос
+    questions = QuizQuestion.objects.filter(word=OuterRef("word"))
+    random_question = questions.order_by("?").values(
+        quiz=JSONObject(question="question", options="options", correct_answer="correct_answer")
+    )[:1]
+    user = await request.auser()
+    now = timezone.now()
+    due = UserWord.objects.filter(user=user, due_at__lte=now)
+    rows = [
+        row
+        async for row in due.filter(Exists(questions))
+        .order_by("due_at")
+        .values("id", "word__word", "word__definition")
+        .annotate(quiz=Subquery(random_question))[:size]
+    ]
+
+    # Вопросы для слов без них генерирует воркер очереди; до тех пор такие слова пропускаются
+    missing = [word_id async for word_id in due.exclude(Exists(questions)).values_list("word_id", flat=True)[:size]]
+    if missing:
+        await sync_to_async(request_quiz_questions)(missing)
+
+    next_due_at = None
+    if not rows:
+        upcoming = UserWord.objects.filter(user=user, due_at__gt=now).order_by("due_at")
+        next_due = await upcoming.values_list("due_at", flat=True).afirst()
+        next_due_at = next_due.isoformat() if next_due else None
+    return JsonResponse(
+        {
+            "cards": [
+                {
+                    "user_word_id": row["id"],
+                    "word": row["word__word"],
+                    "definition": row["word__definition"],
+                    "quiz": row["quiz"],
+                }
+                for row in rows
+            ],
+            # Повторять сейчас нечего: все слова повторены или вопросы к ним еще готовятся
+            "done": not rows,
+            "pending": len(missing),
+            "next_due_at": next_due_at,
+        }
+    )
 
-    # Можно подстраховаться: если структура некорректная — показать заглушку
-    if not quiz_data or not quiz_data.get("options") or not quiz_data.get("question"):
-        return render(request, "words/quiz.html", {"no_words": True, "error": "Не удалось сгенерировать вопрос."})
 
-    context = {
-        "word": word,
-        "quiz": quiz_data,
-        "user_word_id": user_word.id,
+@login_required
+@require_POST
+def submit_quiz_answers(request):
+    """
+    Пакетное сохранение ответов тренировки.
+
+    Тело запроса — JSON {"answers": [{"user_word_id": ..., "correct": true, "answered_at": ...}, ...]};
+    расписание всех слов пересчитывается в памяти и сохраняется одним bulk_update.
+    answered_at (ISO 8601, необязательно) — когда был дан ответ: офлайн-ответы приходят позже.
+    """
+    now = timezone.now()
+    try:
+        answers = sorted(
+            (
+                (_answered_at(answer.get("answered_at"), now), int(answer["user_word_id"]), bool(answer["correct"]))
+                for answer in json.loads(request.body)["answers"]
+            ),
+            key=lambda answer: answer[0],
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return JsonResponse({"error": "Invalid answers"}, status=400)
+    if len(answers) > settings.QUIZ_ANSWERS_MAX_BATCH:
+        return JsonResponse({"error": "Too many answers"}, status=400)
+
+    user_words = {
+        user_word.id: user_word
+        for user_word in UserWord.objects.select_for_update()
+        .filter(user=request.user, id__in={user_word_id for _, user_word_id, _ in answers})
+        .only("id", "familiarity_score", "ease", "interval", "repetitions")
     }
+    for answered_at, user_word_id, correct in answers:
+        user_word = user_words.get(user_word_id)
+        if user_word is None:
+            continue
+        apply_review(user_word, GRADE_CORRECT if correct else GRADE_WRONG, answered_at)
+        if not correct:
+            user_word.familiarity_score += 1
+        user_word.last_reviewed = answered_at
+        user_word.updated = now
+
+    UserWord.objects.bulk_update(
+        user_words.values(),
+        ["familiarity_score", "ease", "interval", "repetitions", "due_at", "last_reviewed", "updated"],
+    )
+    return JsonResponse({"success": True, "updated": len(user_words)})
+
 
-    return render(request, "words/quiz.html", context)
+def _answered_at(value, now):
+    """Время ответа из запроса; без него или из будущего — текущее."""
+    if not value:
+        return now
+    answered_at = parse_datetime(value)
+    if answered_at is None:
+        raise ValueError(f"Invalid answered_at: {value!r}")
+    if timezone.is_naive(answered_at):
+        answered_at = timezone.make_aware(answered_at)
+    return min(answered_at, now)
 
 
 @login_required
@@ -128,19 +677,19 @@ def submit_quiz_answer(request):
     selected_answer = request.POST.get("selected_answer")
     correct_answer = request.POST.get("correct_answer")
 
-    user_word = get_object_or_404(UserWord, id=user_word_id, user=request.user)
-
     is_correct = selected_answer == correct_answer
+    now = timezone.now()
 
-    if is_correct:
-        # Если ответ верный, оставляем familiarity_score как есть
-        pass
-    else:
+    # Расписание пересчитывается одним UPDATE, без чтения строки
+    fields = review_update(GRADE_CORRECT if is_correct else GRADE_WRONG, now)
+    if not is_correct:
         # Если неверный, увеличиваем счетчик
-        user_word.familiarity_score += 1
-
-    user_word.last_reviewed = timezone.now()
-    user_word.save()
+        fields["familiarity_score"] = F("familiarity_score") + 1
+    updated = UserWord.objects.filter(id=user_word_id, user=request.user).update(
+        last_reviewed=now, updated=now, **fields
+    )
+    if not updated:
+        raise Http404("No UserWord matches the given query.")
 
     return JsonResponse({"correct": is_correct, "next_url": request.build_absolute_uri("/words/quiz/")})
 
@@ -155,6 +704,8 @@ def remove_word(request):
     # Try to find and delete the user's connection to this word
     try:
         user_word = UserWord.objects.get(user=request.user, word=word)
+        # Офлайн-копии коллекции узнают об удалении при синхронизации
+        UserWordTombstone.objects.create(user=request.user, user_word_id=user_word.id, word_id=word.uuid)
         user_word.delete()
         return JsonResponse({"success": True, "removed": True})
     except UserWord.DoesNotExist:
@@ -0,0 +1,207 @@
+import csv
+import html
+import re
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from itertools import chain
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from apps.words.jobs import enqueue_many
+from apps.words.models import Job, UserWord, Word
+from apps.words.normalization import normalize_word_text, word_lookup_key
+
+IMPORT_FORMATS = ("csv", "tsv", "anki")
+EXPORT_FORMATS = ("csv", "anki")
+EXPORT_COLUMNS = ("word", "part_of_speech", "definition", "examples", "audio_url", "familiarity_score", "due_at")
+
+# Значения заголовка #separator: в текстовом экспорте Anki
+_ANKI_SEPARATORS = {"tab": "\t", "comma": ",", "semicolon": ";", "pipe": "|", "space": " ", "colon": ":"}
+_ANKI_SOUND = re.compile(r"\[sound:[^\]]*\]")
+# Первая строка CSV с такими значениями считается заголовком
+_HEADER_NAMES = {"word", "words", "front", "term"}
+
+
+def detect_format(filename: str) -> str:
+    """Формат списка по расширению файла: .tsv/.tab — TSV, .txt — текстовый экспорт Anki, иначе CSV."""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return {"tsv": "tsv", "tab": "tsv", "txt": "anki"}.get(extension, "csv")
+
+
+def iter_word_list(lines: Iterable[str], file_format: str) -> Iterator[str]:
+    """Слова из первого столбца списка; строки читаются по одной, файл целиком в память не загружается."""
+    if file_format == "anki":
+        yield from _iter_anki_words(lines)
+        return
+
+    rows = csv.reader(lines, delimiter="\t" if file_format == "tsv" else ",")
+    for number, row in enumerate(rows):
+        if not row or (number == 0 and word_lookup_key(row[0]) in _HEADER_NAMES):
+            continue
+        yield row[0]
+
+
+def _iter_anki_words(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Лицевая сторона карточек из текстового экспорта Anki ("Notes in Plain Text").
+
+    Заголовки "#key:value" в начале файла задают разделитель и служебные столбцы
+    (guid, notetype, deck), которые пропускаются. HTML и [sound:...] из поля убираются.
+    """
+    lines = iter(lines)
+    separator, meta_columns = "\t", set()
+    for line in lines:
+        if not line.startswith("#"):
+            break
+        name, _, value = line[1:].strip().partition(":")
+        if name == "separator":
+            separator = _ANKI_SEPARATORS.get(value.lower(), value[:1] or "\t")
+        elif name.endswith(" column") and value.isdigit():
+            meta_columns.add(int(value) - 1)
+    else:
+        return
+
+    field = min(set(range(len(meta_columns) + 1)) - meta_columns)
+    for row in csv.reader(chain([line], lines), delimiter=separator):
+        if len(row) > field:
+            yield html.unescape(strip_tags(_ANKI_SOUND.sub(" ", row[field])))
+
+
+def import_word_list(
+    user,
+    words: Iterable[str],
+    batch_size: int | None = None,
+    max_new_words: int | None = None,
+    stats: Counter | None = None,
+):
+    """
+    Добавить слова из списка в коллекцию пользователя пачками по batch_size.
+
+    Готовые слова ищутся одним запросом lookup_key IN (...) на пачку и сразу добавляются в коллекцию;
+    новые ставятся в очередь на генерацию карточки, задача сама добавит слово в коллекцию.
+    В очереди у пользователя одновременно не больше max_new_words слов (с учетом прошлых импортов).
+    Каждая пачка — отдельная транзакция. Возвращает счетчики added, existing (уже в коллекции),
+    queued и skipped; переданный stats обновляется по ходу импорта, так что при ошибке чтения
+    в середине файла в нем остаются итоги уже сохраненных пачек.
+    """
+    batch_size = batch_size or settings.WORD_LIST_BATCH_SIZE
+    if max_new_words is None:
+        max_new_words = settings.WORD_IMPORT_MAX_NEW_WORDS
+    max_length = Word._meta.get_field("word").max_length
+
+    if stats is None:
+        stats = Counter()
+    stats.update(dict.fromkeys(("added", "existing", "queued", "skipped"), 0))
+    seen = set()
+    batch = {}
+    for text in words:
+        text = normalize_word_text(text)
+        key = word_lookup_key(text)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        if len(text) > max_length:
+            stats["skipped"] += 1
+            continue
+        batch[key] = text
+        if len(batch) >= batch_size:
+            _import_batch(user, batch, stats, max_new_words)
+            batch = {}
+    if batch:
+        _import_batch(user, batch, stats, max_new_words)
+    return stats
+
+
+@transaction.atomic
+def _import_batch(user, texts: dict[str, str], stats: Counter, max_new_words: int) -> None:
+    word_ids = dict(Word.objects.filter(lookup_key__in=texts).values_list("lookup_key", "uuid"))
+    user_words = UserWord.objects.filter(user=user, word_id__in=word_ids.values())
+    saved = set(user_words.values_list("word_id", flat=True))
+    # ON CONFLICT DO NOTHING: слово могли параллельно сохранить из другой вкладки,
+    # поэтому добавленные считаются по коллекции после вставки
+    UserWord.objects.bulk_create(
+        [UserWord(user=user, word_id=word_id) for word_id in word_ids.values() if word_id not in saved],
+        ignore_conflicts=True,
+    )
+    stats["existing"] += len(saved)
+    stats["added"] += user_words.count() - len(saved)
+
+    new_words = [text for key, text in texts.items() if key not in word_ids]
+    if new_words:
+        # Блокировка строки пользователя: параллельные импорты не обойдут лимит очереди
+        list(get_user_model().objects.select_for_update().filter(pk=user.pk).values_list("pk", flat=True))
+        pending = Job.objects.filter(
+            kind="import_word",
+            status__in=(Job.Status.PENDING, Job.Status.RUNNING),
+            payload__user_id=str(user.pk),
+        ).count()
+        queued = new_words[: max(max_new_words - pending, 0)]
+        enqueue_many("import_word", [{"word": text, "user_id": str(user.pk)} for text in queued])
+    else:
+        queued = []
+    stats["queued"] += len(queued)
+    stats["skipped"] += len(new_words) - len(queued)
+
+
+def iter_collection_rows(user, absolute_url: Callable[[str], str] = str) -> Iterator[list]:
+    """Строки экспорта коллекции (EXPORT_COLUMNS); слова читаются из БД пачками, а не одним списком."""
+    user_words = (
+        UserWord.objects.filter(user=user)
+        .select_related("word")
+        .only(
+            "id",
+            "familiarity_score",
+            "due_at",
+            "word__word",
+            "word__part_of_speech",
+            "word__definition",
+            "word__examples",
+            "word__audio_file",
+        )
+        .order_by("id")
+    )
+    for user_word in user_words.iterator(chunk_size=settings.WORD_LIST_BATCH_SIZE):
+        word = user_word.word
+        yield [
+            word.word,
+            word.part_of_speech or "",
+            word.definition or "",
+            word.examples or [],
+            absolute_url(word.audio_file.url) if word.audio_file else "",
+            user_word.familiarity_score,
+            user_word.due_at.isoformat(),
+        ]
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: writerow возвращает готовую строку вместо записи."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_word_list(rows: Iterable[list], file_format: str) -> Iterator[str]:
+    """
+    Экспорт построчно: CSV с заголовком или текстовый формат Anki (TSV с заголовками #...).
+
+    Примеры в CSV разделены переводом строки, в Anki — <br>; аудио передается ссылкой
+    (файлы .apkg с медиа не собираются).
+    """
+    if file_format == "anki":
+        writer = csv.writer(_Echo(), delimiter="\t", lineterminator="\n")
+        yield "#separator:tab\n#html:true\n#columns:" + "\t".join(EXPORT_COLUMNS) + "\n"
+    else:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_COLUMNS)
+
+    for row in rows:
+        examples = row[3]
+        if file_format == "anki":
+            row[:3] = [html.escape(value) for value in row[:3]]
+            row[3] = "<br>".join(html.escape(str(example)) for example in examples)
+        else:
+            row[3] = "\n".join(str(example) for example in examples)
+        yield writer.writerow(row)
@@ -39,6 +39,13 @@ DATABASES = {
         "ATOMIC_REQUESTS": True,
     }
 }
+# Та же БД через отдельное подключение в режиме autocommit для общих счетчиков (apps.words.counters)
+DATABASES["counters"] = {**DATABASES["default"], "ATOMIC_REQUESTS": False, "TEST": {"MIRROR": "default"}}
+
+CACHES = {
+    # По умолчанию кэш в таблице БД (manage.py createcachetable), общий для всех воркеров
+    "default": env.cache_url("CACHE_URL", default="dbcache://django_cache"),
+}
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -54,6 +61,7 @@ DJANGO_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",  # Required by allauth
+    "django.contrib.postgres",
 ]
 LOCAL_APPS = ["apps.users", "apps.words"]
 THIRD_PARTY_APPS = [
@@ -173,6 +181,81 @@ DEEPSEEK_API_KEY = env.str("DEEPSEEK_API_KEY")
 DEEPSEEK_API_BASE_URL = env.str("DEEPSEEK_API_BASE_URL")
 
 GIGACHAT_AUTH_KEY = env.str("GIGACHAT_AUTH_KEY")
+# Обновлять токен GigaChat за столько секунд до истечения
+GIGACHAT_TOKEN_REFRESH_MARGIN = env.int("GIGACHAT_TOKEN_REFRESH_MARGIN", default=60)
+
+# Пул HTTP-соединений клиентов DeepSeek (на процесс; у GigaChat — лимиты httpx по умолчанию)
+LLM_HTTP_MAX_CONNECTIONS = env.int("LLM_HTTP_MAX_CONNECTIONS", default=20)
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = env.int("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", default=10)
+LLM_HTTP_KEEPALIVE_EXPIRY = env.float("LLM_HTTP_KEEPALIVE_EXPIRY", default=60.0)
+# Лимиты запросов к провайдерам LLM, общие для всех воркеров (таблица счетчиков apps.words.counters)
+LLM_RATE_LIMITS = env.json(
+    "LLM_RATE_LIMITS",
+    default={
+        "gigachat": {"requests_per_second": 5, "max_in_flight": 10, "tokens_per_minute": 100_000},
+        "deepseek": {"requests_per_second": 2, "max_in_flight": 5, "tokens_per_minute": 50_000},
+    },
+)
+# Сколько секунд запрос может ждать освобождения лимита, прежде чем получить отказ
+LLM_RATE_LIMIT_MAX_WAIT = env.float("LLM_RATE_LIMIT_MAX_WAIT", default=3.0)
+# Запас токенов на ответ при резервировании бюджета
+LLM_COMPLETION_TOKENS_ESTIMATE = env.int("LLM_COMPLETION_TOKENS_ESTIMATE", default=500)
+# Переключение между провайдерами (LinguisticAPIProvider): предохранитель и дублирующие запросы
+LLM_BREAKER_WINDOW = env.int("LLM_BREAKER_WINDOW", default=20)
+LLM_BREAKER_MIN_CALLS = env.int("LLM_BREAKER_MIN_CALLS", default=5)
+LLM_BREAKER_ERROR_RATE = env.float("LLM_BREAKER_ERROR_RATE", default=0.5)
+LLM_BREAKER_COOLDOWN = env.int("LLM_BREAKER_COOLDOWN", default=30)
+LLM_HEDGE_REQUESTS = env.bool("LLM_HEDGE_REQUESTS", default=False)
+# Не отправлять дублирующий запрос раньше, чем через столько секунд
+LLM_HEDGE_MIN_DELAY = env.float("LLM_HEDGE_MIN_DELAY", default=2.0)
+# Потоки для параллельной генерации определения, примеров и аудио (на процесс)
+LLM_FETCH_WORKERS = env.int("LLM_FETCH_WORKERS", default=8)
+
+# Синтез речи: "gtts" (сеть) или "piper" (локально, https://github.com/rhasspy/piper)
+TTS_BACKEND = env.str("TTS_BACKEND", default="gtts")
+PIPER_BINARY = env.str("PIPER_BINARY", default="piper")
+PIPER_MODEL = env.str("PIPER_MODEL", default="en_US-lessac-medium.onnx")
+PIPER_TIMEOUT = env.int("PIPER_TIMEOUT", default=300)
+
+# Фоновые задачи (manage.py run_jobs)
+JOB_MAX_ATTEMPTS = env.int("JOB_MAX_ATTEMPTS", default=5)
+# Задержка перед повтором, секунды; удваивается с каждой попыткой
+JOB_RETRY_BACKOFF = env.int("JOB_RETRY_BACKOFF", default=10)
+# Через сколько секунд задача в статусе running считается брошенной упавшим воркером
+JOB_LEASE_TIMEOUT = env.int("JOB_LEASE_TIMEOUT", default=600)
+# Через сколько секунд после провала генерации произношения ее можно запросить снова
+WORD_AUDIO_RETRY_DELAY = env.int("WORD_AUDIO_RETRY_DELAY", default=60 * 60)
+
+# Тренировка: карточек в одной пачке quiz_session (по умолчанию и максимум) и ответов в одном POST
+QUIZ_SESSION_SIZE = env.int("QUIZ_SESSION_SIZE", default=20)
+QUIZ_SESSION_MAX_SIZE = env.int("QUIZ_SESSION_MAX_SIZE", default=50)
+QUIZ_ANSWERS_MAX_BATCH = env.int("QUIZ_ANSWERS_MAX_BATCH", default=500)
+# Слов на одной странице "Мои слова" (подгружаются при прокрутке)
+MY_WORDS_PAGE_SIZE = env.int("MY_WORDS_PAGE_SIZE", default=50)
+# Подсказок автодополнения в форме поиска слова
+WORD_AUTOCOMPLETE_LIMIT = env.int("WORD_AUTOCOMPLETE_LIMIT", default=8)
+# Сходство по триграммам (0..1), начиная с которого вместо генерации новой карточки
+# показывается готовая карточка похожего слова ("возможно, вы имели в виду")
+WORD_SIMILARITY_THRESHOLD = env.float("WORD_SIMILARITY_THRESHOLD", default=0.6)
+# Кэш карточек слов: LRU в памяти каждого воркера (размер и время жизни, сек.) перед общим кэшем
+WORD_CARD_CACHE_SIZE = env.int("WORD_CARD_CACHE_SIZE", default=2000)
+WORD_CARD_CACHE_LOCAL_TTL = env.int("WORD_CARD_CACHE_LOCAL_TTL", default=60)
+WORD_CARD_CACHE_TTL = env.int("WORD_CARD_CACHE_TTL", default=24 * 60 * 60)
+# Сколько секунд браузер может не перепроверять готовую карточку слова (GET words/card/<key>/)
+WORD_CARD_MAX_AGE = env.int("WORD_CARD_MAX_AGE", default=60 * 60)
+# Сколько еще секунд после этого nginx и браузер могут отдавать карточку, обновляя ее в фоне
+WORD_CARD_STALE_WHILE_REVALIDATE = env.int("WORD_CARD_STALE_WHILE_REVALIDATE", default=24 * 60 * 60)
+# Синхронизация коллекции для офлайн-режима: слов на странице, на сколько секунд курсор
+# отстает от текущего времени (чтобы не пропустить поздно закоммиченные изменения)
+# и сколько дней хранятся записи об удаленных словах
+SYNC_PAGE_SIZE = env.int("SYNC_PAGE_SIZE", default=500)
+SYNC_CURSOR_LAG = env.int("SYNC_CURSOR_LAG", default=10)
+SYNC_TOMBSTONE_DAYS = env.int("SYNC_TOMBSTONE_DAYS", default=30)
+# Импорт и экспорт списков слов: слов в одной пачке (запрос IN и INSERT), сколько новых слов
+# пользователя может одновременно ждать генерации в очереди и максимальный размер загружаемого файла (байт)
+WORD_LIST_BATCH_SIZE = env.int("WORD_LIST_BATCH_SIZE", default=500)
+WORD_IMPORT_MAX_NEW_WORDS = env.int("WORD_IMPORT_MAX_NEW_WORDS", default=1000)
+WORD_IMPORT_MAX_FILE_SIZE = env.int("WORD_IMPORT_MAX_FILE_SIZE", default=5 * 1024 * 1024)
 
 # Logging
 LOGGING = {
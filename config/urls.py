@@ -4,8 +4,11 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import RedirectView
 
+from apps.words.views import service_worker
+
 urlpatterns = [
     path("", RedirectView.as_view(url="/words/", permanent=False), name="home"),
+    path("sw.js", service_worker, name="service_worker"),
     path("admin/", admin.site.urls),
     path("words/", include("apps.words.urls")),
     path("accounts/", include("allauth.urls")),
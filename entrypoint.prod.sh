@@ -2,5 +2,6 @@
 
 python manage.py collectstatic --noinput
 python manage.py migrate --noinput
+python manage.py createcachetable
 python manage.py ensure_admin
-python -m gunicorn --bind 0.0.0.0:8000 --workers 3 config.wsgi:application
+python -m gunicorn --bind 0.0.0.0:8000 --workers 3 --worker-class uvicorn_worker.UvicornWorker config.asgi:application
@@ -12,6 +12,10 @@ document.addEventListener('DOMContentLoaded', function() {
     const volumeIcon = playAudioBtn.querySelector(".bi-volume-up");
     const wordAudio = document.getElementById('wordAudio');
     const lookupSpinner = document.getElementById('lookupSpinner');
+    const wordSuggestions = document.getElementById('wordSuggestions');
+    const didYouMean = document.getElementById('didYouMean');
+    const requestedWord = document.getElementById('requestedWord');
+    const lookupExactLink = document.getElementById('lookupExactLink');
     
     let currentWordId = null;
     let isWordSaved = false;
@@ -93,15 +97,228 @@ document.addEventListener('DOMContentLoaded', function() {
         saveWordBtn.disabled = false;
     }
     
-    wordLookupForm.addEventListener('submit', function(e) {
-        e.preventDefault();
+    // Audio is generated by a background worker: poll until it is ready
+    const AUDIO_POLL_INTERVAL = 1500;
+    const AUDIO_POLL_ATTEMPTS = 20;
+
+    function waitForAudio(statusUrl, wordId, attempt = 0) {
+        if (attempt >= AUDIO_POLL_ATTEMPTS) return;
+
+        setTimeout(() => {
+            // The user has already looked up another word
+            if (currentWordId !== wordId) return;
+
+            fetch(statusUrl, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+            .then(response => response.json())
+            .then(data => {
+                if (currentWordId !== wordId) return;
+
+                if (data.audio_status === 'ready' && data.audio_file_url) {
+                    wordAudio.src = data.audio_file_url;
+                    playAudioBtn.disabled = false;
+                } else if (data.audio_status === 'pending') {
+                    waitForAudio(statusUrl, wordId, attempt + 1);
+                }
+            })
+            .catch(error => {
+                console.error('Audio status error:', error);
+            });
+        }, AUDIO_POLL_INTERVAL);
+    }
+
+    // Cards from the GET endpoint never queue audio: ask for it explicitly, then poll
+    function requestAudio(statusUrl, wordId) {
+        const csrfInput = document.querySelector('[name=csrfmiddlewaretoken]');
+        fetch(statusUrl, {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': csrfInput ? csrfInput.value : '',
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (currentWordId === wordId && data.audio_status === 'pending') {
+                waitForAudio(statusUrl, wordId);
+            }
+        })
+        .catch(error => {
+            console.error('Audio request error:', error);
+        });
+    }
+
+    function renderExamples(examples) {
+        resultExamples.innerHTML = '';
+        if (examples && examples.length > 0) {
+            examples.forEach(example => {
+                const li = document.createElement('li');
+                li.textContent = example;
+                resultExamples.appendChild(li);
+            });
+        } else {
+            const li = document.createElement('li');
+            li.textContent = 'Примеры не найдены';
+            resultExamples.appendChild(li);
+        }
+    }
+
+    // Render the complete card (JSON endpoint response or the final "word" event of the stream)
+    function showWord(data) {
+        // The server served a similar existing word instead of the one typed
+        if (didYouMean) {
+            requestedWord.textContent = data.requested || '';
+            didYouMean.style.display = data.requested ? 'block' : 'none';
+        }
+        resultWord.textContent = data.word;
+        resultPartOfSpeech.textContent = data.part_of_speech || '';
+        resultDefinition.textContent = data.definition;
+        renderExamples(data.examples);
+        currentWordId = data.id;
+        wordResult.style.display = 'block';
+        updateSaveButtonState(data.is_saved || false);
+        wordInput.value = '';
+        if (data.audio_file_url) {
+            wordAudio.src = data.audio_file_url;
+            playAudioBtn.disabled = false;
+        } else {
+            wordAudio.removeAttribute('src');
+            playAudioBtn.disabled = true;
+            if (data.audio_status === 'pending' && data.audio_status_url) {
+                waitForAudio(data.audio_status_url, data.id);
+            } else if (['none', 'failed'].includes(data.audio_status) && data.audio_status_url) {
+                requestAudio(data.audio_status_url, data.id);
+            }
+        }
+    }
+
+    // Show an empty card that is filled in as the stream delivers its parts
+    function startStreamedWord(wordText) {
+        if (lookupSpinner) lookupSpinner.style.display = 'none';
+        currentWordId = null;
+        if (didYouMean) didYouMean.style.display = 'none';
+        resultWord.textContent = wordText;
+        resultPartOfSpeech.textContent = '';
+        resultDefinition.textContent = '';
+        resultExamples.innerHTML = '';
+        saveWordBtn.disabled = true;
+        wordAudio.removeAttribute('src');
+        playAudioBtn.disabled = true;
+        wordResult.style.display = 'block';
+    }
+
+    function handleLookupData(data) {
+        if (!data) return; // Handle redirect case
+
+        // Hide spinner
+        if (lookupSpinner) lookupSpinner.style.display = 'none';
+
+        if (data.error) {
+            alert(data.error);
+            return;
+        }
+        showWord(data);
+    }
+
+    function handleStreamEvent(event, data, stream) {
+        if (event === 'definition' || event === 'examples') {
+            if (!stream.started) {
+                stream.started = true;
+                startStreamedWord(stream.wordText);
+            }
+            if (event === 'definition') {
+                resultDefinition.textContent += data.text;
+            } else {
+                renderExamples(data.examples);
+            }
+        } else {
+            // "word" carries the same payload as the JSON endpoint, "error" - an error message
+            handleLookupData(data);
+        }
+    }
+
+    // Parse a text/event-stream response body and call onEvent(event, data) for each event
+    function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        function pump() {
+            return reader.read().then(({ done, value }) => {
+                if (done) return;
+                buffer += decoder.decode(value, { stream: true });
+
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const block = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+
+                    let event = 'message';
+                    const dataLines = [];
+                    block.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) {
+                            event = line.slice(6).trim();
+                        } else if (line.startsWith('data:')) {
+                            dataLines.push(line.slice(5).trim());
+                        }
+                    });
+                    if (dataLines.length > 0) {
+                        onEvent(event, JSON.parse(dataLines.join('\n')));
+                    }
+                }
+                return pump();
+            });
+        }
+        return pump();
+    }
+
+    // The card endpoint is shared by all users (and cached by the browser and nginx),
+    // whether the word is saved comes from a separate private endpoint
+    function withSavedStatus(card) {
+        if (saveWordBtn.dataset.isAuthenticated !== 'true') {
+            return Promise.resolve({ ...card, is_saved: false });
+        }
+        return fetch(card.saved_status_url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(response => response.json())
+        .then(data => ({ ...card, is_saved: data.is_saved }))
+        .catch(() => ({ ...card, is_saved: false }));
+    }
 
+    // Card of an existing word or null when the word has to be generated
+    function fetchExistingCard(wordText) {
+        const cardUrl = wordLookupForm.dataset.cardUrl;
+        const key = wordText.toLowerCase().split(/\s+/).filter(Boolean).join(' ');
+        if (!cardUrl || !key || key.includes('/')) return Promise.resolve(null);
+
+        return fetch(cardUrl.replace('__word__', encodeURIComponent(key)), {
+            headers: { 'X-Requested-With': 'XMLHttpRequest' }
+        })
+        .then(response => (response.ok ? response.json() : null))
+        .then(card => (card ? withSavedStatus(card) : null))
+        .catch(() => null);
+    }
+
+    function lookupWord(formData) {
         // Show spinner, hide result
         if (lookupSpinner) lookupSpinner.style.display = 'flex';
         if (wordResult) wordResult.style.display = 'none';
 
-        const formData = new FormData(wordLookupForm);
-        const lookupUrl = wordLookupForm.dataset.lookupUrl;
+        // Existing words come from the cacheable GET endpoint, new ones are generated by POST
+        const existingCard = formData.get('exact') ? Promise.resolve(null) : fetchExistingCard(formData.get('word') || '');
+        existingCard.then(card => {
+            if (card) {
+                handleLookupData(card);
+            } else {
+                generateWord(formData);
+            }
+        });
+    }
+
+    function generateWord(formData) {
+        // Stream the card part by part where the browser can read response bodies as streams
+        const streamUrl = wordLookupForm.dataset.streamUrl;
+        const useStream = Boolean(streamUrl && window.ReadableStream && window.TextDecoder);
+        const lookupUrl = useStream ? streamUrl : wordLookupForm.dataset.lookupUrl;
+        const stream = { started: false, wordText: (formData.get('word') || '').trim() };
 
         fetch(lookupUrl, {
             method: 'POST',
@@ -116,58 +333,82 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
             const contentType = response.headers.get('content-type');
-            if (response.ok && contentType && contentType.includes('application/json')) {
-                return response.json();
+            if (contentType && contentType.includes('text/event-stream')) {
+                return readEventStream(response, (event, data) => handleStreamEvent(event, data, stream))
+                    .then(() => {
+                        if (lookupSpinner) lookupSpinner.style.display = 'none';
+                    });
+            }
+            // Errors (e.g. 429 when the service is overloaded) also come as JSON with an error message
+            if (contentType && contentType.includes('application/json')) {
+                return response.json().then(handleLookupData);
             } else {
                 return response.text().then(text => {
                     throw new Error('Server returned non-JSON response: ' + text);
                 });
             }
         })
-        .then(data => {
-            if (!data) return; // Handle redirect case
-
-            // Hide spinner
-            if (lookupSpinner) lookupSpinner.style.display = 'none';
-
-            if (data.error) {
-                alert(data.error);
-                return;
-            }
-            
-            resultWord.textContent = data.word;
-            resultPartOfSpeech.textContent = data.part_of_speech || '';
-            resultDefinition.textContent = data.definition;
-            resultExamples.innerHTML = '';
-            if (data.examples && data.examples.length > 0) {
-                data.examples.forEach(example => {
-                    const li = document.createElement('li');
-                    li.textContent = example;
-                    resultExamples.appendChild(li);
-                });
-            } else {
-                const li = document.createElement('li');
-                li.textContent = 'Примеры не найдены';
-                resultExamples.appendChild(li);
-            }
-            currentWordId = data.id;
-            wordResult.style.display = 'block';
-            updateSaveButtonState(data.is_saved || false);
-            wordInput.value = '';
-            if (data.audio_file_url) {
-                wordAudio.src = data.audio_file_url;
-                playAudioBtn.disabled = false;
-            } else {
-                wordAudio.removeAttribute('src');
-                playAudioBtn.disabled = true;
-            }
-        })
         .catch(error => {
             if (lookupSpinner) lookupSpinner.style.display = 'none';
             console.error('Error:', error);
             alert('Произошла ошибка при поиске слова.');
         });
+    }
+
+    wordLookupForm.addEventListener('submit', function(e) {
+        e.preventDefault();
+        lookupWord(new FormData(wordLookupForm));
     });
+
+    // "Did you mean": look up exactly the word that was typed instead of the similar one
+    if (lookupExactLink) {
+        lookupExactLink.addEventListener('click', function(e) {
+            e.preventDefault();
+            const formData = new FormData(wordLookupForm);
+            formData.set('word', requestedWord.textContent);
+            formData.set('exact', '1');
+            lookupWord(formData);
+        });
+    }
+
+    // Autocomplete: suggestions by prefix and similar words (typos) after a short pause in typing
+    const AUTOCOMPLETE_DELAY = 200;
+    const AUTOCOMPLETE_MIN_LENGTH = 2;
+    let autocompleteTimer = null;
+    let autocompleteController = null;
+
+    function loadSuggestions(query) {
+        if (autocompleteController) autocompleteController.abort();
+        autocompleteController = new AbortController();
+
+        const url = new URL(wordLookupForm.dataset.autocompleteUrl, window.location.origin);
+        url.searchParams.set('q', query);
+        fetch(url, { signal: autocompleteController.signal, headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(response => response.json())
+        .then(data => {
+            wordSuggestions.innerHTML = '';
+            (data.suggestions || []).forEach(suggestion => {
+                const option = document.createElement('option');
+                option.value = suggestion;
+                wordSuggestions.appendChild(option);
+            });
+        })
+        .catch(error => {
+            if (error.name !== 'AbortError') console.error('Autocomplete error:', error);
+        });
+    }
+
+    if (wordSuggestions && wordLookupForm.dataset.autocompleteUrl) {
+        wordInput.addEventListener('input', function() {
+            clearTimeout(autocompleteTimer);
+            const query = wordInput.value.trim();
+            if (query.length < AUTOCOMPLETE_MIN_LENGTH) {
+                wordSuggestions.innerHTML = '';
+                return;
+            }
+            autocompleteTimer = setTimeout(() => loadSuggestions(query), AUTOCOMPLETE_DELAY);
+        });
+    }
     
     // Use touchend for mobile devices to prevent hover state issues
     const isTouchDevice = 'ontouchstart' in window || navigator.maxTouchPoints > 0;
@@ -24,17 +24,19 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
-    // Handle word removal
-    document.querySelectorAll('.remove-word-btn').forEach(button => {
-        button.addEventListener('click', function(e) {
+    // Handle word removal (delegated: cards are also added by infinite scroll)
+    if (wordsAccordion) {
+        wordsAccordion.addEventListener('click', function(e) {
+            const button = e.target.closest('.remove-word-btn');
+            if (!button) return;
             e.preventDefault();
             
             if (!confirm('Вы уверены, что хотите удалить это слово из коллекции?')) {
                 return;
             }
             
-            const wordId = this.getAttribute('data-word-id');
-            const userWordId = this.getAttribute('data-user-word-id');
+            const wordId = button.getAttribute('data-word-id');
+            const userWordId = button.getAttribute('data-user-word-id');
             const card = document.getElementById(`word-card-${userWordId}`);
             
             const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
@@ -72,5 +74,65 @@ document.addEventListener('DOMContentLoaded', function() {
                 alert('Произошла ошибка при удалении слова.');
             });
         });
+    }
+
+    // Infinite scroll and search: pages come from the JSON endpoint as rendered cards
+    const wordsSearch = document.getElementById('wordsSearch');
+    const wordsSentinel = document.getElementById('wordsSentinel');
+    const wordsLoading = document.getElementById('wordsLoading');
+    const wordsNotFound = document.getElementById('wordsNotFound');
+    if (!wordsSearch || !wordsSentinel) return;
+
+    const pageUrl = wordsSearch.dataset.pageUrl;
+    let nextCursor = wordsSentinel.dataset.nextCursor || null;
+    let query = '';
+    let isLoading = false;
+    // Responses of an outdated search are ignored
+    let requestId = 0;
+
+    function loadPage(replace) {
+        if (isLoading && !replace) return;
+        if (!replace && !nextCursor) return;
+
+        const params = new URLSearchParams();
+        if (!replace && nextCursor) params.set('cursor', nextCursor);
+        if (query) params.set('q', query);
+
+        const currentRequest = ++requestId;
+        isLoading = true;
+        wordsLoading.style.display = 'block';
+
+        fetch(`${pageUrl}?${params}`, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(response => response.json())
+        .then(data => {
+            if (currentRequest !== requestId) return;
+            if (replace) wordsAccordion.innerHTML = '';
+            wordsAccordion.insertAdjacentHTML('beforeend', data.html);
+            nextCursor = data.next_cursor;
+            wordsNotFound.style.display = replace && data.count === 0 ? 'block' : 'none';
+        })
+        .catch(error => {
+            console.error('Error:', error);
+        })
+        .finally(() => {
+            if (currentRequest !== requestId) return;
+            isLoading = false;
+            wordsLoading.style.display = 'none';
+        });
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadPage(false);
+    }, { rootMargin: '300px' });
+    observer.observe(wordsSentinel);
+
+    let searchTimeout = null;
+    wordsSearch.addEventListener('input', function() {
+        clearTimeout(searchTimeout);
+        searchTimeout = setTimeout(() => {
+            query = wordsSearch.value.trim();
+            nextCursor = null;
+            loadPage(true);
+        }, 300);
     });
 });
@@ -0,0 +1,162 @@
+// Offline mode: service worker registration, a local copy of the user's collection
+// and answers given offline that are uploaded in one batch later
+(function() {
+    const script = document.currentScript;
+    const COLLECTION_KEY = 'wordcard.collection';
+    const SYNC_CURSOR_KEY = 'wordcard.syncCursor';
+    const SYNC_CHECKED_AT_KEY = 'wordcard.syncCheckedAt';
+    const ANSWERS_KEY = 'wordcard.pendingAnswers';
+    // Keys of the previous versions of the sync
+    const LEGACY_KEYS = ['wordcard.syncedAt', 'wordcard.fullSyncAt'];
+    // Sync changes at most every 5 minutes
+    const SYNC_INTERVAL = 5 * 60 * 1000;
+    // Approximate next review of a card answered offline; the server sends the exact schedule on sync
+    const OFFLINE_CORRECT_DELAY = 24 * 60 * 60 * 1000;
+    const OFFLINE_WRONG_DELAY = 10 * 60 * 1000;
+
+    if ('serviceWorker' in navigator && script.dataset.swUrl) {
+        window.addEventListener('load', () => {
+            navigator.serviceWorker.register(script.dataset.swUrl).catch(error => {
+                console.error('Service worker registration failed:', error);
+            });
+        });
+    }
+
+    function readJSON(key, fallback) {
+        try {
+            const value = localStorage.getItem(key);
+            return value === null ? fallback : JSON.parse(value);
+        } catch (error) {
+            return fallback;
+        }
+    }
+
+    function writeJSON(key, value) {
+        try {
+            localStorage.setItem(key, JSON.stringify(value));
+        } catch (error) {
+            console.error('Failed to save offline data:', error);
+        }
+    }
+
+    function postToServiceWorker(message) {
+        if (!('serviceWorker' in navigator)) return;
+        navigator.serviceWorker.ready.then(registration => {
+            if (registration.active) registration.active.postMessage(message);
+        });
+    }
+
+    if (script.dataset.authenticated !== 'true') {
+        // Another user may log in on this device: forget the previous collection
+        [COLLECTION_KEY, SYNC_CURSOR_KEY, SYNC_CHECKED_AT_KEY, ANSWERS_KEY].concat(LEGACY_KEYS).forEach(key => {
+            localStorage.removeItem(key);
+        });
+        postToServiceWorker({ type: 'clear-user-data' });
+        return;
+    }
+
+    function csrfToken() {
+        const match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+        return match ? decodeURIComponent(match[1]) : '';
+    }
+
+    // One page of changes after the cursor: saved or updated words and ids of removed ones
+    function syncPage(cursor) {
+        const url = new URL(script.dataset.syncUrl, window.location.origin);
+        if (cursor) url.searchParams.set('cursor', cursor);
+
+        return fetch(url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(response => {
+            if (!response.ok) throw new Error('Sync failed: ' + response.status);
+            return response.json();
+        })
+        .then(data => {
+            const collection = data.reset ? {} : readJSON(COLLECTION_KEY, {});
+            data.deleted.forEach(userWordId => { delete collection[userWordId]; });
+            data.words.forEach(word => { collection[word.user_word_id] = word; });
+            writeJSON(COLLECTION_KEY, collection);
+            // The cursor is saved after every page so that an interrupted sync resumes where it stopped
+            writeJSON(SYNC_CURSOR_KEY, data.cursor);
+
+            const audioUrls = data.words.map(word => word.audio_file_url).filter(Boolean);
+            if (audioUrls.length > 0) postToServiceWorker({ type: 'cache-audio', urls: audioUrls });
+
+            if (data.has_more) return syncPage(data.cursor);
+        });
+    }
+
+    function syncCollection(force = false) {
+        const now = Date.now();
+        if (!force && now - readJSON(SYNC_CHECKED_AT_KEY, 0) < SYNC_INTERVAL) return Promise.resolve();
+
+        LEGACY_KEYS.forEach(key => localStorage.removeItem(key));
+        return syncPage(readJSON(SYNC_CURSOR_KEY, null))
+        .then(() => writeJSON(SYNC_CHECKED_AT_KEY, now))
+        .catch(error => console.error('Error:', error));
+    }
+
+    // Upload answers given offline in one request
+    function flushAnswers() {
+        const answers = readJSON(ANSWERS_KEY, []);
+        if (answers.length === 0 || !navigator.onLine) return Promise.resolve();
+
+        return fetch(script.dataset.answersUrl, {
+            method: 'POST',
+            body: JSON.stringify({ answers: answers }),
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken(),
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => {
+            if (!response.ok) throw new Error('Failed to upload answers: ' + response.status);
+            // Answers given while the request was in flight stay queued
+            writeJSON(ANSWERS_KEY, readJSON(ANSWERS_KEY, []).slice(answers.length));
+        })
+        .catch(error => console.error('Error:', error));
+    }
+
+    function queueAnswers(answers) {
+        writeJSON(ANSWERS_KEY, readJSON(ANSWERS_KEY, []).concat(answers));
+
+        // Move answered cards back in the local queue so that offline review goes on with other words
+        const collection = readJSON(COLLECTION_KEY, {});
+        answers.forEach(answer => {
+            const word = collection[answer.user_word_id];
+            if (!word) return;
+            const answeredAt = answer.answered_at ? Date.parse(answer.answered_at) : Date.now();
+            const delay = answer.correct ? OFFLINE_CORRECT_DELAY : OFFLINE_WRONG_DELAY;
+            word.due_at = new Date(answeredAt + delay).toISOString();
+        });
+        writeJSON(COLLECTION_KEY, collection);
+    }
+
+    // Cards for a review session from the local collection, the earliest due first
+    function getDueCards(limit) {
+        return Object.values(readJSON(COLLECTION_KEY, {}))
+        .filter(word => word.quiz)
+        .sort((a, b) => Date.parse(a.due_at) - Date.parse(b.due_at))
+        .slice(0, limit)
+        .map(word => ({
+            user_word_id: word.user_word_id,
+            word: word.word,
+            definition: word.definition,
+            quiz: word.quiz
+        }));
+    }
+
+    window.addEventListener('online', () => {
+        flushAnswers().then(() => syncCollection(true));
+    });
+    if (navigator.onLine) {
+        flushAnswers().then(() => syncCollection());
+    }
+
+    window.wordcardOffline = {
+        getDueCards: getDueCards,
+        queueAnswers: queueAnswers,
+        flushAnswers: flushAnswers,
+        syncCollection: syncCollection
+    };
+})();
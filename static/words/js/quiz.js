@@ -1,35 +1,166 @@
 document.addEventListener('DOMContentLoaded', function() {
+    const quizApp = document.getElementById('quizApp');
+    if (!quizApp) return;
+
+    const quizLoading = document.getElementById('quizLoading');
+    const quizError = document.getElementById('quizError');
     const quizContainer = document.getElementById('quizContainer');
+    const quizQuestion = document.getElementById('quizQuestion');
+    const quizOptions = document.getElementById('quizOptions');
     const resultContainer = document.getElementById('resultContainer');
     const correctResult = document.getElementById('correctResult');
     const incorrectResult = document.getElementById('incorrectResult');
     const correctAnswerText = document.getElementById('correctAnswerText');
     const nextQuestionBtn = document.getElementById('nextQuestionBtn');
-    const selectedAnswerInput = document.getElementById('selectedAnswer');
-    const quizForm = document.getElementById('quizForm');
-    const answerOptions = document.querySelectorAll('.answer-option');
+    const progressBar = document.querySelector('.progress-bar');
+    const csrfToken = quizApp.querySelector('[name=csrfmiddlewaretoken]').value;
+    // Local copy of the collection (offline.js): review goes on without network
+    const offline = window.wordcardOffline || null;
+    const sessionSize = new URL(quizApp.dataset.sessionUrl, window.location.origin).searchParams.get('size') || 20;
+
+    // Cards of the current batch and answers not yet sent to the server
+    let cards = [];
+    let cardIndex = 0;
+    let answers = [];
 
     // Add playful background to quiz area
-    if (quizContainer) {
-        quizContainer.parentElement.parentElement.style.background = "#F6F8FF";
-        quizContainer.parentElement.parentElement.style.borderRadius = "24px";
+    quizContainer.parentElement.parentElement.style.background = "#F6F8FF";
+    quizContainer.parentElement.parentElement.style.borderRadius = "24px";
+
+    function showError(message) {
+        quizLoading.style.display = 'none';
+        quizContainer.style.display = 'none';
+        resultContainer.style.display = 'none';
+        quizError.classList.replace('alert-info', 'alert-warning');
+        quizError.textContent = message;
+        quizError.style.display = 'block';
+    }
+
+    function updateProgress() {
+        if (!progressBar) return;
+        const progress = cards.length ? Math.round(cardIndex / cards.length * 100) : 0;
+        progressBar.style.width = progress + '%';
+        progressBar.setAttribute('aria-valuenow', progress);
+    }
+
+    function startSession(sessionCards) {
+        cards = sessionCards;
+        cardIndex = 0;
+        if (cards.length === 0) {
+            showError('Не удалось загрузить вопросы.');
+            return;
+        }
+        showCard();
+    }
+
+    // Nothing to review right now: everything is repeated or questions are still being generated
+    function showDone(data) {
+        let message = 'Все слова повторены.';
+        if (data.pending) {
+            message = 'Вопросы к словам еще готовятся, загляните чуть позже.';
+        } else if (data.next_due_at) {
+            message += ' Следующее повторение: ' + new Date(data.next_due_at).toLocaleString() + '.';
+        }
+        showError(message);
+        quizError.classList.replace('alert-warning', 'alert-info');
+    }
+
+    // Offline the batch is taken from the local collection
+    function loadOfflineSession() {
+        const offlineCards = offline ? offline.getDueCards(sessionSize) : [];
+        if (offlineCards.length === 0) {
+            showError('Не удалось загрузить вопросы.');
+            return;
+        }
+        startSession(offlineCards);
+    }
+
+    // One request for the whole batch of due cards with their questions
+    function loadSession() {
+        quizLoading.style.display = 'block';
+        quizContainer.style.display = 'none';
+        resultContainer.style.display = 'none';
+
+        if (!navigator.onLine) {
+            loadOfflineSession();
+            return;
+        }
+        fetch(quizApp.dataset.sessionUrl, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then(response => {
+            if (!response.ok) throw new Error('Failed to load cards: ' + response.status);
+            return response.json();
+        })
+        .then(data => {
+            if (data.done) {
+                showDone(data);
+                return;
+            }
+            startSession(data.cards || []);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            loadOfflineSession();
+        });
+    }
+
+    // One request for all answers of the batch
+    function submitAnswers(keepalive = false) {
+        if (answers.length === 0) return Promise.resolve();
+        const batch = answers;
+        answers = [];
+
+        if (offline && !navigator.onLine) {
+            // Uploaded by offline.js when the network is back
+            offline.queueAnswers(batch);
+            return Promise.resolve();
+        }
+
+        return fetch(quizApp.dataset.answersUrl, {
+            method: 'POST',
+            body: JSON.stringify({ answers: batch }),
+            keepalive: keepalive,
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken,
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => {
+            if (!response.ok) throw new Error('Failed to save answers: ' + response.status);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            if (offline) {
+                offline.queueAnswers(batch);
+            } else {
+                // Keep the answers to retry with the next batch
+                answers = batch.concat(answers);
+            }
+        });
     }
 
-    // Add click handler to each answer option
-    answerOptions.forEach(option => {
-        option.style.fontFamily = "'Anybody', 'Inter', Arial, sans-serif";
-        option.style.fontWeight = "700";
-        option.style.fontSize = "1.15rem";
-        option.style.borderRadius = "14px";
-        option.style.transition = "background 0.2s, color 0.2s, box-shadow 0.2s";
-        option.style.boxShadow = "0 2px 8px rgba(166,111,255,0.06)";
-        option.addEventListener('mouseenter', function() {
+    function createOption(option, card) {
+        const wrapper = document.createElement('div');
+        wrapper.className = 'mb-3';
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = 'btn qz-btn btn-outline-primary answer-option w-100 text-start p-3';
+        button.dataset.answer = option;
+        button.textContent = option;
+
+        button.style.fontFamily = "'Anybody', 'Inter', Arial, sans-serif";
+        button.style.fontWeight = "700";
+        button.style.fontSize = "1.15rem";
+        button.style.borderRadius = "14px";
+        button.style.transition = "background 0.2s, color 0.2s, box-shadow 0.2s";
+        button.style.boxShadow = "0 2px 8px rgba(166,111,255,0.06)";
+        button.addEventListener('mouseenter', function() {
             if (!this.classList.contains('active')) {
                 this.style.background = "#A66FFF22";
                 this.style.color = "#202020";
             }
         });
-        option.addEventListener('mouseleave', function() {
+        button.addEventListener('mouseleave', function() {
             if (!this.classList.contains('active')) {
                 this.style.background = "var(--brand-purple)";
                 this.style.color = "#ffffff";
@@ -39,7 +170,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 this.style.color = "#ffffff";
             }
         });
-        option.addEventListener('click', function(e) {
+        button.addEventListener('click', function() {
+            const answerOptions = quizOptions.querySelectorAll('.answer-option');
             // Remove active class from all options
             answerOptions.forEach(btn => {
                 btn.classList.remove('active');
@@ -52,37 +184,53 @@ document.addEventListener('DOMContentLoaded', function() {
             this.style.background = "#A66FFF";
             this.style.color = "#fff";
             this.style.boxShadow = "0 4px 16px rgba(166,111,255,0.18)";
-            // Store selected answer in hidden input
-            selectedAnswerInput.value = this.getAttribute('data-answer');
-            // Submit form after a short delay
+            // Show the result after a short delay
             setTimeout(() => {
-                handleAnswer();
+                handleAnswer(card, option);
             }, 400);
         });
-    });
 
-    // Function to submit answer and handle result
-    function handleAnswer() {
-        const formData = new FormData(quizForm);
-        const selectedAnswer = selectedAnswerInput.value;
-        const correctAnswer = formData.get('correct_answer');
+        wrapper.appendChild(button);
+        return wrapper;
+    }
+
+    function showCard() {
+        const card = cards[cardIndex];
+        quizQuestion.textContent = card.quiz.question;
+        quizOptions.innerHTML = '';
+        card.quiz.options.forEach(option => {
+            quizOptions.appendChild(createOption(option, card));
+        });
+
+        quizLoading.style.display = 'none';
+        resultContainer.style.display = 'none';
+        correctResult.style.display = 'none';
+        incorrectResult.style.display = 'none';
+        quizContainer.style.display = 'block';
+        updateProgress();
+    }
+
+    function handleAnswer(card, selectedAnswer) {
+        const correctAnswer = card.quiz.correct_answer;
+        const isCorrect = selectedAnswer === correctAnswer;
+        answers.push({ user_word_id: card.user_word_id, correct: isCorrect, answered_at: new Date().toISOString() });
 
         // Disable all answer buttons and style them
-        answerOptions.forEach(btn => {
+        quizOptions.querySelectorAll('.answer-option').forEach(btn => {
             btn.disabled = true;
             btn.style.cursor = "not-allowed";
             btn.style.fontWeight = "700";
             btn.style.fontSize = "1.15rem";
             btn.style.borderRadius = "14px";
             // Highlight correct answer
-            if (btn.getAttribute('data-answer') === correctAnswer) {
+            if (btn.dataset.answer === correctAnswer) {
                 btn.style.background = "#FF7B01";
                 btn.style.color = "#fff";
                 btn.style.boxShadow = "0 4px 16px rgba(255,123,1,0.18)";
                 btn.classList.add('quiz-correct-animate');
             }
             // If this was selected but incorrect
-            if (btn.getAttribute('data-answer') === selectedAnswer && selectedAnswer !== correctAnswer) {
+            if (btn.dataset.answer === selectedAnswer && !isCorrect) {
                 btn.style.background = "#F44336";
                 btn.style.color = "#fff";
                 btn.style.boxShadow = "0 4px 16px rgba(244,67,54,0.18)";
@@ -91,10 +239,12 @@ document.addEventListener('DOMContentLoaded', function() {
         });
 
         // Show result
+        resultContainer.querySelectorAll('.result-word').forEach(el => { el.textContent = card.word; });
+        resultContainer.querySelectorAll('.result-definition').forEach(el => { el.textContent = card.definition || ''; });
         quizContainer.style.display = 'none';
         resultContainer.style.display = 'block';
 
-        if (selectedAnswer === correctAnswer) {
+        if (isCorrect) {
             correctResult.style.display = 'block';
             correctResult.style.background = "#FFFBF2";
             correctResult.style.color = "#202020";
@@ -104,56 +254,43 @@ document.addEventListener('DOMContentLoaded', function() {
             incorrectResult.style.color = "#202020";
             correctAnswerText.textContent = correctAnswer;
         }
-
-        // Submit form to update database
-        fetch(quizForm.action, {
-            method: 'POST',
-            body: formData,
-            headers: {
-                'X-Requested-With': 'XMLHttpRequest',
-                'X-CSRFToken': formData.get('csrfmiddlewaretoken')
-            }
-        })
-        .then(response => response.json())
-        .then(data => {
-            // Store next URL for button
-            nextQuestionBtn.setAttribute('data-next-url', data.next_url);
-        })
-        .catch(error => {
-            console.error('Error:', error);
-        });
     }
 
     // Next question button handler
-    if (nextQuestionBtn) {
-        nextQuestionBtn.style.background = "#A66FFF";
-        nextQuestionBtn.style.color = "#fff";
-        nextQuestionBtn.style.fontFamily = "'Anybody', 'Inter', Arial, sans-serif";
-        nextQuestionBtn.style.fontWeight = "700";
-        nextQuestionBtn.style.fontSize = "1.1rem";
-        nextQuestionBtn.style.borderRadius = "14px";
-        nextQuestionBtn.style.border = "none";
-        nextQuestionBtn.style.marginTop = "18px";
-        nextQuestionBtn.style.boxShadow = "0 2px 8px rgba(166,111,255,0.10)";
-        nextQuestionBtn.addEventListener('mouseenter', function() {
-            this.style.background = "#FF7B01";
-        });
-        nextQuestionBtn.addEventListener('mouseleave', function() {
-            this.style.background = "#A66FFF";
-        });
-        nextQuestionBtn.addEventListener('click', function() {
-            window.location.href = this.getAttribute('data-next-url') || "/words/quiz/";
-        });
-    }
+    nextQuestionBtn.style.background = "#A66FFF";
+    nextQuestionBtn.style.color = "#fff";
+    nextQuestionBtn.style.fontFamily = "'Anybody', 'Inter', Arial, sans-serif";
+    nextQuestionBtn.style.fontWeight = "700";
+    nextQuestionBtn.style.fontSize = "1.1rem";
+    nextQuestionBtn.style.borderRadius = "14px";
+    nextQuestionBtn.style.border = "none";
+    nextQuestionBtn.style.marginTop = "18px";
+    nextQuestionBtn.style.boxShadow = "0 2px 8px rgba(166,111,255,0.10)";
+    nextQuestionBtn.addEventListener('mouseenter', function() {
+        this.style.background = "#FF7B01";
+    });
+    nextQuestionBtn.addEventListener('mouseleave', function() {
+        this.style.background = "#A66FFF";
+    });
+    nextQuestionBtn.addEventListener('click', function() {
+        cardIndex += 1;
+        if (cardIndex < cards.length) {
+            showCard();
+            return;
+        }
+        // Batch finished: save the answers, then fetch the next due cards
+        updateProgress();
+        submitAnswers().then(loadSession);
+    });
+
+    // Save answers given so far when the user leaves in the middle of a batch
+    window.addEventListener('pagehide', function() {
+        submitAnswers(true);
+    });
 
-    // Update progress bar with yellow and playful width
-    const progressBar = document.querySelector('.progress-bar');
     if (progressBar) {
         progressBar.style.background = "#FAE14C";
         progressBar.style.borderRadius = "8px";
-        const randomProgress = Math.floor(Math.random() * 100) + 1;
-        progressBar.style.width = randomProgress + '%';
-        progressBar.setAttribute('aria-valuenow', randomProgress);
     }
 
     // Add keyframes for playful feedback
@@ -176,4 +313,6 @@ document.addEventListener('DOMContentLoaded', function() {
     .quiz-wrong-animate { animation: quiz-wrong-shake 0.4s; }
     `;
     document.head.appendChild(style);
+
+    loadSession();
 });
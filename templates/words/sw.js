@@ -0,0 +1,98 @@
+// Service worker (rendered by apps.words.views.service_worker)
+const CACHE_VERSION = '{{ version }}';
+const SHELL_CACHE = 'wordcard-shell-' + CACHE_VERSION;
+const PAGES_CACHE = 'wordcard-pages';
+const AUDIO_CACHE = 'wordcard-audio';
+const PRECACHE_URLS = {{ precache_urls|safe }};
+const STATIC_URL = {{ static_url|safe }};
+const AUDIO_URL = {{ audio_url|safe }};
+const OFFLINE_URL = {{ offline_url|safe }};
+
+// App shell: styles, scripts and icons are precached on install
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+        .then(cache => cache.addAll(PRECACHE_URLS))
+        .then(() => self.skipWaiting())
+    );
+});
+
+// Drop the shell of previous deploys
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+        .then(keys => Promise.all(
+            keys
+            .filter(key => key.startsWith('wordcard-shell-') && key !== SHELL_CACHE)
+            .map(key => caches.delete(key))
+        ))
+        .then(() => self.clients.claim())
+    );
+});
+
+function cacheFirst(request, cacheName) {
+    return caches.match(request).then(cached => {
+        if (cached) return cached;
+        return fetch(request).then(response => {
+            // Opaque responses (cross-origin audio on S3) are cached as is
+            if (response.ok || response.type === 'opaque') {
+                const copy = response.clone();
+                caches.open(cacheName).then(cache => cache.put(request, copy));
+            }
+            return response;
+        });
+    });
+}
+
+// Pages: network first, the last copy is used offline
+function networkFirstPage(request) {
+    return fetch(request)
+    .then(response => {
+        if (response.ok && !response.redirected) {
+            const copy = response.clone();
+            caches.open(PAGES_CACHE).then(cache => cache.put(request, copy));
+        }
+        return response;
+    })
+    .catch(() => caches.match(request).then(cached => cached || caches.match(OFFLINE_URL)));
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    if (request.mode === 'navigate') {
+        event.respondWith(networkFirstPage(request));
+    } else if (request.url.startsWith(AUDIO_URL)) {
+        // Audio files are content-addressed and never change
+        event.respondWith(cacheFirst(request, AUDIO_CACHE));
+    } else if (request.url.startsWith(STATIC_URL) || PRECACHE_URLS.includes(request.url)) {
+        event.respondWith(cacheFirst(request, SHELL_CACHE));
+    }
+});
+
+// Download audio of the saved words one by one so that the collection can be reviewed offline
+function cacheAudio(urls) {
+    return caches.open(AUDIO_CACHE).then(cache => urls.reduce(
+        (previous, url) => previous.then(() => cache.match(url).then(cached => {
+            if (cached) return;
+            const request = new Request(url, { mode: url.startsWith(self.location.origin) ? 'same-origin' : 'no-cors' });
+            return fetch(request)
+            .then(response => {
+                if (response.ok || response.type === 'opaque') return cache.put(url, response);
+            })
+            .catch(error => console.error('Failed to cache audio:', url, error));
+        })),
+        Promise.resolve()
+    ));
+}
+
+self.addEventListener('message', event => {
+    const message = event.data || {};
+    if (message.type === 'cache-audio') {
+        event.waitUntil(cacheAudio(message.urls || []));
+    } else if (message.type === 'clear-user-data') {
+        // Cached pages contain the collection of the user who has logged out
+        event.waitUntil(caches.delete(PAGES_CACHE));
+    }
+});